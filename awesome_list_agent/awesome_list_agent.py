@@ -1,13 +1,30 @@
 from .agent import Agent
 from .tools.awesome_list_parser import AwesomeListParser
-from .tools.youtube_metadata_tool import YouTubeMetadataTool
+from .tools.youtube_metadata_tool import LISTING_FIELDS, YouTubeMetadataTool
 from .tools.web_scraping_tool import WebScrapingTool
 from .tools.content_analysis_tool import ContentAnalysisTool
 from .llm.models import LLMMessage
 from .tools.markdown_youtube_extractor_tool import MarkdownYouTubeExtractorTool
+from .utils.deadline import (
+    DeadlineExceeded,
+    deadline,
+    deadline_expired,
+    within_deadline,
+)
+from .utils.enrichment_queue import (
+    EnrichmentScheduler,
+    collapse_same_link_text,
+    only_videos,
+)
+from .utils.near_duplicates import NearDuplicateIndex, word_jaccard
+from .utils.search_index import SearchIndex
+from .utils.video_store import VideoStore
+from src.canonicalize_urls import parse_youtube_url
+from collections import Counter
 from typing import Any, Dict, List, Optional
 import uuid
 import logging
+import os
 from datetime import datetime
 
 
@@ -56,9 +73,43 @@ You provide comprehensive results including:
 
 You are designed to be the ultimate tool for processing and understanding Awesome Lists, making them more accessible and valuable for users seeking curated learning resources."""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        search_index: Optional[SearchIndex] = None,
+        video_store: Optional[VideoStore] = None,
+        **kwargs,
+    ):
+        """Create the agent
+
+        Args:
+            search_index: Index that every successful result is added to.
+                Defaults to the index at $AWESOME_LIST_SEARCH_INDEX_PATH if
+                set, else results are not indexed.
+            video_store: Columnar store the videos of every processed list
+                are kept in. Defaults to the store at
+                $AWESOME_LIST_VIDEO_STORE_PATH if set, else an in-memory one.
+        """
         super().__init__(*args, **kwargs)
 
+        if search_index is None:
+            index_path = os.getenv("AWESOME_LIST_SEARCH_INDEX_PATH")
+            search_index = SearchIndex(index_path) if index_path else None
+        self.search_index = search_index
+
+        if video_store is None:
+            store_path = os.getenv("AWESOME_LIST_VIDEO_STORE_PATH")
+            video_store = (
+                VideoStore.load_or_create(store_path) if store_path else VideoStore()
+            )
+        self.video_store = video_store
+
+        # Ranks each list's videos before any is fetched, using the store's
+        # view counts as cached popularity
+        self.enrichment_scheduler = EnrichmentScheduler(
+            popularity=self.video_store.view_counts
+        )
+
         # Set up logger - use the injected logger or create a default one
         if self.logger:
             self.logger = self.logger
@@ -200,7 +251,8 @@ This agent is perfect for:
     def _register_tools(self):
         """Register all available tools with the agent."""
         # Register the awesome list parser tool
-        self.parser = AwesomeListParser()
+        # Ranks videos by the same cached popularity as the agent's scheduler
+        self.parser = AwesomeListParser(popularity=self.video_store.view_counts)
         self.tool_registry.register(
             metadata=AwesomeListParser.get_metadata(), implementation=AwesomeListParser
         )
@@ -237,18 +289,30 @@ This agent is perfect for:
         )
         self.logger.debug("Registered markdown_youtube_extractor_tool")
 
-    async def process_awesome_list(self, url: str) -> Dict[str, Any]:
+    async def process_awesome_list(
+        self, url: str, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """Process an Awesome List URL to extract comprehensive information.
 
         Args:
             url: The URL of the Awesome List to process.
+            timeout: Overall time budget in seconds, shared by every stage.
+                Stages that cannot finish in time are skipped or cut short,
+                and the result is marked ``partial`` with the names of the
+                ``skipped_stages``. None for no limit.
 
         Returns:
             A dictionary containing the parsed information and metadata.
         """
+        with deadline(timeout):
+            return await self._process_awesome_list(url)
+
+    async def _process_awesome_list(self, url: str) -> Dict[str, Any]:
+        """process_awesome_list() within the deadline of the current context."""
         import time
 
         start_time = time.time()
+        skipped_stages = []
 
         # Start Galileo trace if logger supports it
         if hasattr(self.logger, "start_trace"):
@@ -276,15 +340,21 @@ This agent is perfect for:
                 web_scraping_start_time = time.time()
 
             # Explicitly call web scraping tool from the main agent
-            web_scraping_result = await self.web_scraping_tool.execute(
-                url=url,
-                extract_text=True,
-                extract_links=True,
-                extract_images=False,
-                extract_metadata=True,
-                max_links=100,  # Get comprehensive link analysis
-                timeout=30,
-            )
+            try:
+                web_scraping_result = await within_deadline(
+                    self.web_scraping_tool.execute(
+                        url=url,
+                        extract_text=True,
+                        extract_links=True,
+                        extract_images=False,
+                        extract_metadata=True,
+                        max_links=100,  # Get comprehensive link analysis
+                        timeout=30,
+                    )
+                )
+            except DeadlineExceeded:
+                web_scraping_result = {"error": "Skipped: deadline exceeded"}
+                skipped_stages.append("web_scraping")
 
             # Log explicit web scraping tool execution span
             if hasattr(self.logger, "add_tool_span"):
@@ -363,6 +433,17 @@ This agent is perfect for:
 
             self.logger.debug(f"Parser returned comprehensive data: {parsed_data}")
 
+            # Without a parse in time, carry on with the scraped links alone
+            if deadline_expired() and not isinstance(parsed_data, dict):
+                self.logger.warning("⏱️ Parser skipped: deadline exceeded")
+                skipped_stages.append("awesome_list_parser")
+                parsed_data = {}
+            elif isinstance(parsed_data, dict):
+                skipped_stages.extend(
+                    f"awesome_list_parser.{stage}"
+                    for stage in parsed_data.get("skipped_stages", [])
+                )
+
             # Check if parsing was successful
             if isinstance(parsed_data, dict) and "error" in parsed_data:
                 self.logger.error(f"Parser failed with error: {parsed_data['error']}")
@@ -401,78 +482,138 @@ This agent is perfect for:
             # Step 3: Explicitly call YouTube metadata tool for any YouTube links found
             self.logger.info("Step 3: Executing explicit YouTube metadata extraction")
 
-            # Extract YouTube URLs from web scraping results
-            youtube_urls = []
+            # Extract YouTube URLs, with the section and link text they
+            # appear with, from web scraping results
+            youtube_mentions = []
             if isinstance(web_scraping_result, dict) and "links" in web_scraping_result:
                 for link in web_scraping_result["links"]:
                     if isinstance(link, dict) and "url" in link:
-                        url_str = link["url"]
-                        if "youtube.com" in url_str or "youtu.be" in url_str:
-                            youtube_urls.append(url_str)
+                        youtube_mentions.append(link)
 
-            # Also check parsed data for YouTube URLs
+            # Videos the parser already fetched are reused instead of re-fetched
+            fetched_videos = {}
             if isinstance(parsed_data, dict) and "youtube_metadata" in parsed_data:
                 for video in parsed_data.get("youtube_metadata", []):
-                    if isinstance(video, dict) and "url" in video:
-                        youtube_urls.append(video["url"])
-
-            # Remove duplicates
-            youtube_urls = list(set(youtube_urls))
+                    if not isinstance(video, dict):
+                        continue
+                    video_url = (
+                        video.get("url")
+                        or video.get("webpage_url")
+                        or video.get("original_url")
+                    )
+                    ref = parse_youtube_url(video_url) if video_url else None
+                    if ref:
+                        fetched_videos[ref.canonical_url] = video
+                        youtube_mentions.append({"url": ref.canonical_url})
+
+            # Score every video before fetching any, so the most relevant
+            # ones are fetched first. Every URL form of the same video
+            # collapses to one canonical URL.
+            candidates = self.enrichment_scheduler.rank(youtube_mentions, url)
+            # Mirrors linked under the same text are dropped before fetching
+            candidates, near_duplicate_videos = collapse_same_link_text(candidates)
+            youtube_urls = [candidate.url for candidate in candidates]
 
             self.logger.info(
                 f"🔍 Found {len(youtube_urls)} unique YouTube URLs to process"
             )
 
+            # Playlists and channels are listed flat and replaced by their
+            # videos in their place, instead of fully extracting every video
+            # they hold
+            try:
+                youtube_urls = await within_deadline(
+                    self.youtube_tool.expand_collections(youtube_urls, limit=10)
+                )
+            except DeadlineExceeded:
+                video_urls = only_videos(youtube_urls)
+                if len(video_urls) < len(youtube_urls):
+                    skipped_stages.append("youtube_collections")
+                youtube_urls = video_urls
+
             # Process each YouTube URL to get detailed metadata
             enhanced_youtube_metadata = []
+            skipped_youtube_urls = []
             if youtube_urls:
-                for youtube_url in youtube_urls[
-                    :10
-                ]:  # Limit to first 10 to avoid overwhelming
-                    try:
-                        self.logger.info(f"🎬 Processing YouTube URL: {youtube_url}")
-
-                        # Add tool span for YouTube metadata execution
-                        if hasattr(self.logger, "add_tool_span"):
-                            youtube_start_time = time.time()
-
-                        youtube_result = await self.youtube_tool.execute(youtube_url)
-
-                        # Log tool execution span
-                        if hasattr(self.logger, "add_tool_span"):
-                            youtube_duration = (
-                                time.time() - youtube_start_time
-                            ) * 1_000_000_000
-                            self.logger.add_tool_span(
-                                tool_name="youtube_metadata_tool",
-                                inputs={"url": youtube_url},
-                                outputs=youtube_result,
-                                duration_ns=int(youtube_duration),
-                                success=(
-                                    "error" not in youtube_result
-                                    if isinstance(youtube_result, dict)
-                                    else True
-                                ),
-                            )
-
-                        if (
-                            isinstance(youtube_result, dict)
-                            and "error" not in youtube_result
-                        ):
-                            enhanced_youtube_metadata.append(youtube_result)
-                            self.logger.info(
-                                f"✅ Successfully processed YouTube video: {youtube_result.get('title', 'Unknown')}"
-                            )
-                        else:
-                            self.logger.warning(
-                                f"⚠️ Failed to process YouTube URL: {youtube_url}"
-                            )
-
-                    except Exception as e:
-                        self.logger.error(
-                            f"❌ Error processing YouTube URL {youtube_url}: {str(e)}"
+                # Limit to the 10 best ranked to avoid overwhelming
+                selected_urls = youtube_urls[:10]
+                pending_urls = [
+                    url for url in selected_urls if url not in fetched_videos
+                ]
+                self.logger.info(
+                    f"🎬 Processing {len(pending_urls)} YouTube URLs in priority order"
+                )
+                enrichment = await self.enrichment_scheduler.run(
+                    pending_urls,
+                    lambda youtube_url: self.youtube_tool.execute(
+                        youtube_url, fields=LISTING_FIELDS
+                    ),
+                )
+                # The scheduler stops at the deadline of the current context
+                youtube_results = enrichment.results
+                if enrichment.skipped:
+                    self.logger.info(
+                        f"⏭️ Skipped {len(enrichment.skipped)} YouTube URLs"
+                    )
+                    skipped_youtube_urls = enrichment.skipped
+                    skipped_stages.append("youtube_metadata")
+                for youtube_url, error in enrichment.failed.items():
+                    self.logger.warning(
+                        f"⚠️ Failed to process YouTube URL: {youtube_url}: {error}"
+                    )
+
+                for youtube_url in selected_urls:
+                    if youtube_url in fetched_videos:
+                        enhanced_youtube_metadata.append(fetched_videos[youtube_url])
+                        continue
+                    if youtube_url not in youtube_results:
+                        continue
+
+                    youtube_result = youtube_results[youtube_url]
+
+                    # Log tool execution span
+                    if hasattr(self.logger, "add_tool_span"):
+                        youtube_duration = (
+                            youtube_result.get("extraction_time_ms", 0)
+                            if isinstance(youtube_result, dict)
+                            else 0
+                        ) * 1_000_000
+                        self.logger.add_tool_span(
+                            tool_name="youtube_metadata_tool",
+                            inputs={"url": youtube_url},
+                            outputs=youtube_result,
+                            duration_ns=int(youtube_duration),
+                            success=(
+                                "error" not in youtube_result
+                                if isinstance(youtube_result, dict)
+                                else True
+                            ),
+                        )
+
+                    if isinstance(youtube_result, dict) and "error" not in youtube_result:
+                        enhanced_youtube_metadata.append(youtube_result)
+                        self.logger.info(
+                            f"✅ Successfully processed YouTube video: {youtube_result.get('title', 'Unknown')}"
+                        )
+                    else:
+                        self.logger.warning(
+                            f"⚠️ Failed to process YouTube URL: {youtube_url}"
                         )
 
+            # Mirrors and re-uploads of one talk collapse into its first copy
+            # before anything else is spent on them
+            enhanced_youtube_metadata, fetched_duplicates = (
+                self._collapse_near_duplicate_videos(enhanced_youtube_metadata)
+            )
+            for original_url, duplicate_urls in fetched_duplicates.items():
+                near_duplicate_videos.setdefault(original_url, []).extend(
+                    duplicate_urls
+                )
+            if near_duplicate_videos:
+                self.logger.info(
+                    f"🧹 Collapsed {sum(map(len, near_duplicate_videos.values()))} near-duplicate YouTube videos"
+                )
+
             # Update the parsed data with enhanced YouTube metadata
             if enhanced_youtube_metadata:
                 if isinstance(parsed_data, dict):
@@ -481,11 +622,21 @@ This agent is perfect for:
                         f"🎬 Enhanced YouTube metadata with {len(enhanced_youtube_metadata)} videos"
                     )
 
+            # Keep this list's videos in the columnar store, so its aggregates
+            # and rankings come from the same arrays as those across lists. A
+            # partial run does not replace the videos of an earlier full one.
+            videos = parsed_data.get("youtube_metadata", [])
+            video_store = VideoStore() if skipped_stages else self.video_store
+            video_store.add_list(url, videos)
+            video_stats = video_store.aggregate(list_url=url)
+
             # Combine all results into final result
             youtube_count = len(parsed_data.get("youtube_metadata", []))
             result = {
                 "status": "success",
                 "url": url,
+                "partial": bool(skipped_stages),
+                "skipped_stages": skipped_stages,
                 "parsed_data": parsed_data,
                 "explicit_web_scraping": {
                     "status": (
@@ -518,16 +669,12 @@ This agent is perfect for:
                     "videos": parsed_data.get("youtube_metadata", [])[
                         :5
                     ],  # Include first 5 videos
-                    "total_views": sum(
-                        video.get("view_count", 0)
-                        for video in parsed_data.get("youtube_metadata", [])
-                    ),
-                    "avg_duration_minutes": sum(
-                        video.get("duration_seconds", 0)
-                        for video in parsed_data.get("youtube_metadata", [])
-                    )
-                    / max(youtube_count, 1)
-                    / 60,
+                    "total_views": video_stats["total_views"],
+                    "avg_duration_minutes": video_stats["avg_duration_minutes"],
+                    "engagement_rate": video_stats["engagement_rate"],
+                    "top_videos": video_store.top(5, list_url=url),
+                    "near_duplicates": near_duplicate_videos,
+                    "skipped_urls": skipped_youtube_urls,
                 },
                 "metadata": {
                     "total_items": parsed_data.get("total_items", 0),
@@ -554,6 +701,20 @@ This agent is perfect for:
                 f"Successfully completed processing of Awesome List: {url}"
             )
 
+            # Make the list and its videos searchable as soon as they exist
+            if self.search_index is not None:
+                try:
+                    indexed = self.search_index.add_result(result)
+                    self.logger.info(f"🔎 Indexed {indexed} documents for search")
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Failed to index results for search: {e}")
+
+            if self.video_store.path is not None:
+                try:
+                    self.video_store.save()
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Failed to save video store: {e}")
+
             # Clean up resources
             await self._cleanup_resources()
 
@@ -575,6 +736,88 @@ This agent is perfect for:
 
             return {"status": "error", "error": error_msg, "url": url}
 
+    @staticmethod
+    def _description_lines(video: Dict[str, Any]) -> List[str]:
+        description = video.get("description") or ""
+        return [line.strip() for line in description.splitlines() if line.strip()]
+
+    @classmethod
+    def _video_text(
+        cls, video: Dict[str, Any], boilerplate: frozenset = frozenset()
+    ) -> str:
+        """Title, description and transcript text of a video
+
+        Args:
+            video: Video metadata dictionary
+            boilerplate: Description lines to leave out
+        """
+        description = [
+            line for line in cls._description_lines(video) if line not in boilerplate
+        ]
+        return "\n".join(
+            [
+                video.get("title") or "",
+                "\n".join(description),
+                video.get("transcript") or "",
+            ]
+        )
+
+    def _collapse_near_duplicate_videos(
+        self, videos: List[Dict[str, Any]]
+    ) -> tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """Drop videos whose text nearly equals that of an earlier video.
+
+        Candidates come from MinHash LSH over title, description and
+        transcript shingles, so each video is compared with a handful of
+        others rather than all of them. Description lines shared by several
+        videos (channel links, sponsor blurbs) are left out of the text, and
+        a duplicate must also have a similar title, so different talks of one
+        channel are not merged.
+
+        Args:
+            videos: Video metadata dictionaries in list order
+
+        Returns:
+            The videos that were kept, and the URL of each kept video that
+            had duplicates mapped to the URLs of its duplicates
+        """
+        line_counts = Counter(
+            line for video in videos for line in set(self._description_lines(video))
+        )
+        boilerplate = frozenset(
+            line for line, count in line_counts.items() if count > 1
+        )
+
+        index = NearDuplicateIndex()
+        kept = []
+        duplicates: Dict[str, List[str]] = {}
+        for position, video in enumerate(videos):
+            title = video.get("title") or ""
+
+            def similar_title(other: int) -> bool:
+                return word_jaccard(title, videos[other].get("title") or "") >= 0.5
+
+            representative = index.add(
+                position, self._video_text(video, boilerplate), accept=similar_title
+            )
+            if representative is None:
+                kept.append(video)
+                continue
+            original_url = self._video_url(videos[representative], representative)
+            duplicates.setdefault(original_url, []).append(
+                self._video_url(video, position)
+            )
+        return kept, duplicates
+
+    @staticmethod
+    def _video_url(video: Dict[str, Any], position: int) -> str:
+        return (
+            video.get("webpage_url")
+            or video.get("url")
+            or video.get("original_url")
+            or f"#{position}"
+        )
+
     async def _format_result(
         self, task: str, results: List[tuple[str, Dict[str, Any]]]
     ) -> str:
@@ -4,12 +4,17 @@ import re
 import asyncio
 import aiohttp
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional
 from pydantic import BaseModel, Field
 
+from src.youtube_url_matcher import iter_youtube_matches, match_youtube_url
+
 from ..tools.base import BaseTool
 from ..tools.web_scraping_tool import WebScrapingTool
-from ..tools.youtube_metadata_tool import YouTubeMetadataTool
+from ..tools.youtube_metadata_tool import LISTING_FIELDS, YouTubeMetadataTool
+from ..utils.deadline import DeadlineExceeded, within_deadline
+from ..utils.enrichment_queue import EnrichmentScheduler, only_videos
+from ..utils.video_store import VideoStore
 from ..models import ToolMetadata, ToolError
 
 
@@ -82,13 +87,20 @@ class AwesomeListParser(BaseTool):
 
     metadata = AwesomeListParserMetadata
 
-    def __init__(self):
+    def __init__(self, popularity: Optional[Callable[[], Mapping[str, int]]] = None):
+        """Create the parser
+
+        Args:
+            popularity: Known view counts by video ID, used to rank videos
+                before fetching, e.g. VideoStore.view_counts
+        """
         self.session: Optional[aiohttp.ClientSession] = None
         self.logger = logging.getLogger("awesome_list_agent.AwesomeListParser")
 
         # Initialize sub-tools
         self.web_scraping_tool = WebScrapingTool()
         self.youtube_metadata_tool = YouTubeMetadataTool()
+        self.enrichment_scheduler = EnrichmentScheduler(popularity=popularity)
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create an aiohttp session."""
@@ -107,12 +119,16 @@ class AwesomeListParser(BaseTool):
         Args:
             url: The URL of the Awesome List to parse
 
+        Stages after basic parsing that cannot finish before the deadline of
+        the current context are skipped and listed in ``skipped_stages``.
+
         Returns:
             Dictionary containing parsed information about the list
         """
         import time
 
         start_time = time.time()
+        skipped_stages = []
 
         self.logger.info(f"Starting to parse Awesome List URL: {url}")
 
@@ -132,7 +148,7 @@ class AwesomeListParser(BaseTool):
             if hasattr(self.logger, "add_tool_span"):
                 basic_start_time = time.time()
 
-            basic_parsed_data = await self._parse_basic_content(url)
+            basic_parsed_data = await within_deadline(self._parse_basic_content(url))
 
             # Log basic parsing span
             if hasattr(self.logger, "add_tool_span"):
@@ -159,7 +175,14 @@ class AwesomeListParser(BaseTool):
             if hasattr(self.logger, "add_tool_span"):
                 scraping_start_time = time.time()
 
-            web_scraping_data = await self._perform_web_scraping(url)
+            try:
+                web_scraping_data = await within_deadline(
+                    self._perform_web_scraping(url)
+                )
+            except DeadlineExceeded:
+                self.logger.warning("Web scraping skipped: deadline exceeded")
+                web_scraping_data = {"error": "Skipped: deadline exceeded"}
+                skipped_stages.append("web_scraping")
 
             # Log web scraping span
             if hasattr(self.logger, "add_tool_span"):
@@ -184,7 +207,7 @@ class AwesomeListParser(BaseTool):
                 youtube_start_time = time.time()
 
             youtube_metadata = await self._extract_youtube_metadata(
-                basic_parsed_data, web_scraping_data
+                basic_parsed_data, web_scraping_data, skipped_stages
             )
 
             # Log YouTube metadata extraction span
@@ -211,6 +234,7 @@ class AwesomeListParser(BaseTool):
             comprehensive_result = await self._create_comprehensive_summary(
                 basic_parsed_data, web_scraping_data, youtube_metadata, url
             )
+            comprehensive_result["skipped_stages"] = skipped_stages
 
             # Log comprehensive summary creation span
             if hasattr(self.logger, "add_tool_span"):
@@ -263,6 +287,11 @@ class AwesomeListParser(BaseTool):
 
             return comprehensive_result
 
+        except DeadlineExceeded:
+            error_msg = "Deadline exceeded before the Awesome List was parsed"
+            self.logger.error(error_msg)
+            return ToolError(error=error_msg)
+
         except Exception as e:
             error_msg = f"Unexpected error parsing Awesome List: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
@@ -361,9 +390,17 @@ class AwesomeListParser(BaseTool):
             return {"error": str(e)}
 
     async def _extract_youtube_metadata(
-        self, basic_data: Dict[str, Any], web_data: Dict[str, Any]
+        self,
+        basic_data: Dict[str, Any],
+        web_data: Dict[str, Any],
+        skipped_stages: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        """Extract YouTube metadata from video links found in the awesome list."""
+        """Extract YouTube metadata from video links found in the awesome list.
+
+        Collections that cannot be listed and videos that cannot be fetched
+        before the deadline are left out, and "youtube_metadata" is added to
+        ``skipped_stages``.
+        """
         import time
 
         start_time = time.time()
@@ -371,8 +408,12 @@ class AwesomeListParser(BaseTool):
         try:
             youtube_metadata = []
 
-            # Extract YouTube URLs from web scraping data
-            youtube_urls = self._extract_youtube_urls(web_data)
+            # Rank the list's YouTube URLs before fetching any, so the most
+            # relevant ones are fetched first
+            candidates = self.enrichment_scheduler.rank(
+                self._youtube_mentions(web_data), basic_data.get("url", "")
+            )
+            youtube_urls = [candidate.url for candidate in candidates]
 
             if not youtube_urls:
                 self.logger.info("No YouTube URLs found in the awesome list")
@@ -380,58 +421,33 @@ class AwesomeListParser(BaseTool):
 
             self.logger.info(f"Found {len(youtube_urls)} YouTube URLs to analyze")
 
-            # Process each YouTube URL (limit to first 5 to avoid rate limiting)
-            for i, youtube_url in enumerate(youtube_urls[:5]):
-                try:
-                    self.logger.debug(
-                        f"Processing YouTube URL {i+1}/{min(len(youtube_urls), 5)}: {youtube_url}"
-                    )
-
-                    # Add tool span for YouTube metadata tool call
-                    if hasattr(self.logger, "add_tool_span"):
-                        tool_start_time = time.time()
-
-                    metadata = await self.youtube_metadata_tool.execute(
-                        url=youtube_url,
-                        extract_comments=False,  # Don't extract comments to keep it fast
-                    )
-
-                    # Log YouTube metadata tool span
-                    if hasattr(self.logger, "add_tool_span"):
-                        tool_duration = (time.time() - tool_start_time) * 1_000_000_000
-                        self.logger.add_tool_span(
-                            tool_name="youtube_metadata_tool",
-                            inputs={"url": youtube_url, "extract_comments": False},
-                            outputs=metadata,
-                            duration_ns=int(tool_duration),
-                            success=(
-                                "error" not in metadata
-                                if isinstance(metadata, dict)
-                                else True
-                            ),
-                        )
-
-                    # Handle ToolError objects properly
-                    if hasattr(metadata, "error"):
-                        self.logger.warning(
-                            f"Failed to extract metadata for YouTube URL {youtube_url}: {metadata.error}"
-                        )
-                        continue
-                    elif isinstance(metadata, dict) and "error" not in metadata:
-                        youtube_metadata.append(metadata)
-                        self.logger.debug(
-                            f"Successfully extracted metadata for: {metadata.get('title', 'Unknown')}"
-                        )
-                    else:
-                        self.logger.warning(
-                            f"Failed to extract metadata for YouTube URL: {youtube_url}"
-                        )
-
-                except Exception as e:
-                    self.logger.warning(
-                        f"Error processing YouTube URL {youtube_url}: {str(e)}"
-                    )
-                    continue
+            # Playlists and channels contribute their first videos, in their
+            # place in the ranking
+            skipped = False
+            try:
+                youtube_urls = await within_deadline(
+                    self.youtube_metadata_tool.expand_collections(youtube_urls, limit=5)
+                )
+            except DeadlineExceeded:
+                video_urls = only_videos(youtube_urls)
+                skipped = len(video_urls) < len(youtube_urls)
+                youtube_urls = video_urls
+
+            # Process the 5 best ranked URLs to avoid rate limiting; the
+            # scheduler stops at the deadline
+            enrichment = await self.enrichment_scheduler.run(
+                youtube_urls, self._fetch_youtube_metadata, limit=5
+            )
+            youtube_metadata.extend(
+                metadata for metadata in enrichment.results.values() if metadata
+            )
+            attempted = len(enrichment.results) + len(enrichment.failed)
+            if skipped or attempted < min(len(youtube_urls), 5):
+                self.logger.warning(
+                    "YouTube metadata extraction cut short: deadline exceeded"
+                )
+                if skipped_stages is not None:
+                    skipped_stages.append("youtube_metadata")
 
             self.logger.info(
                 f"Successfully extracted metadata for {len(youtube_metadata)} YouTube videos"
@@ -442,66 +458,75 @@ class AwesomeListParser(BaseTool):
             self.logger.error(f"Error during YouTube metadata extraction: {str(e)}")
             return []
 
-    def _extract_youtube_urls(self, web_data: Dict[str, Any]) -> List[str]:
-        """Extract YouTube URLs from web scraping data and text content."""
-        youtube_urls = []
-
-        # YouTube URL patterns for comprehensive extraction
-        youtube_patterns = [
-            # Standard YouTube URLs
-            r"https?://(?:www\.)?youtube\.com/watch\?v=[\w-]+(?:&[\w=&-]*)?",
-            r"https?://(?:www\.)?youtube\.com/embed/[\w-]+(?:\?[\w=&-]*)?",
-            r"https?://(?:www\.)?youtube\.com/v/[\w-]+(?:\?[\w=&-]*)?",
-            # YouTube short URLs
-            r"https?://youtu\.be/[\w-]+(?:\?[\w=&-]*)?",
-            # YouTube playlist URLs
-            r"https?://(?:www\.)?youtube\.com/playlist\?list=[\w-]+(?:&[\w=&-]*)?",
-            # YouTube channel URLs
-            r"https?://(?:www\.)?youtube\.com/channel/[\w-]+(?:\?[\w=&-]*)?",
-            r"https?://(?:www\.)?youtube\.com/c/[\w-]+(?:\?[\w=&-]*)?",
-            r"https?://(?:www\.)?youtube\.com/@[\w-]+(?:\?[\w=&-]*)?",
-        ]
-
-        # Extract from web scraping links
-        if "links" in web_data:
-            for link in web_data["links"]:
-                link_url = link.get("url", "")
-                if link_url:
-                    for pattern in youtube_patterns:
-                        if re.match(pattern, link_url):
-                            youtube_urls.append(link_url)
-                            break
-
-        # Extract from text content (markdown/HTML)
-        if "text_content" in web_data:
-            text_content = web_data["text_content"]
+    async def _fetch_youtube_metadata(
+        self, youtube_url: str
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch one video's metadata, or None if that failed."""
+        import time
+
+        try:
+            self.logger.debug(f"Processing YouTube URL: {youtube_url}")
+
+            # Add tool span for YouTube metadata tool call
+            if hasattr(self.logger, "add_tool_span"):
+                tool_start_time = time.time()
 
-            # Search for URLs in the text using all patterns
-            for pattern in youtube_patterns:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
-                youtube_urls.extend(matches)
+            metadata = await self.youtube_metadata_tool.execute(
+                url=youtube_url,
+                fields=LISTING_FIELDS,  # Skip formats to keep it fast
+            )
 
-            # Also search within markdown link syntax [text](url)
-            markdown_link_pattern = r"\[([^\]]*)\]\(([^)]+)\)"
-            markdown_links = re.findall(markdown_link_pattern, text_content)
+            # Log YouTube metadata tool span
+            if hasattr(self.logger, "add_tool_span"):
+                tool_duration = (time.time() - tool_start_time) * 1_000_000_000
+                self.logger.add_tool_span(
+                    tool_name="youtube_metadata_tool",
+                    inputs={"url": youtube_url},
+                    outputs=metadata,
+                    duration_ns=int(tool_duration),
+                    success=(
+                        "error" not in metadata if isinstance(metadata, dict) else True
+                    ),
+                )
 
-            for _, url in markdown_links:
-                for pattern in youtube_patterns:
-                    if re.match(pattern, url, re.IGNORECASE):
-                        youtube_urls.append(url)
-                        break
+            # Handle ToolError objects properly
+            if hasattr(metadata, "error"):
+                self.logger.warning(
+                    f"Failed to extract metadata for YouTube URL {youtube_url}: {metadata.error}"
+                )
+                return None
+            elif isinstance(metadata, dict) and "error" not in metadata:
+                self.logger.debug(
+                    f"Successfully extracted metadata for: {metadata.get('title', 'Unknown')}"
+                )
+                return metadata
+            else:
+                self.logger.warning(
+                    f"Failed to extract metadata for YouTube URL: {youtube_url}"
+                )
+                return None
 
-            # Search within markdown image syntax ![alt](url)
-            markdown_image_pattern = r"!\[([^\]]*)\]\(([^)]+)\)"
-            markdown_images = re.findall(markdown_image_pattern, text_content)
+        except Exception as e:
+            self.logger.warning(f"Error processing YouTube URL {youtube_url}: {str(e)}")
+            return None
 
-            for _, url in markdown_images:
-                for pattern in youtube_patterns:
-                    if re.match(pattern, url, re.IGNORECASE):
-                        youtube_urls.append(url)
-                        break
+    def _youtube_mentions(self, web_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Every YouTube link and URL of the scraped list, in document order.
 
-        return list(set(youtube_urls))  # Remove duplicates
+        Links keep their text and section for ranking; URLs found in the text
+        content only have their canonical URL.
+        """
+        mentions = []
+        for link in web_data.get("links", []):
+            match = match_youtube_url(link.get("url", ""))
+            if match:
+                mentions.append({**link, "url": match.canonical_url})
+        if "text_content" in web_data:
+            mentions.extend(
+                {"url": match.canonical_url}
+                for match in iter_youtube_matches(web_data["text_content"])
+            )
+        return mentions
 
     async def _create_comprehensive_summary(
         self,
@@ -549,10 +574,9 @@ class AwesomeListParser(BaseTool):
         # YouTube insights
         if youtube_data:
             video_count = len(youtube_data)
-            total_views = sum(video.get("view_count", 0) for video in youtube_data)
-            avg_duration = sum(
-                video.get("duration_seconds", 0) for video in youtube_data
-            ) / len(youtube_data)
+            stats = VideoStore.from_videos(youtube_data).aggregate()
+            total_views = stats["total_views"]
+            avg_duration = stats["avg_duration_minutes"] * 60
 
             summary_parts.append(
                 f"🎥 Found {video_count} YouTube videos with a total of {total_views:,} views."
@@ -833,3 +857,4 @@ class AwesomeListParser(BaseTool):
         if self.session:
             await self.session.close()
             self.session = None
+        await self.youtube_metadata_tool.cleanup()
@@ -1,14 +1,328 @@
 """Tool for analyzing content and extracting insights from text data."""
 
-import re
+import asyncio
+import heapq
+import math
+import os
 import logging
 import time
-from typing import Any, Dict, List, Optional, Counter
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    Counter,
+)
 from collections import defaultdict
 import json
 
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
 from .base import BaseTool
 from ..models import ToolMetadata, ToolError
+from ..utils.gazetteer import Gazetteer
+from ..utils.readability import (
+    COMPLEX_WORD_SYLLABLES,
+    METRIC_NAMES,
+    count_syllables,
+    count_word_syllables,
+    readability_arrays_from_columns,
+    readability_counts,
+    readability_metrics,
+)
+from ..utils.streaming_analysis import (
+    BULLET_LIST_RE,
+    CAPITALIZED_WORD_RE,
+    DEFAULT_CHUNK_SIZE,
+    FENCED_CODE_RE,
+    HEADING_RE,
+    INLINE_CODE_RE,
+    MARKDOWN_LINK_RE,
+    MAX_LISTED_ENTITIES,
+    NUMBERED_LIST_RE,
+    ORGANIZATION_RE,
+    URL_RE,
+    ContentTally,
+    aiter_text_chunks,
+)
+from ..utils.text_tokens import TokenizedText, tokenize_text
+from ..utils.tfidf_index import DocumentFrequencyIndex
+from ..utils.topic_sketch import TopicTrends
+
+# Common positive and negative words for sentiment analysis
+POSITIVE_WORDS = frozenset(
+    {
+        "good",
+        "great",
+        "excellent",
+        "amazing",
+        "wonderful",
+        "fantastic",
+        "awesome",
+        "best",
+        "perfect",
+        "outstanding",
+        "brilliant",
+        "superb",
+        "terrific",
+        "incredible",
+        "love",
+        "like",
+        "enjoy",
+        "happy",
+        "pleased",
+        "satisfied",
+        "impressed",
+        "useful",
+        "helpful",
+        "effective",
+        "efficient",
+        "powerful",
+        "fast",
+        "easy",
+        "simple",
+        "clear",
+        "comprehensive",
+        "detailed",
+        "thorough",
+        "complete",
+        "reliable",
+    }
+)
+
+NEGATIVE_WORDS = frozenset(
+    {
+        "bad",
+        "terrible",
+        "awful",
+        "horrible",
+        "worst",
+        "poor",
+        "disappointing",
+        "frustrating",
+        "annoying",
+        "difficult",
+        "complicated",
+        "confusing",
+        "unclear",
+        "slow",
+        "broken",
+        "error",
+        "fail",
+        "problem",
+        "issue",
+        "bug",
+        "crash",
+        "hate",
+        "dislike",
+        "unhappy",
+        "angry",
+        "upset",
+        "disappointed",
+        "useless",
+        "ineffective",
+        "inefficient",
+        "weak",
+        "limited",
+        "incomplete",
+        "unreliable",
+    }
+)
+
+# Stop words are built once at import, not on every call
+TOPIC_STOP_WORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+        "may",
+        "might",
+        "can",
+        "this",
+        "that",
+        "these",
+        "those",
+        "i",
+        "you",
+        "he",
+        "she",
+        "it",
+        "we",
+        "they",
+        "me",
+        "him",
+        "her",
+        "us",
+        "them",
+        "my",
+        "your",
+        "his",
+        "its",
+        "our",
+        "their",
+        "mine",
+        "yours",
+        "hers",
+        "ours",
+        "theirs",
+        "what",
+        "when",
+        "where",
+        "why",
+        "how",
+        "who",
+        "which",
+    }
+)
+
+KEYWORD_STOP_WORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+    }
+)
+
+POSITIVE_LABEL = "positive"
+NEGATIVE_LABEL = "negative"
+
+# Domain terms reported as entities, by entity type. Matched on whole words,
+# case-insensitively except for CASE_SENSITIVE_ENTITY_TERMS; multi-word terms
+# are matched as phrases.
+DEFAULT_ENTITY_TERMS: Dict[str, Tuple[str, ...]] = {
+    "technology": (
+        "Python",
+        "JavaScript",
+        "TypeScript",
+        "Rust",
+        "Golang",
+        "Java",
+        "Kotlin",
+        "React",
+        "Vue",
+        "Angular",
+        "Svelte",
+        "Node.js",
+        "Django",
+        "Flask",
+        "FastAPI",
+        "PyTorch",
+        "TensorFlow",
+        "Kubernetes",
+        "Docker",
+        "PostgreSQL",
+        "SQLite",
+        "Redis",
+        "GraphQL",
+        "WebAssembly",
+        "GitHub Actions",
+        "machine learning",
+        "deep learning",
+        "large language models",
+        "natural language processing",
+        "computer vision",
+    ),
+    "organization": (
+        "Google",
+        "Microsoft",
+        "OpenAI",
+        "Anthropic",
+        "Mozilla",
+        "GitHub",
+        "Hugging Face",
+        "Amazon Web Services",
+        "Python Software Foundation",
+        "Linux Foundation",
+        "Apache Software Foundation",
+        "Rust Foundation",
+    ),
+    "person": (
+        "Guido van Rossum",
+        "Linus Torvalds",
+        "Andrej Karpathy",
+        "Andrew Ng",
+        "Geoffrey Hinton",
+        "Yann LeCun",
+        "Dan Abramov",
+    ),
+}
+
+
+# Single-word terms that are also common words ("rust", "react", "flask"),
+# only counted where they are written exactly like this
+CASE_SENSITIVE_ENTITY_TERMS = frozenset(
+    ("Rust", "Java", "React", "Vue", "Angular", "Flask")
+)
 
 
 class ContentAnalysisToolMetadata(ToolMetadata):
@@ -64,6 +378,11 @@ class ContentAnalysisToolMetadata(ToolMetadata):
                 "description": "Maximum number of keywords to extract (default: 20)",
                 "default": 20,
             },
+            "update_index": {
+                "type": "boolean",
+                "description": "Whether to add the text to the corpus document frequency index used for keyword IDF (default: false)",
+                "default": False,
+            },
         },
         "required": ["text"],
     }
@@ -127,6 +446,7 @@ class ContentAnalysisToolMetadata(ToolMetadata):
                     "properties": {
                         "keyword": {"type": "string"},
                         "frequency": {"type": "integer"},
+                        "idf": {"type": "number"},
                         "tf_idf_score": {"type": "number"},
                     },
                 },
@@ -169,84 +489,59 @@ class ContentAnalysisTool(BaseTool):
 
     metadata = ContentAnalysisToolMetadata
 
-    def __init__(self):
-        self.logger = logging.getLogger("awesome_list_agent.ContentAnalysisTool")
+    def __init__(
+        self,
+        df_index: Optional[DocumentFrequencyIndex] = None,
+        entity_terms: Optional[Mapping[str, Iterable[str]]] = None,
+        topic_trends: Optional[TopicTrends] = None,
+    ):
+        """Create the tool
 
-        # Common positive and negative words for sentiment analysis
-        self.positive_words = {
-            "good",
-            "great",
-            "excellent",
-            "amazing",
-            "wonderful",
-            "fantastic",
-            "awesome",
-            "best",
-            "perfect",
-            "outstanding",
-            "brilliant",
-            "superb",
-            "terrific",
-            "incredible",
-            "love",
-            "like",
-            "enjoy",
-            "happy",
-            "pleased",
-            "satisfied",
-            "impressed",
-            "useful",
-            "helpful",
-            "effective",
-            "efficient",
-            "powerful",
-            "fast",
-            "easy",
-            "simple",
-            "clear",
-            "comprehensive",
-            "detailed",
-            "thorough",
-            "complete",
-            "reliable",
-        }
+        Args:
+            df_index: Corpus document frequency index for keyword IDF. Defaults
+                to the index at $CONTENT_DF_INDEX_PATH if set, else an
+                in-memory index.
+            entity_terms: Entity type -> known terms to report as entities.
+                Defaults to the JSON file at $CONTENT_GAZETTEER_PATH if set,
+                else DEFAULT_ENTITY_TERMS.
+            topic_trends: Weekly topic trends, fed with the topics of every
+                indexed document. Defaults to trends stored in the directory
+                $CONTENT_TOPIC_TRENDS_DIR if set, else in memory.
+        """
+        self.logger = logging.getLogger("awesome_list_agent.ContentAnalysisTool")
 
-        self.negative_words = {
-            "bad",
-            "terrible",
-            "awful",
-            "horrible",
-            "worst",
-            "poor",
-            "disappointing",
-            "frustrating",
-            "annoying",
-            "difficult",
-            "complicated",
-            "confusing",
-            "unclear",
-            "slow",
-            "broken",
-            "error",
-            "fail",
-            "problem",
-            "issue",
-            "bug",
-            "crash",
-            "hate",
-            "dislike",
-            "unhappy",
-            "angry",
-            "upset",
-            "disappointed",
-            "useless",
-            "ineffective",
-            "inefficient",
-            "weak",
-            "limited",
-            "incomplete",
-            "unreliable",
-        }
+        if df_index is None:
+            index_path = os.getenv("CONTENT_DF_INDEX_PATH")
+            df_index = (
+                DocumentFrequencyIndex.load_or_create(index_path)
+                if index_path
+                else DocumentFrequencyIndex()
+            )
+        self.df_index = df_index
+
+        if topic_trends is None:
+            topic_trends = TopicTrends(os.getenv("CONTENT_TOPIC_TRENDS_DIR"))
+        self.topic_trends = topic_trends
+
+        if entity_terms is None:
+            gazetteer_path = os.getenv("CONTENT_GAZETTEER_PATH")
+            entity_terms = (
+                Gazetteer.load_lexicons(gazetteer_path)
+                if gazetteer_path
+                else DEFAULT_ENTITY_TERMS
+            )
+        self.entity_types = frozenset(entity_terms)
+
+        # One automaton for the sentiment lexicons and the entity gazetteer
+        self.gazetteer = Gazetteer(
+            [(word, POSITIVE_LABEL) for word in sorted(POSITIVE_WORDS)]
+            + [(word, NEGATIVE_LABEL) for word in sorted(NEGATIVE_WORDS)]
+            + [
+                (term, entity_type)
+                for entity_type, terms in entity_terms.items()
+                for term in terms
+            ]
+        )
 
     async def execute(
         self,
@@ -258,6 +553,7 @@ class ContentAnalysisTool(BaseTool):
         extract_keywords: bool = True,
         max_topics: int = 10,
         max_keywords: int = 20,
+        update_index: bool = False,
     ) -> Dict[str, Any]:
         """Analyze text content and extract various insights.
 
@@ -270,6 +566,8 @@ class ContentAnalysisTool(BaseTool):
             extract_keywords: Whether to extract keywords
             max_topics: Maximum number of topics to extract
             max_keywords: Maximum number of keywords to extract
+            update_index: Whether to add the text to the document frequency
+                index and its topics to the topic sketch
 
         Returns:
             Dictionary containing comprehensive content analysis results
@@ -284,33 +582,49 @@ class ContentAnalysisTool(BaseTool):
                 f"Analysis options: sentiment={analyze_sentiment}, topics={extract_topics}, entities={extract_entities}, readability={analyze_readability}, keywords={extract_keywords}"
             )
 
+            # Tokenize once; every analyzer reads from the same structure
+            tokens = tokenize_text(text)
+
+            # Count this document in the corpus before scoring its keywords
+            if update_index:
+                self.df_index.add_document(tokens.alpha_words)
+
             # Basic text statistics
-            result = self._calculate_basic_stats(text)
+            result = self._calculate_basic_stats(text, tokens)
+
+            # Match lexicon and gazetteer terms once for sentiment and entities
+            term_counts = None
+            if extract_entities:
+                term_counts = self.gazetteer.count(tokens.words, tokens.word_counts)
+            elif analyze_sentiment:
+                term_counts = self.gazetteer.count_single(tokens.word_counts)
 
             # Perform requested analyses
             if analyze_sentiment:
                 self.logger.debug("Performing sentiment analysis")
-                result["sentiment"] = self._analyze_sentiment(text)
+                result["sentiment"] = self._analyze_sentiment(text, tokens, term_counts)
 
             if extract_topics:
                 self.logger.debug("Extracting topics")
-                result["topics"] = self._extract_topics(text, max_topics)
+                result["topics"] = self._extract_topics(text, max_topics, tokens)
+                if update_index:
+                    self.topic_trends.add_document(result["topics"])
 
             if extract_entities:
                 self.logger.debug("Extracting entities")
-                result["entities"] = self._extract_entities(text)
+                result["entities"] = self._extract_entities(text, tokens, term_counts)
 
             if extract_keywords:
                 self.logger.debug("Extracting keywords")
-                result["keywords"] = self._extract_keywords(text, max_keywords)
+                result["keywords"] = self._extract_keywords(text, max_keywords, tokens)
 
             if analyze_readability:
                 self.logger.debug("Calculating readability metrics")
-                result["readability"] = self._calculate_readability(text)
+                result["readability"] = self._calculate_readability(text, tokens)
 
             # Content structure analysis
             self.logger.debug("Analyzing content structure")
-            result["content_structure"] = self._analyze_content_structure(text)
+            result["content_structure"] = self._analyze_content_structure(text, tokens)
 
             # Generate analysis summary
             result["analysis_summary"] = self._generate_analysis_summary(result)
@@ -332,54 +646,468 @@ class ContentAnalysisTool(BaseTool):
             self.logger.error(error_msg, exc_info=True)
             return ToolError(error=error_msg)
 
-    def _calculate_basic_stats(self, text: str) -> Dict[str, int]:
-        """Calculate basic text statistics."""
-        # Remove extra whitespace
-        cleaned_text = re.sub(r"\s+", " ", text.strip())
+    async def analyze_many(
+        self,
+        texts: Sequence[str],
+        analyze_sentiment: bool = True,
+        extract_topics: bool = True,
+        extract_entities: bool = True,
+        analyze_readability: bool = True,
+        extract_keywords: bool = True,
+        max_topics: int = 10,
+        max_keywords: int = 20,
+        update_index: bool = False,
+        processes: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Analyze many texts at once.
+
+        Documents are batched into a sparse document-term matrix so basic
+        stats, sentiment scores, topics and readability are computed with
+        vectorized NumPy/SciPy operations instead of per-document counting.
+        Results match calling execute() on each text in order.
+
+        Args:
+            texts: The texts to analyze
+            analyze_sentiment: Whether to perform sentiment analysis
+            extract_topics: Whether to extract key topics
+            extract_entities: Whether to extract named entities
+            analyze_readability: Whether to calculate readability metrics
+            extract_keywords: Whether to extract keywords
+            max_topics: Maximum number of topics to extract per text
+            max_keywords: Maximum number of keywords to extract per text
+            update_index: Whether to add the texts to the document frequency
+                index and their topics to the topic sketch
+            processes: Shard the batch across this many worker processes
+
+        Returns:
+            One analysis result per text, in input order
+        """
+        options = {
+            "analyze_sentiment": analyze_sentiment,
+            "extract_topics": extract_topics,
+            "extract_entities": extract_entities,
+            "analyze_readability": analyze_readability,
+            "extract_keywords": extract_keywords,
+            "max_topics": max_topics,
+            "max_keywords": max_keywords,
+            "update_index": update_index,
+        }
+        texts = list(texts)
+
+        if np is None or sparse is None:
+            self.logger.debug("NumPy/SciPy unavailable, analyzing texts one by one")
+            return [await self.execute(text, **options) for text in texts]
+
+        start_time = time.perf_counter_ns()
+        self.logger.info(f"Starting batch content analysis of {len(texts)} texts")
+
+        if processes and processes > 1 and len(texts) > 1:
+            shard_size = math.ceil(len(texts) / processes)
+            shards = [
+                texts[i : i + shard_size] for i in range(0, len(texts), shard_size)
+            ]
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+                parts = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool,
+                            _analyze_shard,
+                            shard,
+                            max_topics,
+                            extract_entities,
+                            self.gazetteer,
+                            self.entity_types,
+                        )
+                        for shard in shards
+                    )
+                )
+            analyzed = [item for part in parts for item in part]
+        else:
+            analyzed = self._analyze_batch(texts, max_topics, extract_entities)
+
+        # Keyword IDF depends on the corpus index, so documents are added and
+        # scored in input order here, exactly as sequential execute() calls
+        results = []
+        for result, keyword_counts, alpha_terms in analyzed:
+            if update_index:
+                self.df_index.add_document(alpha_terms)
+            if extract_keywords:
+                result["keywords"] = self._score_keywords(keyword_counts, max_keywords)
+            if not analyze_sentiment:
+                del result["sentiment"]
+            if not extract_topics:
+                del result["topics"]
+            elif update_index:
+                self.topic_trends.add_document(result["topics"])
+            if not analyze_readability:
+                del result["readability"]
+            result["analysis_summary"] = self._generate_analysis_summary(result)
+            results.append(result)
+
+        duration_ns = time.perf_counter_ns() - start_time
+        for result in results:
+            result["analysis_time_ms"] = duration_ns / 1_000_000 / len(results)
+
+        self.logger.info(
+            f"Analyzed {len(texts)} texts in {duration_ns / 1_000_000:.2f}ms"
+        )
+        return results
+
+    async def analyze_stream(
+        self,
+        chunks: Union[Iterable[str], AsyncIterable[str]],
+        analyze_sentiment: bool = True,
+        extract_topics: bool = True,
+        extract_entities: bool = True,
+        analyze_readability: bool = True,
+        extract_keywords: bool = True,
+        max_topics: int = 10,
+        max_keywords: int = 20,
+        update_index: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        processes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Analyze a text that arrives in pieces, without holding it in memory.
+
+        The pieces are re-cut at safe boundaries into chunks of about
+        ``chunk_size`` characters. Each chunk is reduced to a mergeable
+        ContentTally (word counters, sentence and paragraph tallies, structure
+        flags) and the tallies are merged in order, so memory is bounded by
+        the chunk size and the vocabulary. The result equals execute() on the
+        concatenated text.
+
+        Args:
+            chunks: Sync or async iterable of text pieces of any size
+            analyze_sentiment: Whether to perform sentiment analysis
+            extract_topics: Whether to extract key topics
+            extract_entities: Whether to extract named entities
+            analyze_readability: Whether to calculate readability metrics
+            extract_keywords: Whether to extract keywords
+            max_topics: Maximum number of topics to extract
+            max_keywords: Maximum number of keywords to extract
+            update_index: Whether to add the text to the document frequency
+                index and its topics to the topic sketch
+            chunk_size: Approximate number of characters analyzed at a time
+            processes: Tally chunks in this many worker processes
+
+        Returns:
+            Dictionary containing comprehensive content analysis results
+        """
+        start_time = time.perf_counter_ns()
+
+        try:
+            self.logger.info("Starting streaming content analysis")
+            tally = ContentTally()
+            at_start = True
+            # Multi-word entity terms are counted per chunk and across chunks
+            gazetteer = self.gazetteer if extract_entities else None
+
+            if processes and processes > 1:
+                loop = asyncio.get_running_loop()
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    # Bound the chunks in flight; merge results in input order
+                    pending = deque()
+                    async for chunk in aiter_text_chunks(chunks, chunk_size):
+                        pending.append(
+                            loop.run_in_executor(
+                                pool,
+                                ContentTally.from_text,
+                                chunk,
+                                at_start,
+                                extract_entities,
+                                gazetteer,
+                            )
+                        )
+                        at_start = False
+                        if len(pending) >= 2 * processes:
+                            tally.merge(await pending.popleft())
+                    while pending:
+                        tally.merge(await pending.popleft())
+            else:
+                async for chunk in aiter_text_chunks(chunks, chunk_size):
+                    tally.merge(
+                        ContentTally.from_text(
+                            chunk, at_start, extract_entities, gazetteer
+                        )
+                    )
+                    at_start = False
+
+            self.logger.debug(f"Text length: {tally.text_length} characters")
+
+            if update_index:
+                self.df_index.add_document(tally.alpha_word_counts)
+
+            result = self._result_from_tally(
+                tally,
+                analyze_sentiment=analyze_sentiment,
+                extract_topics=extract_topics,
+                extract_entities=extract_entities,
+                analyze_readability=analyze_readability,
+                extract_keywords=extract_keywords,
+                max_topics=max_topics,
+                max_keywords=max_keywords,
+            )
+            if extract_topics and update_index:
+                self.topic_trends.add_document(result["topics"])
+
+            duration_ns = time.perf_counter_ns() - start_time
+            self.logger.info("Successfully completed streaming content analysis")
+            self.logger.debug(f"Analysis completed in {duration_ns / 1_000_000:.2f}ms")
+            result["analysis_time_ms"] = duration_ns / 1_000_000
+
+            return result
+
+        except Exception as e:
+            error_msg = f"Unexpected error during content analysis: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            return ToolError(error=error_msg)
+
+    def _result_from_tally(
+        self,
+        tally: ContentTally,
+        analyze_sentiment: bool,
+        extract_topics: bool,
+        extract_entities: bool,
+        analyze_readability: bool,
+        extract_keywords: bool,
+        max_topics: int,
+        max_keywords: int,
+    ) -> Dict[str, Any]:
+        """Build an execute()-style result from a merged tally."""
+        result: Dict[str, Any] = {
+            "text_length": tally.text_length,
+            "word_count": tally.whitespace_words,
+            "sentence_count": tally.sentences.count,
+            "paragraph_count": tally.paragraphs.count,
+        }
+
+        term_counts = self.gazetteer.count_single(tally.word_counts)
+        term_counts.update(tally.phrase_counts)
+
+        if analyze_sentiment:
+            result["sentiment"] = self._sentiment_from_counts(
+                term_counts, tally.word_total
+            )
+
+        if extract_topics:
+            result["topics"] = self._topics_from_counts(
+                tally.alpha_word_counts, max_topics
+            )
+
+        if extract_entities:
+            result["entities"] = self._entities_from_matches(
+                tally.capitalized_counts, tally.organizations, tally.urls, term_counts
+            )
+
+        if extract_keywords:
+            result["keywords"] = self._score_keywords(
+                (
+                    (word, freq)
+                    for word, freq in tally.alpha_word_counts.items()
+                    if word not in KEYWORD_STOP_WORDS
+                ),
+                max_keywords,
+            )
+
+        if analyze_readability:
+            result["readability"] = readability_metrics(tally.readability_counts())
+
+        result["content_structure"] = {
+            "has_headings": tally.has_headings,
+            "has_lists": tally.has_lists,
+            "has_links": tally.has_links,
+            "has_code_blocks": tally.has_code_blocks,
+            "average_sentence_length": tally.average_sentence_length,
+            "average_word_length": tally.average_word_length,
+        }
+
+        result["analysis_summary"] = self._generate_analysis_summary(result)
+        return result
+
+    def _analyze_batch(
+        self, texts: Sequence[str], max_topics: int, extract_entities: bool
+    ) -> List[Tuple[Dict[str, Any], List[Tuple[str, int]], List[str]]]:
+        """Vectorized analysis of a batch of texts.
+
+        Returns, per text, the partial result (everything but keywords), the
+        keyword candidates with their counts, and the terms to add to the
+        document frequency index.
+        """
+        tokens_list = [tokenize_text(text) for text in texts]
+
+        # Sparse document-term matrix over lowercased words. Each row keeps its
+        # terms in first-seen order so frequency ties break like Counter.
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for tokens in tokens_list:
+            word_counts = tokens.word_counts
+            indices.extend(
+                vocabulary.setdefault(w, len(vocabulary)) for w in word_counts
+            )
+            data.extend(word_counts.values())
+            indptr.append(len(indices))
+
+        indices = np.array(indices, dtype=np.int64)
+        data = np.array(data, dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (data, indices, np.array(indptr, dtype=np.int64)),
+            shape=(len(texts), len(vocabulary)),
+        )
+
+        # Per-term attributes, computed once per distinct term in the batch
+        terms = list(vocabulary)
+        positive = np.fromiter(
+            (t in POSITIVE_WORDS for t in terms), dtype=bool, count=len(terms)
+        )
+        negative = np.fromiter(
+            (t in NEGATIVE_WORDS for t in terms), dtype=bool, count=len(terms)
+        )
+        syllables = np.fromiter(
+            (count_word_syllables(t) for t in terms), dtype=np.int64, count=len(terms)
+        )
+        alpha = np.fromiter(
+            (len(t) >= 3 and t.isascii() and t.isalpha() for t in terms),
+            dtype=bool,
+            count=len(terms),
+        )
+        topic_terms = alpha & ~np.fromiter(
+            (t in TOPIC_STOP_WORDS for t in terms), dtype=bool, count=len(terms)
+        )
+        keyword_terms = alpha & ~np.fromiter(
+            (t in KEYWORD_STOP_WORDS for t in terms), dtype=bool, count=len(terms)
+        )
+
+        # Per-document totals as sparse matrix-vector products
+        word_totals = np.asarray(matrix.sum(axis=1)).ravel()
+        positive_totals = matrix @ positive.astype(np.int64)
+        negative_totals = matrix @ negative.astype(np.int64)
+        syllable_totals = matrix @ syllables
+        complex_totals = matrix @ (syllables > COMPLEX_WORD_SYLLABLES).astype(np.int64)
+        topic_totals = matrix @ topic_terms.astype(np.int64)
+
+        readability = readability_arrays_from_columns(
+            [len(tokens.sentences) for tokens in tokens_list],
+            word_totals,
+            syllable_totals,
+            complex_totals,
+            [tokens.letter_count for tokens in tokens_list],
+        )
+        readability_rows = zip(*(readability[name].tolist() for name in METRIC_NAMES))
+
+        analyzed = []
+        for i, (text, tokens) in enumerate(zip(texts, tokens_list)):
+            row_terms = indices[indptr[i] : indptr[i + 1]]
+            row_counts = data[indptr[i] : indptr[i + 1]]
+
+            total_words = int(word_totals[i])
+            sentiment_score = (
+                (int(positive_totals[i]) - int(negative_totals[i])) / total_words
+                if total_words
+                else 0
+            )
+
+            selected = topic_terms[row_terms]
+            topic_ids = row_terms[selected].tolist()
+            topic_counts = row_counts[selected].tolist()
+            top = np.argsort(-row_counts[selected], kind="stable")[:max_topics].tolist()
+            topic_total = int(topic_totals[i])
+
+            selected = keyword_terms[row_terms]
+            keyword_counts = list(
+                zip(
+                    (terms[j] for j in row_terms[selected].tolist()),
+                    row_counts[selected].tolist(),
+                )
+            )
+
+            result = {
+                "text_length": len(text),
+                "word_count": tokens.whitespace_word_count,
+                "sentence_count": len(tokens.sentences),
+                "paragraph_count": tokens.paragraph_count,
+                "sentiment": {
+                    "overall": self._sentiment_label(sentiment_score),
+                    "score": sentiment_score,
+                    "positive_words": [
+                        terms[j] for j in row_terms[positive[row_terms]].tolist()
+                    ],
+                    "negative_words": [
+                        terms[j] for j in row_terms[negative[row_terms]].tolist()
+                    ],
+                },
+                "topics": [
+                    {
+                        "topic": terms[topic_ids[k]],
+                        "frequency": topic_counts[k],
+                        "relevance_score": topic_counts[k] / topic_total,
+                    }
+                    for k in top
+                ],
+                "readability": dict(zip(METRIC_NAMES, next(readability_rows))),
+                "content_structure": self._analyze_content_structure(text, tokens),
+            }
+            if extract_entities:
+                result["entities"] = self._extract_entities(text, tokens)
 
-        # Count words
-        words = cleaned_text.split()
-        word_count = len(words)
+            alpha_terms = [terms[j] for j in row_terms[alpha[row_terms]].tolist()]
+            analyzed.append((result, keyword_counts, alpha_terms))
 
-        # Count sentences (simple approach)
-        sentences = re.split(r"[.!?]+", cleaned_text)
-        sentence_count = len([s for s in sentences if s.strip()])
+        return analyzed
 
-        # Count paragraphs
-        paragraphs = [p for p in text.split("\n\n") if p.strip()]
-        paragraph_count = len(paragraphs)
+    def _calculate_basic_stats(
+        self, text: str, tokens: Optional[TokenizedText] = None
+    ) -> Dict[str, int]:
+        """Calculate basic text statistics."""
+        if tokens is None:
+            tokens = tokenize_text(text)
 
         return {
             "text_length": len(text),
-            "word_count": word_count,
-            "sentence_count": sentence_count,
-            "paragraph_count": paragraph_count,
+            "word_count": tokens.whitespace_word_count,
+            "sentence_count": len(tokens.sentences),
+            "paragraph_count": tokens.paragraph_count,
         }
 
-    def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
+    def _analyze_sentiment(
+        self,
+        text: str,
+        tokens: Optional[TokenizedText] = None,
+        term_counts: Optional[Counter] = None,
+    ) -> Dict[str, Any]:
         """Perform basic sentiment analysis."""
-        words = re.findall(r"\b\w+\b", text.lower())
-
-        positive_count = sum(1 for word in words if word in self.positive_words)
-        negative_count = sum(1 for word in words if word in self.negative_words)
+        if tokens is None:
+            tokens = tokenize_text(text)
+        if term_counts is None:
+            term_counts = self.gazetteer.count_single(tokens.word_counts)
+        return self._sentiment_from_counts(term_counts, len(tokens.words))
+
+    def _sentiment_from_counts(
+        self, term_counts: Counter, total_words: int
+    ) -> Dict[str, Any]:
+        """Score sentiment from gazetteer term counts."""
+        terms = self.gazetteer.terms
+        labels = self.gazetteer.labels
+        positive_words_found = []
+        negative_words_found = []
+        positive_count = 0
+        negative_count = 0
+        for term_id, occurrences in term_counts.items():
+            if labels[term_id] == POSITIVE_LABEL:
+                positive_words_found.append(terms[term_id])
+                positive_count += occurrences
+            elif labels[term_id] == NEGATIVE_LABEL:
+                negative_words_found.append(terms[term_id])
+                negative_count += occurrences
 
-        total_words = len(words)
         if total_words == 0:
             sentiment_score = 0
         else:
             sentiment_score = (positive_count - negative_count) / total_words
 
-        # Determine overall sentiment
-        if sentiment_score > 0.05:
-            overall_sentiment = "positive"
-        elif sentiment_score < -0.05:
-            overall_sentiment = "negative"
-        else:
-            overall_sentiment = "neutral"
-
-        # Find positive and negative words
-        positive_words_found = [word for word in words if word in self.positive_words]
-        negative_words_found = [word for word in words if word in self.negative_words]
+        overall_sentiment = self._sentiment_label(sentiment_score)
 
         return {
             "overall": overall_sentiment,
@@ -388,309 +1116,211 @@ class ContentAnalysisTool(BaseTool):
             "negative_words": list(set(negative_words_found)),
         }
 
-    def _extract_topics(self, text: str, max_topics: int) -> List[Dict[str, Any]]:
+    def _sentiment_label(self, sentiment_score: float) -> str:
+        """Map a sentiment score to positive, negative or neutral."""
+        if sentiment_score > 0.05:
+            return "positive"
+        if sentiment_score < -0.05:
+            return "negative"
+        return "neutral"
+
+    def _extract_topics(
+        self, text: str, max_topics: int, tokens: Optional[TokenizedText] = None
+    ) -> List[Dict[str, Any]]:
         """Extract key topics from the text."""
+        if tokens is None:
+            tokens = tokenize_text(text)
         # Simple topic extraction based on word frequency
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", text.lower())
+        return self._topics_from_counts(Counter(tokens.alpha_words), max_topics)
 
+    def _topics_from_counts(
+        self, alpha_word_counts: Counter, max_topics: int
+    ) -> List[Dict[str, Any]]:
+        """Pick the most frequent words, other than stop words, as topics."""
         # Remove common stop words
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-            "can",
-            "this",
-            "that",
-            "these",
-            "those",
-            "i",
-            "you",
-            "he",
-            "she",
-            "it",
-            "we",
-            "they",
-            "me",
-            "him",
-            "her",
-            "us",
-            "them",
-            "my",
-            "your",
-            "his",
-            "her",
-            "its",
-            "our",
-            "their",
-            "mine",
-            "yours",
-            "his",
-            "hers",
-            "ours",
-            "theirs",
-            "what",
-            "when",
-            "where",
-            "why",
-            "how",
-            "who",
-            "which",
-        }
-
-        filtered_words = [word for word in words if word not in stop_words]
-
-        # Count word frequencies
-        word_freq = Counter(filtered_words)
+        word_freq = Counter(
+            {
+                word: freq
+                for word, freq in alpha_word_counts.items()
+                if word not in TOPIC_STOP_WORDS
+            }
+        )
+        total_words = sum(word_freq.values())
 
         # Get top topics
         topics = []
         for word, freq in word_freq.most_common(max_topics):
-            relevance_score = freq / len(filtered_words) if filtered_words else 0
+            relevance_score = freq / total_words if total_words else 0
             topics.append(
                 {"topic": word, "frequency": freq, "relevance_score": relevance_score}
             )
 
         return topics
 
-    def _extract_entities(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_entities(
+        self,
+        text: str,
+        tokens: Optional[TokenizedText] = None,
+        term_counts: Optional[Counter] = None,
+    ) -> List[Dict[str, Any]]:
         """Extract named entities from the text."""
-        # Simple entity extraction based on capitalization patterns
-        entities = []
+        if term_counts is None:
+            if tokens is None:
+                tokens = tokenize_text(text)
+            term_counts = self.gazetteer.count(tokens.words, tokens.word_counts)
 
+        # Simple entity extraction based on capitalization patterns
         # Find capitalized words (potential proper nouns)
-        capitalized_words = re.findall(r"\b[A-Z][a-z]+\b", text)
-        word_freq = Counter(capitalized_words)
+        word_freq = Counter(CAPITALIZED_WORD_RE.findall(text))
 
         # Find potential organizations (words with common org suffixes)
-        org_pattern = r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Inc|Corp|LLC|Ltd|Company|Organization|Foundation|Institute|University|College)\b"
-        orgs = re.findall(org_pattern, text)
+        orgs = [
+            m.group()
+            for m in islice(ORGANIZATION_RE.finditer(text), MAX_LISTED_ENTITIES)
+        ]
 
         # Find potential URLs
-        url_pattern = r"https?://[^\s]+"
-        urls = re.findall(url_pattern, text)
+        urls = [m.group() for m in islice(URL_RE.finditer(text), MAX_LISTED_ENTITIES)]
+
+        return self._entities_from_matches(word_freq, orgs, urls, term_counts)
 
-        # Add entities
-        for word, freq in word_freq.most_common(10):
+    def _entities_from_matches(
+        self,
+        capitalized_counts: Counter,
+        orgs: List[str],
+        urls: List[str],
+        term_counts: Counter,
+    ) -> List[Dict[str, Any]]:
+        """Build entity records from gazetteer terms, capitalized words, orgs and URLs."""
+        entities = []
+        terms = self.gazetteer.terms
+        labels = self.gazetteer.labels
+
+        # Known terms from the gazetteer first; ties keep gazetteer order.
+        # Ambiguous terms only count where they are capitalized as given.
+        known = sorted(
+            (
+                (
+                    term_id,
+                    (
+                        capitalized_counts[terms[term_id]]
+                        if terms[term_id] in CASE_SENSITIVE_ENTITY_TERMS
+                        else freq
+                    ),
+                )
+                for term_id, freq in term_counts.items()
+                if labels[term_id] in self.entity_types
+            ),
+            key=lambda item: (-item[1], item[0]),
+        )
+        known = [(term_id, freq) for term_id, freq in known if freq][:10]
+        for term_id, freq in known:
+            entities.append(
+                {"entity": terms[term_id], "type": labels[term_id], "frequency": freq}
+            )
+
+        # Other capitalized words (potential proper nouns)
+        known_words = {
+            word for term_id, _ in known for word in terms[term_id].lower().split()
+        }
+        proper_nouns = (
+            (word, freq)
+            for word, freq in capitalized_counts.most_common()
+            if word.lower() not in known_words
+        )
+        for word, freq in islice(proper_nouns, 10):
             entities.append({"entity": word, "type": "proper_noun", "frequency": freq})
 
-        for org in orgs[:5]:
+        for org in orgs[:MAX_LISTED_ENTITIES]:
             entities.append({"entity": org, "type": "organization", "frequency": 1})
 
-        for url in urls[:5]:
+        for url in urls[:MAX_LISTED_ENTITIES]:
             entities.append({"entity": url, "type": "url", "frequency": 1})
 
         return entities
 
-    def _extract_keywords(self, text: str, max_keywords: int) -> List[Dict[str, Any]]:
-        """Extract keywords with TF-IDF-like scoring."""
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", text.lower())
+    def _extract_keywords(
+        self, text: str, max_keywords: int, tokens: Optional[TokenizedText] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract keywords ranked by TF-IDF against the corpus index."""
+        if tokens is None:
+            tokens = tokenize_text(text)
+        words = tokens.alpha_words
 
         # Remove stop words
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-        }
-
-        filtered_words = [word for word in words if word not in stop_words]
+        filtered_words = [word for word in words if word not in KEYWORD_STOP_WORDS]
         word_freq = Counter(filtered_words)
 
-        # Calculate simple TF-IDF-like scores
-        total_words = len(filtered_words)
-        keywords = []
-
-        for word, freq in word_freq.most_common(max_keywords):
-            tf = freq / total_words if total_words > 0 else 0
-            # Simple IDF approximation (inverse of frequency)
-            idf = 1 / (freq + 1)  # Add 1 to avoid division by zero
-            tf_idf_score = tf * idf
-
-            keywords.append(
-                {"keyword": word, "frequency": freq, "tf_idf_score": tf_idf_score}
-            )
-
-        return keywords
-
-    def _calculate_readability(self, text: str) -> Dict[str, float]:
-        """Calculate various readability metrics."""
-        sentences = re.split(r"[.!?]+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-
-        words = re.findall(r"\b\w+\b", text.lower())
-        syllables = self._count_syllables(text)
-
-        sentence_count = len(sentences)
-        word_count = len(words)
-        syllable_count = syllables
-
-        if sentence_count == 0 or word_count == 0:
-            return {
-                "flesch_reading_ease": 0,
-                "flesch_kincaid_grade": 0,
-                "gunning_fog_index": 0,
-                "smog_index": 0,
-                "coleman_liau_index": 0,
-                "automated_readability_index": 0,
+        return self._score_keywords(word_freq.items(), max_keywords)
+
+    def _score_keywords(
+        self, word_counts: Iterable[Tuple[str, int]], max_keywords: int
+    ) -> List[Dict[str, Any]]:
+        """Rank candidate keywords, given in first-seen order, by TF-IDF."""
+        word_counts = list(word_counts)
+        total_words = sum(freq for _, freq in word_counts)
+
+        # Score every term; IDF is an O(1) lookup in the corpus index
+        idf = self.df_index.idf
+        scored = [
+            (word, freq, idf(word), freq / total_words) for word, freq in word_counts
+        ]
+
+        # Ties keep first-seen order
+        top = heapq.nlargest(max_keywords, scored, key=lambda item: item[3] * item[2])
+
+        return [
+            {
+                "keyword": word,
+                "frequency": freq,
+                "idf": word_idf,
+                "tf_idf_score": tf * word_idf,
             }
+            for word, freq, word_idf, tf in top
+        ]
 
-        # Flesch Reading Ease
-        flesch_ease = (
-            206.835
-            - (1.015 * (word_count / sentence_count))
-            - (84.6 * (syllable_count / word_count))
-        )
-
-        # Flesch-Kincaid Grade Level
-        flesch_grade = (
-            (0.39 * (word_count / sentence_count))
-            + (11.8 * (syllable_count / word_count))
-            - 15.59
-        )
-
-        # Gunning Fog Index
-        complex_words = len([word for word in words if self._count_syllables(word) > 2])
-        fog_index = 0.4 * (
-            (word_count / sentence_count) + (100 * (complex_words / word_count))
-        )
-
-        # SMOG Index
-        smog_index = 1.043 * ((complex_words * (30 / sentence_count)) ** 0.5) + 3.1291
-
-        # Coleman-Liau Index
-        letters = len(re.findall(r"[a-zA-Z]", text))
-        coleman_liau = (
-            (0.0588 * (letters / word_count * 100))
-            - (0.296 * (sentence_count / word_count * 100))
-            - 15.8
-        )
-
-        # Automated Readability Index
-        ari = (
-            (4.71 * (letters / word_count))
-            + (0.5 * (word_count / sentence_count))
-            - 21.43
-        )
-
-        return {
-            "flesch_reading_ease": max(0, min(100, flesch_ease)),
-            "flesch_kincaid_grade": max(0, flesch_grade),
-            "gunning_fog_index": max(0, fog_index),
-            "smog_index": max(0, smog_index),
-            "coleman_liau_index": max(0, coleman_liau),
-            "automated_readability_index": max(0, ari),
-        }
+    def _calculate_readability(
+        self, text: str, tokens: Optional[TokenizedText] = None
+    ) -> Dict[str, float]:
+        """Calculate various readability metrics."""
+        if tokens is None:
+            tokens = tokenize_text(text)
+        return readability_metrics(readability_counts(tokens))
 
     def _count_syllables(self, text: str) -> int:
         """Count syllables in text (simplified approach)."""
-        text = text.lower()
-        count = 0
-        vowels = "aeiouy"
-        on_vowel = False
-
-        for char in text:
-            is_vowel = char in vowels
-            if is_vowel and not on_vowel:
-                count += 1
-            on_vowel = is_vowel
-
-        # Adjust for common patterns
-        if text.endswith("e"):
-            count -= 1
-        if count == 0:
-            count = 1
-
-        return count
-
-    def _analyze_content_structure(self, text: str) -> Dict[str, Any]:
+        return count_syllables(text)
+
+    def _analyze_content_structure(
+        self, text: str, tokens: Optional[TokenizedText] = None
+    ) -> Dict[str, Any]:
         """Analyze the structure of the content."""
+        if tokens is None:
+            tokens = tokenize_text(text)
+
         # Check for headings
-        has_headings = bool(re.search(r"^#{1,6}\s+", text, re.MULTILINE))
+        has_headings = bool(HEADING_RE.search(text))
 
         # Check for lists
-        has_lists = bool(
-            re.search(r"^[\s]*[-*+]\s+", text, re.MULTILINE)
-            or re.search(r"^[\s]*\d+\.\s+", text, re.MULTILINE)
-        )
+        has_lists = bool(BULLET_LIST_RE.search(text) or NUMBERED_LIST_RE.search(text))
 
         # Check for links
-        has_links = bool(
-            re.search(r"\[([^\]]+)\]\([^)]+\)", text)
-            or re.search(r"https?://[^\s]+", text)
-        )
+        has_links = bool(MARKDOWN_LINK_RE.search(text) or URL_RE.search(text))
 
         # Check for code blocks
         has_code_blocks = bool(
-            re.search(r"```[\s\S]*?```", text) or re.search(r"`[^`]+`", text)
+            FENCED_CODE_RE.search(text) or INLINE_CODE_RE.search(text)
         )
 
         # Calculate average sentence length
-        sentences = re.split(r"[.!?]+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = tokens.sentences
         avg_sentence_length = (
             sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
         )
 
         # Calculate average word length
-        words = re.findall(r"\b\w+\b", text)
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+        words = tokens.cased_words
+        avg_word_length = sum(map(len, words)) / len(words) if words else 0
 
         return {
             "has_headings": has_headings,
@@ -747,3 +1377,56 @@ class ContentAnalysisTool(BaseTool):
                 summary_parts.append(f"Content includes: {', '.join(features)}")
 
         return ". ".join(summary_parts) + "."
+
+    def save_index(self) -> None:
+        """Persist the document frequency index and topic trends that have paths."""
+        if self.df_index.path is not None:
+            self.df_index.save()
+        if self.topic_trends.path is not None:
+            self.topic_trends.save()
+
+    def top_topics(
+        self, n: int = 10, weeks: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Most frequent topics of the documents indexed in recent weeks.
+
+        Args:
+            n: Maximum number of topics to return
+            weeks: Number of weeks, up to the current one, to count
+                (default: the window of the topic trends)
+
+        Returns:
+            Topics with their estimated frequency, most frequent first
+        """
+        return [
+            {"topic": topic, "frequency": frequency}
+            for topic, frequency in self.topic_trends.top(n, weeks)
+        ]
+
+    async def cleanup(self):
+        """Persist the corpus statistics gathered during the run."""
+        self.save_index()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.cleanup()
+
+
+def _analyze_shard(
+    texts: List[str],
+    max_topics: int,
+    extract_entities: bool,
+    gazetteer: Gazetteer,
+    entity_types: frozenset,
+) -> List[Tuple[Dict[str, Any], List[Tuple[str, int]], List[str]]]:
+    """Run ContentAnalysisTool._analyze_batch in a worker process."""
+    tool = ContentAnalysisTool(
+        df_index=DocumentFrequencyIndex(),
+        entity_terms={},
+        topic_trends=TopicTrends(),
+    )
+    tool.gazetteer = gazetteer
+    tool.entity_types = entity_types
+    return tool._analyze_batch(texts, max_topics, extract_entities)
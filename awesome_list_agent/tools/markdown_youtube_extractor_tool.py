@@ -1,15 +1,23 @@
 """Tool for extracting YouTube URLs from markdown content scraped from URLs."""
 
+import asyncio
+import inspect
 import logging
+import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 from firecrawl.firecrawl import FirecrawlApp
-from src.extract_youtube_urls import extract_youtube_urls_from_markdown
+from src.canonicalize_urls import dedupe_youtube_urls
+from src.extract_youtube_urls import (
+    extract_youtube_urls_from_markdown,
+    get_youtube_urls_with_metadata,
+)
 
 from .base import BaseTool
 from ..models import ToolMetadata, ToolError
+from ..utils.markdown_cache import MarkdownCache
 
 
 def firecrawl_markdown(
@@ -65,6 +73,11 @@ class MarkdownYouTubeExtractorToolMetadata(ToolMetadata):
                 "description": "Maximum number of YouTube URLs to extract",
                 "default": 100,
             },
+            "use_cache": {
+                "type": "boolean",
+                "description": "Whether to reuse recently scraped markdown (default: true)",
+                "default": True,
+            },
         },
         "required": ["url"],
     }
@@ -89,6 +102,11 @@ class MarkdownYouTubeExtractorToolMetadata(ToolMetadata):
                 "type": "string",
                 "description": "The original URL that was scraped",
             },
+            "url_metadata": {
+                "type": "array",
+                "items": {"type": "object"},
+                "description": "Link text, context and section of each URL (with include_metadata)",
+            },
         },
     }
 
@@ -98,11 +116,29 @@ class MarkdownYouTubeExtractorTool(BaseTool):
 
     metadata = MarkdownYouTubeExtractorToolMetadata
 
-    def __init__(self):
+    def __init__(
+        self,
+        scraper: Optional[Callable[[str], Union[str, Awaitable[str]]]] = None,
+        cache: Optional[MarkdownCache] = None,
+    ):
+        """Create the tool
+
+        Args:
+            scraper: Callable returning the markdown for a URL, sync or async.
+                Defaults to Firecrawl; tests can pass a local stand-in.
+            cache: Markdown cache to read through (default: MarkdownCache())
+        """
         self.logger = logging.getLogger(
             "awesome_list_agent.MarkdownYouTubeExtractorTool"
         )
-        self.api_key = "fc-95ddf7f5c64f4e1e814f03567183dc16"
+        self.api_key = os.getenv(
+            "FIRECRAWL_API_KEY", "fc-95ddf7f5c64f4e1e814f03567183dc16"
+        )
+        self.scraper = scraper or self._firecrawl_scrape
+        self.cache = cache if cache is not None else MarkdownCache()
+        self._firecrawl_app: Optional[FirecrawlApp] = None
+        # Scrapes in progress, so concurrent calls for one URL share a request
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     def _validate_url(self, url: str) -> bool:
         """Validate that the URL is properly formatted."""
@@ -112,31 +148,81 @@ class MarkdownYouTubeExtractorTool(BaseTool):
         except Exception:
             return False
 
-    def _scrape_markdown_content(self, url: str) -> str:
-        """Scrape markdown content from a URL using Firecrawl."""
-        try:
+    def _firecrawl_scrape(self, url: str) -> str:
+        """Scrape markdown with the synchronous Firecrawl client."""
+        if self._firecrawl_app is None:
+            self._firecrawl_app = FirecrawlApp(api_key=self.api_key)
+        scrape_data = self._firecrawl_app.scrape_url(
+            url,
+            params={
+                "onlyMainContent": True,
+            },
+        )
+        return scrape_data.get("markdown", "")
+
+    async def _fetch_markdown(self, url: str) -> str:
+        """Run the scraper without blocking the event loop."""
+        if inspect.iscoroutinefunction(self.scraper):
+            return await self.scraper(url)
+        return await asyncio.to_thread(self.scraper, url)
+
+    async def _scrape_markdown_content(self, url: str, use_cache: bool = True) -> str:
+        """Scrape markdown content from a URL, reading through the cache."""
+        if use_cache:
+            markdown = self._read_cache(url)
+            if markdown is not None:
+                self.logger.info(
+                    f"Using cached markdown for {url} ({len(markdown)} characters)"
+                )
+                return markdown
+
+        future = self._inflight.get(url)
+        if future is None:
             self.logger.info(f"Scraping markdown content from URL: {url}")
+            future = asyncio.ensure_future(self._scrape_and_cache(url))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
 
-            app = FirecrawlApp(api_key=self.api_key)
-            scrape_data = app.scrape_url(
-                url,
-                params={
-                    "onlyMainContent": True,
-                },
-            )
-
-            markdown = scrape_data.get("markdown", "")
-            self.logger.info(
-                f"Successfully scraped {len(markdown)} characters of markdown content"
-            )
-
-            return markdown
+        # Shielded, so a cancelled caller leaves the scrape to the others
+        return await asyncio.shield(future)
 
+    async def _scrape_and_cache(self, url: str) -> str:
+        """Scrape a URL and store the result, shared by concurrent callers."""
+        try:
+            markdown = await self._fetch_markdown(url)
         except Exception as e:
             error_msg = f"Error scraping markdown from URL {url}: {str(e)}"
             self.logger.error(error_msg)
             raise Exception(error_msg)
 
+        self.logger.info(
+            f"Successfully scraped {len(markdown)} characters of markdown content"
+        )
+        if markdown:
+            try:
+                self.cache.set(url, markdown)
+            except OSError as e:
+                self.logger.warning(f"Could not cache markdown for {url}: {e}")
+        return markdown
+
+    def _read_cache(self, url: str) -> Optional[str]:
+        """Cached markdown for a URL; a cache that cannot be read is a miss."""
+        try:
+            return self.cache.get(url)
+        except OSError as e:
+            self.logger.warning(f"Could not read cached markdown for {url}: {e}")
+            return None
+
+    async def cleanup(self):
+        """Delete stale cache entries and unreferenced blobs."""
+        try:
+            deleted = await asyncio.to_thread(self.cache.prune)
+        except OSError as e:
+            self.logger.warning(f"Could not prune markdown cache: {e}")
+            return
+        if deleted:
+            self.logger.info(f"Pruned {deleted} markdown cache files")
+
     async def execute(
         self,
         url: str,
@@ -144,6 +230,7 @@ class MarkdownYouTubeExtractorTool(BaseTool):
         include_metadata: bool = False,
         max_urls: int = 100,
         timeout: int = 30,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Extract YouTube URLs from markdown content scraped from a URL.
 
@@ -153,6 +240,7 @@ class MarkdownYouTubeExtractorTool(BaseTool):
             include_metadata: Whether to include basic metadata about found videos
             max_urls: Maximum number of YouTube URLs to extract
             timeout: Request timeout in seconds (not used with Firecrawl but kept for compatibility)
+            use_cache: Whether to serve markdown from the cache when fresh
 
         Returns:
             Dictionary containing extracted YouTube URLs and metadata
@@ -165,7 +253,7 @@ class MarkdownYouTubeExtractorTool(BaseTool):
                 return ToolError(error=error_msg)
 
             # Scrape markdown content using Firecrawl
-            markdown_content = self._scrape_markdown_content(url)
+            markdown_content = await self._scrape_markdown_content(url, use_cache)
 
             if not markdown_content:
                 self.logger.warning("No markdown content found")
@@ -176,8 +264,10 @@ class MarkdownYouTubeExtractorTool(BaseTool):
                     "source_url": url,
                 }
 
-            # Extract YouTube URLs from markdown
-            youtube_urls = extract_youtube_urls_from_markdown(markdown_content)
+            # Extract YouTube URLs from markdown, one canonical URL per resource
+            youtube_urls = dedupe_youtube_urls(
+                extract_youtube_urls_from_markdown(markdown_content)
+            )
 
             # Limit the number of URLs if specified
             if max_urls and len(youtube_urls) > max_urls:
@@ -199,6 +289,13 @@ class MarkdownYouTubeExtractorTool(BaseTool):
 
             # Add metadata if requested
             if include_metadata:
+                url_metadata = get_youtube_urls_with_metadata(
+                    markdown_content, unique=True
+                )
+                kept = set(youtube_urls)
+                result["url_metadata"] = [
+                    record for record in url_metadata if record["canonical_url"] in kept
+                ]
                 result["metadata"] = {
                     "markdown_length": len(markdown_content),
                     "extraction_timestamp": time.time(),
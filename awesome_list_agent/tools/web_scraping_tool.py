@@ -10,6 +10,8 @@ from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import json
 
+from src.canonicalize_urls import canonicalize_url
+
 from .base import BaseTool
 from ..models import ToolMetadata, ToolError
 
@@ -91,6 +93,10 @@ class WebScrapingToolMetadata(ToolMetadata):
                         "url": {"type": "string"},
                         "text": {"type": "string"},
                         "title": {"type": "string"},
+                        "section": {
+                            "type": "string",
+                            "description": "Text of the closest heading above the link",
+                        },
                     },
                 },
                 "description": "Extracted links",
@@ -201,6 +207,8 @@ class WebScrapingTool(BaseTool):
                 content = await response.text()
                 content_length = len(content)
                 content_type = response.headers.get("content-type", "unknown")
+                # Resolve relative links against the final URL after redirects
+                page_url = str(response.url)
 
                 self.logger.info(
                     f"Successfully fetched content ({content_length} characters, type: {content_type})"
@@ -233,7 +241,9 @@ class WebScrapingTool(BaseTool):
             # Extract links
             if extract_links:
                 self.logger.debug("Extracting links")
-                result["links"] = self._extract_links(soup, max_links)
+                result["links"] = self._extract_links(
+                    soup, max_links, base_url=page_url
+                )
 
             # Extract images
             if extract_images:
@@ -286,22 +296,42 @@ class WebScrapingTool(BaseTool):
         return text
 
     def _extract_links(
-        self, soup: BeautifulSoup, max_links: int
+        self, soup: BeautifulSoup, max_links: int, base_url: Optional[str] = None
     ) -> List[Dict[str, str]]:
-        """Extract links from the HTML."""
-        links = []
+        """Extract links from the HTML.
 
-        for link in soup.find_all("a", href=True):
+        Relative hrefs are resolved against ``base_url`` and every link is
+        canonicalized, so the same resource linked in different forms is only
+        returned once. Each link also records the section it appears in,
+        the text of the closest heading above it.
+        """
+        links = []
+        seen_urls = set()
+        section = ""
+
+        # Headings and links come back in document order
+        for element in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6", "a"]):
+            if element.name != "a":
+                section = element.get_text().strip()
+                continue
             if len(links) >= max_links:
                 break
 
+            link = element
             href = link.get("href")
-            text = link.get_text().strip()
-            title = link.get("title", "")
 
             # Skip empty links and javascript links
-            if href and not href.startswith("javascript:"):
-                links.append({"url": href, "text": text, "title": title})
+            if not href or href.startswith("javascript:"):
+                continue
+
+            url = canonicalize_url(href, base_url)
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+
+            text = link.get_text().strip()
+            title = link.get("title", "")
+            links.append({"url": url, "text": text, "title": title, "section": section})
 
         return links
 
@@ -3,9 +3,13 @@
 import re
 import asyncio
 import aiohttp
+import io
 import logging
+import os
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
 from urllib.parse import urlparse, parse_qs
 from enum import Enum
 from pydantic import BaseModel, Field
@@ -17,6 +21,16 @@ except ImportError:
 
 from .base import BaseTool
 from ..models import ToolMetadata, ToolError
+from ..utils.deadline import DeadlineExceeded
+from ..utils.http_client import HTTPClient
+from ..utils.transcript_index import TranscriptIndex
+from ..utils.ydl_pool import YoutubeDLPool
+from ..utils.transcript_segments import (
+    TranscriptSegments,
+    choose_caption_format,
+    parse_captions,
+)
+from src.canonicalize_urls import dedupe_youtube_urls, parse_youtube_url
 
 
 class YouTubeData(BaseModel):
@@ -77,6 +91,18 @@ class YouTubeData(BaseModel):
         default_factory=dict, description="Processed subtitle content"
     )
 
+    # Transcript (combined extraction only)
+    transcript: str | None = Field(None, description="Transcript text")
+    transcript_language: str | None = Field(
+        None, description="Language code of the transcript"
+    )
+    transcript_source: str | None = Field(
+        None, description='Transcript source, "manual" or "automatic"'
+    )
+    transcript_segments: dict[str, Any] | None = Field(
+        None, description="TranscriptSegments.to_dict() of the transcript cues"
+    )
+
     # Available formats
     formats: list[dict[str, Any]] = Field(
         default_factory=list, description="Available video/audio formats"
@@ -106,6 +132,94 @@ class YouTubeData(BaseModel):
     url: str | None = Field(None, description="Original URL that was processed")
 
 
+# Every field of YouTubeData, in declaration order
+VIDEO_FIELDS = tuple(YouTubeData.model_fields)
+
+# Fields that depend on the selected audio/video format
+FORMAT_FIELDS = frozenset(
+    {
+        "formats",
+        "format_id",
+        "ext",
+        "width",
+        "height",
+        "fps",
+        "vcodec",
+        "acodec",
+        "filesize",
+        "filesize_approx",
+    }
+)
+
+# Fields the agent and the awesome list parser read from a video
+LISTING_FIELDS = frozenset(
+    {
+        "id",
+        "title",
+        "description",
+        "duration",
+        "upload_date",
+        "uploader",
+        "uploader_id",
+        "channel",
+        "channel_id",
+        "channel_url",
+        "view_count",
+        "like_count",
+        "comment_count",
+        "webpage_url",
+        "original_url",
+        "thumbnail",
+        "categories",
+        "tags",
+        "subtitle_content",
+        "availability",
+        "live_status",
+    }
+)
+
+
+class VideoRecord:
+    """Slotted projection of YouTubeData holding only the requested fields.
+
+    It has the same attributes as YouTubeData, so it can be used wherever
+    one is read, but is a plain object without validation or copying, and
+    fields that were not requested are None instead of the full lists of
+    formats, thumbnails and caption tracks.
+    """
+
+    __slots__ = VIDEO_FIELDS
+
+    def __init__(self, **values: Any):
+        for name in VIDEO_FIELDS:
+            setattr(self, name, values.pop(name, None))
+        if values:
+            raise TypeError(f"Unknown YouTubeData fields: {sorted(values)}")
+
+    def to_dict(self, exclude_none: bool = True) -> dict[str, Any]:
+        """Fields as a dictionary, like YouTubeData.model_dump()."""
+        return {
+            name: getattr(self, name)
+            for name in VIDEO_FIELDS
+            if not exclude_none or getattr(self, name) is not None
+        }
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"VideoRecord({fields})"
+
+
+class PlaylistEntry(NamedTuple):
+    """One video of a playlist or channel, as listed by flat extraction."""
+
+    id: str
+    url: str
+    title: str | None
+    duration: int | None
+    channel: str | None
+    view_count: int | None
+
+
 class YouTubeMetadataToolMetadata(ToolMetadata):
     """Metadata for the YouTube Metadata Tool."""
 
@@ -127,7 +241,12 @@ class YouTubeMetadataToolMetadata(ToolMetadata):
                 "type": "string",
                 "description": "The YouTube video URL to extract metadata from",
                 "pattern": r"^https?://(?:www\.)?(?:youtube\.com|youtu\.be)/.*",
-            }
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only extract these YouTubeData fields",
+            },
         },
         "required": ["url"],
     }
@@ -175,9 +294,18 @@ class YouTubeMetadataToolMetadata(ToolMetadata):
 class YouTubeDownloader:
     """A comprehensive YouTube downloader that extracts all available information in memory."""
 
-    def __init__(self) -> None:
-        """Initialize the YouTube downloader for in-memory processing."""
-        pass
+    def __init__(
+        self, subtitle_timeout: float = 15.0, pool: Optional[YoutubeDLPool] = None
+    ) -> None:
+        """Initialize the YouTube downloader for in-memory processing.
+
+        Args:
+            subtitle_timeout: Timeout in seconds of each caption download
+            pool: YoutubeDL instances to extract with; a new pool if None
+        """
+        self.subtitle_timeout = subtitle_timeout
+        self.pool = pool or YoutubeDLPool(YoutubeDL)
+        self.logger = logging.getLogger("awesome_list_agent.YouTubeDownloader")
 
     def get_all_info(self, url: str) -> YouTubeData:
         """Extract all available information from a YouTube URL in memory.
@@ -195,12 +323,12 @@ class YouTubeDownloader:
             "no_warnings": True,
         }
 
-        with YoutubeDL(ydl_opts) as ydl:
-            try:
+        try:
+            with self.pool.acquire(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
-                return self._process_info(info, url)
-            except Exception as e:
-                return YouTubeData(error=str(e), url=url)
+            return self._process_info(info, url)
+        except Exception as e:
+            return YouTubeData(error=str(e), url=url)
 
     def get_metadata_only(self, url: str) -> YouTubeData:
         """Extract only metadata without downloading any files.
@@ -216,12 +344,12 @@ class YouTubeDownloader:
             "extract_flat": False,
         }
 
-        with YoutubeDL(ydl_opts) as ydl:
-            try:
+        try:
+            with self.pool.acquire(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
-                return self._process_info(info, url)
-            except Exception as e:
-                return YouTubeData(error=str(e), url=url)
+            return self._process_info(info, url)
+        except Exception as e:
+            return YouTubeData(error=str(e), url=url)
 
     def get_subtitles(self, url: str) -> YouTubeData:
         """Extract subtitles/captions from a YouTube video in memory.
@@ -239,19 +367,91 @@ class YouTubeDownloader:
             "no_warnings": True,
         }
 
-        with YoutubeDL(ydl_opts) as ydl:
-            try:
+        try:
+            with self.pool.acquire(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
-                return YouTubeData(
-                    subtitles=info.get("subtitles", {}),
-                    automatic_captions=info.get("automatic_captions", {}),
-                    title=info.get("title"),
-                    id=info.get("id"),
-                    subtitle_content=self._extract_subtitle_content(info),
-                    url=url,
-                )
-            except Exception as e:
-                return YouTubeData(error=str(e), url=url)
+            return YouTubeData(
+                subtitles=info.get("subtitles", {}),
+                automatic_captions=info.get("automatic_captions", {}),
+                title=info.get("title"),
+                id=info.get("id"),
+                subtitle_content=self._extract_subtitle_content(info),
+                url=url,
+            )
+        except Exception as e:
+            return YouTubeData(error=str(e), url=url)
+
+    def get_fields(self, url: str, fields: Iterable[str]) -> VideoRecord:
+        """Extract only the given fields of a YouTube URL.
+
+        Format manifests are not fetched unless a format field is requested,
+        and the result is a lightweight VideoRecord rather than a validated
+        YouTubeData model holding every list yt-dlp returns.
+
+        Args:
+            url: YouTube URL to process
+            fields: Names of YouTubeData fields to extract
+
+        Returns:
+            VideoRecord with the requested fields set; the others are None
+
+        Raises:
+            ValueError: If a field is not a YouTubeData field
+        """
+        fields = self._check_fields(fields)
+        try:
+            info = self._extract_info(url, self._projection_opts(fields))
+        except Exception as e:
+            return VideoRecord(error=str(e), url=url)
+        return self._project_info(info, url, fields)
+
+    @staticmethod
+    def _check_fields(fields: Iterable[str]) -> frozenset[str]:
+        fields = frozenset(fields)
+        unknown = fields.difference(VIDEO_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown YouTubeData fields: {sorted(unknown)}")
+        return fields
+
+    def _projection_opts(self, fields: frozenset[str]) -> dict[str, Any]:
+        """yt-dlp options that skip what ``fields`` does not need."""
+        ydl_opts = self._metadata_opts()
+        if not fields & FORMAT_FIELDS:
+            # DASH and HLS manifests are only needed to list formats
+            ydl_opts["extractor_args"] = {"youtube": {"skip": ["dash", "hls"]}}
+        return ydl_opts
+
+    def _project_info(
+        self, info: dict[str, Any] | None, url: str, fields: frozenset[str]
+    ) -> VideoRecord:
+        """Copy the requested fields out of a yt-dlp info dict.
+
+        Args:
+            info: Raw information dictionary from yt-dlp
+            url: Original URL that was processed
+            fields: Names of YouTubeData fields to copy
+
+        Returns:
+            VideoRecord with the requested fields
+        """
+        if not info:
+            return VideoRecord(error="No information extracted", url=url)
+
+        values: dict[str, Any] = {"url": url}
+        for name in fields:
+            if name == "subtitle_content":
+                values[name] = self._extract_subtitle_content(info)
+            elif name in ("url", "error") or name.startswith("transcript"):
+                continue
+            else:
+                value = info.get(name)
+                if value is None:
+                    # Lists and dicts default to empty, as in YouTubeData
+                    value = YouTubeData.model_fields[name].get_default(
+                        call_default_factory=True
+                    )
+                values[name] = value
+        return VideoRecord(**values)
 
     def _process_info(self, info: dict[str, Any] | None, url: str) -> YouTubeData:
         """Process and organize the extracted information.
@@ -341,6 +541,7 @@ class YouTubeDownloader:
             Dictionary containing transcript text and metadata:
             {
                 "transcript": str | None,  # The extracted transcript text
+                "segments": dict | None,  # TranscriptSegments.to_dict() of the cues
                 "language": str | None,   # Language code used
                 "source": str | None,     # "manual" or "automatic"
                 "title": str | None,      # Video title
@@ -349,7 +550,153 @@ class YouTubeDownloader:
                 "available_languages": list[str] | None  # Available languages if extraction failed
             }
         """
-        ydl_opts = {
+        try:
+            info = self._extract_info(url, self._transcript_opts(language))
+
+            if not info:
+                return {
+                    "error": "Could not extract video information",
+                    "transcript": None,
+                    "language": None,
+                    "source": None,
+                }
+
+            return self._transcript_from_info(info, language)
+
+        except Exception as e:
+            return {
+                "error": f"Error extracting transcript: {str(e)}",
+                "transcript": None,
+                "language": None,
+                "source": None,
+            }
+
+    def get_all_info_with_transcript(
+        self, url: str, language: str = "en"
+    ) -> YouTubeData:
+        """Extract all information and the transcript with a single extraction.
+
+        The info dict of one extract_info call already lists every caption
+        track, so metadata, available tracks and the transcript all come
+        from it instead of extracting the video twice.
+
+        Args:
+            url: YouTube URL to process
+            language: Preferred transcript language code (default: "en")
+
+        Returns:
+            YouTubeData model with all extracted information; the transcript
+            fields are None if no transcript could be fetched
+        """
+        try:
+            info = self._extract_info(url, self._metadata_opts())
+        except Exception as e:
+            return YouTubeData(error=str(e), url=url)
+
+        youtube_data = self._process_info(info, url)
+        if youtube_data.error:
+            return youtube_data
+        return self._with_transcript(
+            youtube_data, self._transcript_from_info(info, language)
+        )
+
+    async def get_transcript_async(
+        self,
+        url: str,
+        language: str = "en",
+        http_client: Optional[HTTPClient] = None,
+    ) -> dict[str, Any]:
+        """Async version of get_transcript().
+
+        Caption tracks are fetched with the shared ``http_client`` rather
+        than blocking a thread per download, so many videos can be
+        processed at once.
+
+        Args:
+            url: YouTube URL to process
+            language: Preferred language code (default: "en")
+            http_client: Client used for caption downloads; a temporary
+                one is created if None
+
+        Returns:
+            Dictionary in the format returned by get_transcript()
+        """
+        try:
+            info = await asyncio.to_thread(
+                self._extract_info, url, self._transcript_opts(language)
+            )
+        except Exception as e:
+            return {
+                "error": f"Error extracting transcript: {str(e)}",
+                "transcript": None,
+                "language": None,
+                "source": None,
+            }
+        if not info:
+            return {
+                "error": "Could not extract video information",
+                "transcript": None,
+                "language": None,
+                "source": None,
+            }
+        return await self._transcript_from_info_async(info, language, http_client)
+
+    async def get_all_info_with_transcript_async(
+        self,
+        url: str,
+        language: str = "en",
+        http_client: Optional[HTTPClient] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> YouTubeData | VideoRecord:
+        """Async version of get_all_info_with_transcript().
+
+        Args:
+            url: YouTube URL to process
+            language: Preferred transcript language code (default: "en")
+            http_client: Client used for caption downloads; a temporary
+                one is created if None
+            fields: Only extract these YouTubeData fields, as get_fields()
+                does; the transcript fields are always filled in
+
+        Returns:
+            YouTubeData model, or VideoRecord if ``fields`` is given, with
+            the extracted information and transcript
+        """
+        if fields is not None:
+            fields = self._check_fields(fields)
+        ydl_opts = (
+            self._metadata_opts() if fields is None else self._projection_opts(fields)
+        )
+        try:
+            info = await asyncio.to_thread(self._extract_info, url, ydl_opts)
+        except Exception as e:
+            if fields is not None:
+                return VideoRecord(error=str(e), url=url)
+            return YouTubeData(error=str(e), url=url)
+
+        if fields is None:
+            youtube_data = self._process_info(info, url)
+        else:
+            youtube_data = self._project_info(info, url, fields)
+        if youtube_data.error:
+            return youtube_data
+        return self._with_transcript(
+            youtube_data,
+            await self._transcript_from_info_async(info, language, http_client),
+        )
+
+    @staticmethod
+    def _metadata_opts() -> dict[str, Any]:
+        return {
+            "skip_download": True,
+            "extract_flat": False,
+            "quiet": True,
+            "no_warnings": True,
+        }
+
+    @staticmethod
+    def _transcript_opts(language: str) -> dict[str, Any]:
+        return {
             "writesubtitles": True,
             "writeautomaticsub": True,
             "subtitleslangs": [language, "en"],  # Fallback to English
@@ -358,81 +705,183 @@ class YouTubeDownloader:
             "no_warnings": True,
         }
 
+    def _extract_info(
+        self, url: str, ydl_opts: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Run one yt-dlp extraction without downloading anything."""
+        with self.pool.acquire(ydl_opts) as ydl:
+            return ydl.extract_info(url, download=False)
+
+    @staticmethod
+    def _with_transcript(
+        youtube_data: YouTubeData | VideoRecord, transcript: dict[str, Any]
+    ) -> YouTubeData | VideoRecord:
+        """``youtube_data`` with the transcript fields filled in.
+
+        A YouTubeData model is copied; a VideoRecord is updated in place.
+        """
+        if not transcript.get("transcript"):
+            return youtube_data
+        update = {
+            "transcript": transcript["transcript"],
+            "transcript_language": transcript["language"],
+            "transcript_source": transcript["source"],
+            "transcript_segments": transcript["segments"],
+        }
+        if isinstance(youtube_data, VideoRecord):
+            for name, value in update.items():
+                setattr(youtube_data, name, value)
+            return youtube_data
+        return youtube_data.model_copy(update=update)
+
+    @staticmethod
+    def _transcript_candidates(
+        info: dict[str, Any], language: str
+    ) -> list[tuple[str, str, dict[str, Any]]]:
+        """(language, source, format) of the transcript tracks, best first.
+
+        Manual subtitles are preferred over automatic captions, and the
+        preferred language over English. Of each track the json3 or srv3
+        format is used when offered.
+        """
+        subtitles = info.get("subtitles") or {}
+        auto_captions = info.get("automatic_captions") or {}
+        return [
+            (lang, source, choose_caption_format(tracks[lang]))
+            for tracks, source in ((subtitles, "manual"), (auto_captions, "automatic"))
+            for lang in dict.fromkeys([language, "en"])
+            if tracks.get(lang)
+        ]
+
+    @staticmethod
+    def _transcript_result(
+        info: dict[str, Any], language: str, source: str, segments: TranscriptSegments
+    ) -> dict[str, Any]:
+        return {
+            "transcript": segments.text,
+            "segments": segments.to_dict(),
+            "language": language,
+            "source": source,
+            "title": info.get("title"),
+            "duration": info.get("duration"),
+            "error": None,
+        }
+
+    @staticmethod
+    def _no_transcript(info: dict[str, Any], language: str) -> dict[str, Any]:
+        available_langs = list((info.get("subtitles") or {}).keys()) + list(
+            (info.get("automatic_captions") or {}).keys()
+        )
+        return {
+            "error": f"No transcript available for language '{language}' or 'en'. Available languages: {available_langs}",
+            "transcript": None,
+            "language": None,
+            "source": None,
+            "available_languages": available_langs,
+        }
+
+    def _transcript_from_info(
+        self, info: dict[str, Any], language: str
+    ) -> dict[str, Any]:
+        """Choose and download the transcript of already extracted video info.
+
+        The candidate tracks are downloaded concurrently and the most
+        preferred one with text is returned.
+
+        Args:
+            info: Raw information dictionary from yt-dlp
+            language: Preferred language code
+
+        Returns:
+            Transcript dictionary in the format returned by get_transcript()
+        """
+        candidates = self._transcript_candidates(info, language)
+        if candidates:
+            executor = ThreadPoolExecutor(max_workers=len(candidates))
+            try:
+                futures = [
+                    executor.submit(self._download_subtitle_segments, track)
+                    for _, _, track in candidates
+                ]
+                for (lang, source, _), future in zip(candidates, futures):
+                    segments = future.result()
+                    if segments and segments.text:
+                        return self._transcript_result(info, lang, source, segments)
+            finally:
+                # Less preferred tracks still downloading are not waited for
+                executor.shutdown(wait=False, cancel_futures=True)
+        return self._no_transcript(info, language)
+
+    async def _transcript_from_info_async(
+        self,
+        info: dict[str, Any],
+        language: str,
+        http_client: Optional[HTTPClient] = None,
+    ) -> dict[str, Any]:
+        """Race the candidate tracks and keep the most preferred one with text.
+
+        All candidates are requested at once. They are awaited in order of
+        preference, so a fallback track that arrives first is only used if
+        every better track fails; requests still in flight once a winner is
+        known are cancelled.
+
+        Args:
+            info: Raw information dictionary from yt-dlp
+            language: Preferred language code
+            http_client: Client used for the downloads; a temporary one is
+                created if None
+
+        Returns:
+            Transcript dictionary in the format returned by get_transcript()
+        """
+        candidates = self._transcript_candidates(info, language)
+        if not candidates:
+            return self._no_transcript(info, language)
+        if http_client is None:
+            async with HTTPClient() as client:
+                return await self._transcript_from_info_async(info, language, client)
+
+        tasks = [
+            asyncio.create_task(self._fetch_subtitle_segments(track, http_client))
+            for _, _, track in candidates
+        ]
         try:
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            for (lang, source, _), task in zip(candidates, tasks):
+                segments = await task
+                if segments and segments.text:
+                    return self._transcript_result(info, lang, source, segments)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self._no_transcript(info, language)
+
+    async def _fetch_subtitle_segments(
+        self, subtitle_info: dict[str, Any], http_client: HTTPClient
+    ) -> TranscriptSegments | None:
+        """Async version of _download_subtitle_segments().
 
-                if not info:
-                    return {
-                        "error": "Could not extract video information",
-                        "transcript": None,
-                        "language": None,
-                        "source": None,
-                    }
-
-                transcript_text = None
-                used_language = None
-                source_type = None
-
-                # Try to get manual subtitles first
-                subtitles = info.get("subtitles", {})
-                if language in subtitles and subtitles[language]:
-                    transcript_text = self._download_subtitle_content(
-                        subtitles[language][0]
-                    )
-                    used_language = language
-                    source_type = "manual"
-                elif "en" in subtitles and subtitles["en"]:
-                    transcript_text = self._download_subtitle_content(
-                        subtitles["en"][0]
-                    )
-                    used_language = "en"
-                    source_type = "manual"
-
-                # Fallback to automatic captions if no manual subtitles
-                if not transcript_text:
-                    auto_captions = info.get("automatic_captions", {})
-                    if language in auto_captions and auto_captions[language]:
-                        transcript_text = self._download_subtitle_content(
-                            auto_captions[language][0]
-                        )
-                        used_language = language
-                        source_type = "automatic"
-                    elif "en" in auto_captions and auto_captions["en"]:
-                        transcript_text = self._download_subtitle_content(
-                            auto_captions["en"][0]
-                        )
-                        used_language = "en"
-                        source_type = "automatic"
-
-                if transcript_text:
-                    return {
-                        "transcript": transcript_text,
-                        "language": used_language,
-                        "source": source_type,
-                        "title": info.get("title"),
-                        "duration": info.get("duration"),
-                        "error": None,
-                    }
-                else:
-                    available_langs = list(subtitles.keys()) + list(
-                        auto_captions.keys()
-                    )
-                    return {
-                        "error": f"No transcript available for language '{language}' or 'en'. Available languages: {available_langs}",
-                        "transcript": None,
-                        "language": None,
-                        "source": None,
-                        "available_languages": available_langs,
-                    }
+        Args:
+            subtitle_info: Subtitle information dictionary containing URL
+            http_client: Client used for the download
 
+        Returns:
+            Segments of the track, or None if it could not be downloaded
+        """
+        url = subtitle_info.get("url")
+        if not url:
+            return None
+        try:
+            content = await http_client.get_text(
+                url, timeout=self.subtitle_timeout, encoding="utf-8"
+            )
+            return parse_captions(content, subtitle_info.get("ext", ""))
+        except (aiohttp.ClientError, asyncio.TimeoutError, DeadlineExceeded) as e:
+            self.logger.warning(f"Error downloading subtitle content: {e}")
+            return None
         except Exception as e:
-            return {
-                "error": f"Error extracting transcript: {str(e)}",
-                "transcript": None,
-                "language": None,
-                "source": None,
-            }
+            self.logger.warning(f"Error parsing subtitle content: {e}")
+            return None
 
     def _download_subtitle_content(self, subtitle_info: dict[str, Any]) -> str | None:
         """Download and extract text content from subtitle URL.
@@ -443,72 +892,33 @@ class YouTubeDownloader:
         Returns:
             Extracted text content or None if failed
         """
+        segments = self._download_subtitle_segments(subtitle_info)
+        return segments.text if segments is not None else None
+
+    def _download_subtitle_segments(
+        self, subtitle_info: dict[str, Any]
+    ) -> TranscriptSegments | None:
+        """Download a subtitle track and parse it into timestamped segments.
+
+        Args:
+            subtitle_info: Subtitle information dictionary containing URL
+
+        Returns:
+            Segments of the track, or None if it could not be downloaded
+        """
         try:
             import urllib.request
-            import re
 
             url = subtitle_info.get("url")
             if not url:
                 return None
 
-            # Download subtitle content
-            with urllib.request.urlopen(url) as response:
-                content = response.read().decode("utf-8")
-
-            # Extract text from different subtitle formats
-            if subtitle_info.get("ext") == "vtt":
-                # WebVTT format
-                lines = content.split("\n")
-                text_lines = []
-                for line in lines:
-                    line = line.strip()
-                    # Skip WebVTT headers, timestamps, and empty lines
-                    if (
-                        line
-                        and not line.startswith("WEBVTT")
-                        and not line.startswith("NOTE")
-                        and not "-->" in line
-                        and not re.match(r"^\d+$", line)
-                    ):
-                        # Remove HTML tags
-                        clean_line = re.sub(r"<[^>]+>", "", line)
-                        if clean_line:
-                            text_lines.append(clean_line)
-                return " ".join(text_lines)
-
-            elif subtitle_info.get("ext") == "srv3" or "srv" in subtitle_info.get(
-                "ext", ""
-            ):
-                # YouTube's srv3 format (XML-based)
-                import xml.etree.ElementTree as ET
-
-                try:
-                    root = ET.fromstring(content)
-                    text_parts = []
-                    for text_elem in root.findall(".//text"):
-                        if text_elem.text:
-                            text_parts.append(text_elem.text.strip())
-                    return " ".join(text_parts)
-                except ET.ParseError:
-                    # Fallback: extract text using regex
-                    text_matches = re.findall(r"<text[^>]*>([^<]+)</text>", content)
-                    return " ".join(text_matches)
-
-            else:
-                # Generic text extraction (remove common subtitle formatting)
-                clean_content = re.sub(r"<[^>]+>", "", content)  # Remove HTML tags
-                clean_content = re.sub(
-                    r"\d{2}:\d{2}:\d{2}[.,]\d{3}\s*-->\s*\d{2}:\d{2}:\d{2}[.,]\d{3}",
-                    "",
-                    clean_content,
-                )  # Remove SRT timestamps
-                clean_content = re.sub(
-                    r"^\d+$", "", clean_content, flags=re.MULTILINE
-                )  # Remove SRT sequence numbers
-                lines = [
-                    line.strip() for line in clean_content.split("\n") if line.strip()
-                ]
-                return " ".join(lines)
+            # Download subtitle content, parsing cues as the body streams in
+            with urllib.request.urlopen(url, timeout=self.subtitle_timeout) as response:
+                return parse_captions(
+                    io.TextIOWrapper(response, encoding="utf-8"),
+                    subtitle_info.get("ext", ""),
+                )
 
         except Exception as e:
             print(f"Error downloading subtitle content: {e}")
@@ -544,6 +954,69 @@ class YouTubeDownloader:
 
         return subtitle_content
 
+    def iter_entries(
+        self, url: str, limit: int | None = None
+    ) -> Iterator[PlaylistEntry]:
+        """List the videos of a playlist or channel without extracting them.
+
+        Entries come from flat extraction, so listing costs one request per
+        page of the playlist rather than a full extraction per video, and
+        pages are only requested as entries are consumed. A channel URL
+        lists its uploads.
+
+        Args:
+            url: YouTube playlist or channel URL
+            limit: Stop after this many videos; all of them if None
+
+        Yields:
+            One PlaylistEntry per video, in playlist order
+        """
+        ref = parse_youtube_url(url)
+        if ref is not None and ref.kind == "channel":
+            # Without a tab yt-dlp lists every tab as a separate playlist
+            url = f"{ref.canonical_url}/videos"
+
+        ydl_opts = {
+            "skip_download": True,
+            "extract_flat": "in_playlist",
+            "quiet": True,
+            "no_warnings": True,
+        }
+        with self.pool.acquire(ydl_opts) as ydl:
+            # process=False leaves the entries as a lazily paged generator
+            info = ydl.extract_info(url, download=False, process=False)
+            yield from islice(self._flat_entries(ydl, info, set()), limit)
+
+    def _flat_entries(
+        self, ydl: Any, info: dict[str, Any] | None, seen: set[str]
+    ) -> Iterator[PlaylistEntry]:
+        """Video entries of an unprocessed playlist, descending into tabs."""
+        for entry in (info or {}).get("entries") or ():
+            if not entry:
+                continue
+            if entry.get("_type") == "playlist" or entry.get("ie_key") == "YoutubeTab":
+                nested = entry
+                if "entries" not in entry:
+                    nested = ydl.extract_info(
+                        entry["url"], download=False, process=False
+                    )
+                yield from self._flat_entries(ydl, nested, seen)
+                continue
+
+            video_id = entry.get("id")
+            if not video_id or video_id in seen:
+                continue
+            seen.add(video_id)
+            duration = entry.get("duration")
+            yield PlaylistEntry(
+                id=video_id,
+                url=f"https://www.youtube.com/watch?v={video_id}",
+                title=entry.get("title"),
+                duration=int(duration) if duration is not None else None,
+                channel=entry.get("channel") or entry.get("uploader"),
+                view_count=entry.get("view_count"),
+            )
+
     def to_json_string(self, youtube_data: YouTubeData) -> str:
         """Convert YouTubeData model to JSON string.
 
@@ -580,6 +1053,7 @@ def get_youtube_transcript(url: str, language: str = "en") -> dict[str, Any]:
         Dictionary containing transcript text and metadata:
         {
             "transcript": str | None,  # The extracted transcript text
+            "segments": dict | None,  # TranscriptSegments.to_dict() of the cues
             "language": str | None,   # Language code used
             "source": str | None,     # "manual" or "automatic"
             "title": str | None,      # Video title
@@ -596,6 +1070,7 @@ class YoutubeDataType(Enum):
     default = "metadata"
     transcript = "transcript"
     metadata = "metadata"
+    metadata_and_transcript = "metadata_and_transcript"
 
 
 class YouTubeMetadataTool(BaseTool):
@@ -603,20 +1078,42 @@ class YouTubeMetadataTool(BaseTool):
 
     metadata = YouTubeMetadataToolMetadata
 
-    def __init__(self):
+    def __init__(
+        self,
+        transcript_index: Optional[TranscriptIndex] = None,
+        http_client: Optional[HTTPClient] = None,
+    ):
+        """Create the tool
+
+        Args:
+            transcript_index: Index that every extracted transcript is added
+                to. Defaults to the index at $YOUTUBE_TRANSCRIPT_INDEX_PATH if
+                set, else transcripts are not indexed.
+            http_client: Client shared by all caption downloads of the tool
+        """
         self.downloader = YouTubeDownloader()
+        self.http_client = http_client or HTTPClient()
         self.logger = logging.getLogger("awesome_list_agent.YouTubeMetadataTool")
 
+        if transcript_index is None:
+            index_path = os.getenv("YOUTUBE_TRANSCRIPT_INDEX_PATH")
+            transcript_index = TranscriptIndex(index_path) if index_path else None
+        self.transcript_index = transcript_index
+
     async def execute(
         self,
         url: str,
         transcript_or_metadata: YoutubeDataType = YoutubeDataType.default,
+        fields: Optional[Iterable[str]] = None,
     ) -> Dict[str, Any]:
         """Extract metadata from a YouTube video URL.
 
         Args:
             url: The YouTube video URL to extract metadata from
-            transcript_or_metadata: Type of data to extract (default, transcript, or metadata)
+            transcript_or_metadata: Type of data to extract (default, transcript,
+                metadata, or metadata_and_transcript)
+            fields: Only extract these YouTubeData fields (e.g. LISTING_FIELDS);
+                all of them if None. Ignored for transcripts.
 
         Returns:
             Dictionary containing comprehensive video metadata or transcript data
@@ -631,21 +1128,45 @@ class YouTubeMetadataTool(BaseTool):
 
             # Use YouTubeDownloader to extract information based on data type
             match transcript_or_metadata:
+                case YoutubeDataType.default | YoutubeDataType.metadata if (
+                    fields is not None
+                ):
+                    self.logger.info(
+                        "Fetching selected video fields using YouTubeDownloader"
+                    )
+                    youtube_data = await asyncio.to_thread(
+                        self.downloader.get_fields, url, fields
+                    )
                 case YoutubeDataType.default:
                     self.logger.info(
                         "Fetching all video information using YouTubeDownloader"
                     )
-                    youtube_data = self.downloader.get_all_info(url)
+                    youtube_data = await asyncio.to_thread(
+                        self.downloader.get_all_info, url
+                    )
                 case YoutubeDataType.transcript:
                     self.logger.info(
                         "Fetching video transcript using YouTubeDownloader"
                     )
-                    youtube_data = self.downloader.get_transcript(url)
+                    youtube_data = await self.downloader.get_transcript_async(
+                        url, http_client=self.http_client
+                    )
                 case YoutubeDataType.metadata:
                     self.logger.info(
                         "Fetching video metadata only using YouTubeDownloader"
                     )
-                    youtube_data = self.downloader.get_metadata_only(url)
+                    youtube_data = await asyncio.to_thread(
+                        self.downloader.get_metadata_only, url
+                    )
+                case YoutubeDataType.metadata_and_transcript:
+                    self.logger.info(
+                        "Fetching video information and transcript using YouTubeDownloader"
+                    )
+                    youtube_data = (
+                        await self.downloader.get_all_info_with_transcript_async(
+                            url, http_client=self.http_client, fields=fields
+                        )
+                    )
 
             # Handle transcript response (which returns a dict instead of YouTubeData)
             if transcript_or_metadata == YoutubeDataType.transcript:
@@ -656,6 +1177,11 @@ class YouTubeMetadataTool(BaseTool):
                     # Add timing information
                     youtube_data["extraction_time_ms"] = duration_ns / 1_000_000
 
+                    if self.transcript_index is not None and youtube_data.get(
+                        "segments"
+                    ):
+                        self._index_transcript(url, youtube_data)
+
                     # Log successful extraction
                     self.logger.info(f"Successfully extracted transcript for video")
                     self.logger.debug(
@@ -677,6 +1203,16 @@ class YouTubeMetadataTool(BaseTool):
             # Convert YouTubeData to dictionary format expected by the tool
             metadata = self._convert_youtube_data_to_metadata(youtube_data)
 
+            if self.transcript_index is not None and youtube_data.transcript_segments:
+                self._index_transcript(
+                    url,
+                    {
+                        "segments": youtube_data.transcript_segments,
+                        "title": youtube_data.title,
+                        "language": youtube_data.transcript_language,
+                    },
+                )
+
             # Calculate duration
             duration_ns = time.perf_counter_ns() - start_time
 
@@ -698,6 +1234,100 @@ class YouTubeMetadataTool(BaseTool):
             self.logger.error(error_msg, exc_info=True)
             return ToolError(error=error_msg)
 
+    async def execute_many(
+        self,
+        urls: Iterable[str],
+        transcript_or_metadata: YoutubeDataType = YoutubeDataType.default,
+        fields: Optional[Iterable[str]] = None,
+        concurrency: int = 4,
+    ) -> Dict[str, Dict[str, Any] | ToolError]:
+        """Run execute() for many URLs concurrently.
+
+        Args:
+            urls: YouTube video URLs; repeated URLs are extracted once
+            transcript_or_metadata: Type of data to extract for every URL
+            fields: Only extract these YouTubeData fields, as in execute()
+            concurrency: Maximum number of extractions in flight
+
+        Returns:
+            execute() result of each URL, in the order of ``urls``
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(url: str) -> tuple:
+            async with semaphore:
+                return url, await self.execute(url, transcript_or_metadata, fields)
+
+        return dict(await asyncio.gather(*(run(url) for url in dict.fromkeys(urls))))
+
+    async def list_entries(
+        self, url: str, limit: Optional[int] = None
+    ) -> List[PlaylistEntry] | ToolError:
+        """List the videos of a playlist or channel with flat extraction.
+
+        Args:
+            url: YouTube playlist or channel URL
+            limit: Maximum number of videos to list
+
+        Returns:
+            The listed entries, or ToolError if the listing failed
+        """
+        start_time = time.perf_counter_ns()
+        try:
+            entries = await asyncio.to_thread(
+                lambda: list(self.downloader.iter_entries(url, limit))
+            )
+        except Exception as e:
+            error_msg = f"Failed to list YouTube entries of {url}: {str(e)}"
+            self.logger.error(error_msg)
+            return ToolError(error=error_msg)
+
+        duration_ns = time.perf_counter_ns() - start_time
+        self.logger.info(
+            f"Listed {len(entries)} videos of {url} in {duration_ns / 1_000_000:.2f}ms"
+        )
+        return entries
+
+    async def expand_collections(self, urls: Iterable[str], limit: int) -> List[str]:
+        """Replace playlist and channel URLs by the URLs of their videos.
+
+        Collections are listed with list_entries(), and only as far as needed
+        to reach ``limit`` videos in total; video URLs are kept as they are.
+
+        Args:
+            urls: Canonical YouTube URLs
+            limit: Number of videos the caller will process
+
+        Returns:
+            Deduplicated video URLs, in the order found
+        """
+        video_urls = []
+        for url in urls:
+            ref = parse_youtube_url(url)
+            if ref is None or ref.kind == "video":
+                video_urls.append(url)
+                continue
+            remaining = limit - len(video_urls)
+            if remaining <= 0:
+                continue
+            entries = await self.list_entries(url, limit=remaining)
+            if isinstance(entries, list):
+                video_urls.extend(entry.url for entry in entries)
+        return dedupe_youtube_urls(video_urls)
+
+    def _index_transcript(self, url: str, transcript: Dict[str, Any]) -> None:
+        """Add an extracted transcript to the transcript index."""
+        ref = parse_youtube_url(url)
+        try:
+            self.transcript_index.add(
+                ref.canonical_url if ref else url,
+                TranscriptSegments.from_dict(transcript["segments"]),
+                title=transcript.get("title"),
+                language=transcript.get("language"),
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to index transcript for {url}: {e}")
+
     def _convert_youtube_data_to_metadata(self, youtube_data) -> Dict[str, Any]:
         """Convert YouTubeData model to the expected metadata format.
 
@@ -743,6 +1373,10 @@ class YouTubeMetadataTool(BaseTool):
             "playlist_title": youtube_data.playlist_title,
             "playlist_index": youtube_data.playlist_index,
             "playlist_count": youtube_data.playlist_count,
+            "transcript": youtube_data.transcript,
+            "transcript_language": youtube_data.transcript_language,
+            "transcript_source": youtube_data.transcript_source,
+            "transcript_segments": youtube_data.transcript_segments,
         }
 
         # Create a summary of the metadata
@@ -776,5 +1410,9 @@ class YouTubeMetadataTool(BaseTool):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        # No session cleanup needed since we're using YouTubeDownloader
-        pass
+        await self.cleanup()
+
+    async def cleanup(self):
+        """Clean up resources."""
+        await self.http_client.close()
+        self.downloader.pool.close()
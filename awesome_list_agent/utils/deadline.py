@@ -0,0 +1,73 @@
+"""Overall time budget of a request, shared with every stage through context"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# time.monotonic() value the current request must finish by, if any. Tasks
+# and to_thread() calls copy the context, so stages see it without plumbing.
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage cannot finish before the current deadline."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Give the enclosed code at most ``seconds``; None adds no limit
+
+    A nested deadline never extends the one around it.
+
+    Yields:
+        The deadline in effect, as a time.monotonic() value or None
+    """
+    current = _deadline.get()
+    if seconds is not None:
+        requested = time.monotonic() + seconds
+        current = requested if current is None else min(current, requested)
+    token = _deadline.set(current)
+    try:
+        yield current
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """The deadline in effect as a time.monotonic() value, or None"""
+    return _deadline.get()
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the deadline, never negative; None without a deadline"""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(current - time.monotonic(), 0.0)
+
+
+def deadline_expired() -> bool:
+    """Whether a deadline is in effect and has passed"""
+    return time_left() == 0.0
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable``, cancelling it if the deadline passes first
+
+    Raises:
+        DeadlineExceeded: If the deadline passed before it finished
+    """
+    remaining = time_left()
+    if remaining is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError as e:
+        if not deadline_expired():
+            # The awaitable's own timeout, not the deadline
+            raise
+        raise DeadlineExceeded("Deadline exceeded") from e
@@ -0,0 +1,309 @@
+"""Priority-ordered, deadline-aware scheduling of YouTube video enrichment"""
+
+import asyncio
+import math
+import re
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from src.canonicalize_urls import parse_youtube_url
+
+from .deadline import current_deadline
+
+# Section heading words and how much they say about the videos listed below
+SECTION_WEIGHTS = {
+    "talk": 2.0,
+    "talks": 2.0,
+    "video": 2.0,
+    "videos": 2.0,
+    "keynote": 2.0,
+    "keynotes": 2.0,
+    "conference": 1.5,
+    "conferences": 1.5,
+    "lecture": 1.5,
+    "lectures": 1.5,
+    "course": 1.5,
+    "courses": 1.5,
+    "tutorial": 1.5,
+    "tutorials": 1.5,
+    "screencast": 1.5,
+    "screencasts": 1.5,
+    "presentation": 1.5,
+    "presentations": 1.5,
+    "webinar": 1.0,
+    "webinars": 1.0,
+    "podcast": 0.5,
+    "podcasts": 0.5,
+    "other": -1.0,
+    "misc": -1.0,
+    "miscellaneous": -1.0,
+    "related": -1.0,
+    "archive": -1.5,
+    "deprecated": -1.5,
+    "contributing": -2.0,
+    "license": -2.0,
+    "sponsors": -2.0,
+}
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+LINK_TEXT_WORD_PATTERN = re.compile(r"\w+")
+
+
+class Candidate(NamedTuple):
+    """A YouTube URL of a list with the cheap signals it was ranked by"""
+
+    url: str
+    score: float
+    section: Optional[str]
+    link_text: Optional[str]
+    mentions: int
+    other_lists: int
+    views: Optional[int]
+
+
+class EnrichmentRun(NamedTuple):
+    """Outcome of EnrichmentScheduler.run()"""
+
+    results: Dict[str, Any]
+    skipped: List[str]
+    failed: Dict[str, Exception]
+
+
+def section_weight(section: Optional[str]) -> float:
+    """Best positive plus worst negative weight of the words of a heading"""
+    if not section:
+        return 0.0
+    weights = [
+        SECTION_WEIGHTS[word]
+        for word in WORD_PATTERN.findall(section.lower())
+        if word in SECTION_WEIGHTS
+    ]
+    return max([0.0, *weights]) + min([0.0, *weights])
+
+
+def link_text_weight(link_text: Optional[str]) -> float:
+    """1 for descriptive link text, 0 for none or a bare URL"""
+    if not link_text or "://" in link_text or "youtu" in link_text.lower():
+        return 0.0
+    return 1.0 if len(link_text.split()) >= 3 else 0.5
+
+
+def collapse_same_link_text(
+    candidates: Iterable[Candidate],
+) -> Tuple[List[Candidate], Dict[str, List[str]]]:
+    """Drop candidates whose descriptive link text repeats an earlier one's
+
+    Lists often link a talk and its mirrors or re-uploads under the same
+    text; keeping only the first, best ranked one avoids fetching the others.
+    Link texts of fewer than three words ("video", "watch here") are too
+    generic to compare and never collapse.
+
+    Returns:
+        The candidates that were kept, in order, and the URL of each kept
+        candidate that had duplicates mapped to the URLs of its duplicates
+    """
+    kept = []
+    first_by_text: Dict[Tuple[str, ...], str] = {}
+    duplicates: Dict[str, List[str]] = {}
+    for candidate in candidates:
+        words = ()
+        if link_text_weight(candidate.link_text) == 1.0:
+            words = tuple(LINK_TEXT_WORD_PATTERN.findall(candidate.link_text.lower()))
+        if words in first_by_text:
+            duplicates.setdefault(first_by_text[words], []).append(candidate.url)
+            continue
+        if words:
+            first_by_text[words] = candidate.url
+        kept.append(candidate)
+    return kept, duplicates
+
+
+def only_videos(urls: Iterable[str]) -> List[str]:
+    """The URLs that are single videos, leaving out playlists and channels"""
+    videos = []
+    for url in urls:
+        ref = parse_youtube_url(url)
+        if ref is not None and ref.kind == "video":
+            videos.append(url)
+    return videos
+
+
+class EnrichmentScheduler:
+    """Decides which YouTube videos of a list to fetch, and in what order.
+
+    Candidates are scored before anything is fetched, from the section and
+    link text they appear with, how often the list mentions them, how many
+    other processed lists link them and, when known from earlier runs, how
+    popular they are. run() then fetches them best first, with a bounded
+    number in flight, and stops starting fetches once the remaining time
+    before the deadline is shorter than a typical fetch; fetches still
+    running at the deadline are cancelled. A fetch that raises fails only
+    its own URL.
+    """
+
+    def __init__(
+        self,
+        popularity: Optional[Callable[[], Mapping[str, int]]] = None,
+        concurrency: int = 4,
+    ):
+        """Create a scheduler
+
+        Args:
+            popularity: Returns known view counts by video ID, e.g.
+                VideoStore.view_counts
+            concurrency: Fetches in flight at once
+        """
+        self.popularity = popularity
+        self.concurrency = concurrency
+        # Lists each video was seen in, for the cross-list duplicate signal
+        self._lists_by_video: Dict[str, Set[str]] = {}
+        # Moving average of fetch durations, unknown until a fetch finishes
+        self.fetch_seconds: Optional[float] = None
+
+    def rank(
+        self, mentions: Iterable[Mapping[str, Any]], list_url: str = ""
+    ) -> List[Candidate]:
+        """Score the YouTube URLs mentioned by a list, best first
+
+        Args:
+            mentions: One dict per occurrence, with ``url`` and optionally
+                ``section`` and ``link_text`` (or ``text``)
+            list_url: URL of the list the mentions come from
+
+        Returns:
+            One candidate per canonical URL; ties keep the list's order
+        """
+        signals: Dict[str, Dict[str, Any]] = {}
+        for mention in mentions:
+            ref = parse_youtube_url(mention.get("url") or "")
+            if ref is None:
+                continue
+            signal = signals.setdefault(
+                ref.canonical_url,
+                {"id": ref.id, "mentions": 0, "section": None, "link_text": None},
+            )
+            signal["mentions"] += 1
+            signal["section"] = signal["section"] or mention.get("section")
+            signal["link_text"] = signal["link_text"] or (
+                mention.get("link_text") or mention.get("text")
+            )
+
+        views_by_id = self.popularity() if self.popularity is not None else {}
+        candidates = []
+        for url, signal in signals.items():
+            lists = self._lists_by_video.setdefault(signal["id"], set())
+            lists.add(list_url)
+            other_lists = len(lists) - 1
+            views = views_by_id.get(signal["id"])
+            score = (
+                section_weight(signal["section"])
+                + link_text_weight(signal["link_text"])
+                + math.log2(signal["mentions"])
+                + math.log2(1 + other_lists)
+                + (math.log10(1 + views) / 2 if views else 0.0)
+            )
+            candidates.append(
+                Candidate(
+                    url,
+                    score,
+                    signal["section"],
+                    signal["link_text"],
+                    signal["mentions"],
+                    other_lists,
+                    views,
+                )
+            )
+        # sorted() is stable, so equal scores keep document order
+        return sorted(candidates, key=lambda candidate: -candidate.score)
+
+    def _record(self, seconds: float) -> None:
+        if self.fetch_seconds is None:
+            self.fetch_seconds = seconds
+        else:
+            self.fetch_seconds += 0.3 * (seconds - self.fetch_seconds)
+
+    async def run(
+        self,
+        urls: Iterable[str],
+        fetch: Callable[[str], Awaitable[Any]],
+        limit: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> EnrichmentRun:
+        """Fetch URLs in the given priority order until done or out of time
+
+        Args:
+            urls: URLs, best first, e.g. from rank()
+            fetch: Fetches one URL
+            limit: Maximum number of URLs to fetch
+            deadline: time.monotonic() value by which every fetch must end;
+                defaults to the deadline of the current context, if any
+
+        Returns:
+            Results by URL in priority order, the URLs that were not fetched
+            or were cancelled at the deadline, in priority order, and the
+            exception of each URL whose fetch raised, timeouts of the fetch
+            itself included
+        """
+        if deadline is None:
+            deadline = current_deadline()
+        queue = list(dict.fromkeys(urls))
+        if limit is not None:
+            queue, over_limit = queue[:limit], queue[limit:]
+        else:
+            over_limit = []
+        pending = iter(queue)
+        results: Dict[str, Any] = {}
+        failed: Dict[str, Exception] = {}
+
+        def time_left() -> Optional[float]:
+            return None if deadline is None else deadline - time.monotonic()
+
+        async def worker() -> None:
+            for url in pending:
+                remaining = time_left()
+                if remaining is not None and remaining <= (self.fetch_seconds or 0):
+                    return
+                start = time.monotonic()
+                task = asyncio.ensure_future(fetch(url))
+                try:
+                    # Preempt the fetch if it runs past the deadline; unlike
+                    # wait_for(), this tells the deadline apart from a
+                    # TimeoutError raised by the fetch itself
+                    done, _ = await asyncio.wait({task}, timeout=remaining)
+                finally:
+                    if not task.done():
+                        task.cancel()
+                if not done:
+                    return
+                try:
+                    results[url] = task.result()
+                except Exception as e:
+                    failed[url] = e
+                    continue
+                self._record(time.monotonic() - start)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # Only reached early if run() itself is cancelled
+            for task in workers:
+                task.cancel()
+        return EnrichmentRun(
+            {url: results[url] for url in queue if url in results},
+            [url for url in queue if url not in results and url not in failed]
+            + over_limit,
+            {url: failed[url] for url in queue if url in failed},
+        )
@@ -0,0 +1,222 @@
+"""Aho-Corasick matching of labeled terms over word tokens"""
+
+import json
+import re
+from collections import Counter, deque
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# Same tokenization as TokenizedText.words, so terms match analyzed tokens
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+class GazetteerMatch(NamedTuple):
+    """One occurrence of a term in a text"""
+
+    term: str
+    label: str
+    start: int
+    end: int
+
+
+class Gazetteer:
+    """Labeled terms matched case-insensitively on whole words.
+
+    Every term is split into lowercased ``\\w+`` tokens. Single-token terms are
+    dictionary lookups, so they can be counted from a document's word counts
+    without rescanning it. Multi-token terms ("machine learning", "Guido van
+    Rossum") go into an Aho-Corasick automaton over tokens, which reports
+    every occurrence of every term, overlapping ones included, in one pass.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]] = ()):
+        """Build the automaton
+
+        Args:
+            entries: ``(term, label)`` pairs; the term as given is the display
+                form reported for matches
+        """
+        self.terms: List[str] = []
+        self.labels: List[str] = []
+        self.term_lengths: List[int] = []
+        self._single: Dict[str, List[int]] = {}
+
+        # Trie over the tokens of multi-token terms: goto edges, failure
+        # links and the terms ending at each node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for term, label in entries:
+            tokens = tuple(_WORD_RE.findall(term.lower()))
+            if not tokens or (tokens, label) in seen:
+                continue
+            seen.add((tokens, label))
+            term_id = len(self.terms)
+            self.terms.append(term)
+            self.labels.append(label)
+            self.term_lengths.append(len(tokens))
+            if len(tokens) == 1:
+                self._single.setdefault(tokens[0], []).append(term_id)
+            else:
+                self._insert(tokens, term_id)
+
+        self.max_term_tokens = max(self.term_lengths, default=0)
+        self._build_failure_links()
+
+    @classmethod
+    def from_lexicons(cls, lexicons: Mapping[str, Iterable[str]]) -> "Gazetteer":
+        """Build from a mapping of label -> terms"""
+        return cls((term, label) for label, terms in lexicons.items() for term in terms)
+
+    @staticmethod
+    def load_lexicons(path: Union[str, Path]) -> Dict[str, List[str]]:
+        """Read a JSON object mapping each label to a list of terms"""
+        lexicons = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(lexicons, dict) or not all(
+            isinstance(terms, list) for terms in lexicons.values()
+        ):
+            raise ValueError(f"Expected a JSON object of label -> terms: {path}")
+        return lexicons
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _insert(self, tokens: Tuple[str, ...], term_id: int) -> None:
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = child
+        self._out[node] += (term_id,)
+
+    def _build_failure_links(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(token, 0)
+                out[child] += out[fail[child]]
+
+    def _scan_phrases(self, tokens: Sequence[str]) -> Iterator[Tuple[int, int]]:
+        """Yield ``(index of last token, term id)`` for multi-token terms"""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        if not root:
+            return
+        state = 0
+        for i, token in enumerate(tokens):
+            if state == 0:
+                state = root.get(token, 0)
+            else:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            for term_id in out[state]:
+                yield i, term_id
+
+    def count(
+        self,
+        tokens: Sequence[str],
+        token_counts: Optional[Mapping[str, int]] = None,
+    ) -> Counter:
+        """Count occurrences of every term in a tokenized text
+
+        Args:
+            tokens: Lowercased word tokens in text order
+            token_counts: Occurrences of each token, if already known; single
+                token terms are then counted from it instead of the tokens
+
+        Returns:
+            Counter of term id -> occurrences; single-token terms come first,
+            in first-seen order
+        """
+        if token_counts is None:
+            token_counts = Counter(tokens)
+        counts = self.count_single(token_counts)
+        counts.update(self.count_phrases(tokens))
+        return counts
+
+    def count_single(self, token_counts: Mapping[str, int]) -> Counter:
+        """Count single-token terms from the occurrences of each token
+
+        Returns:
+            Counter of term id -> occurrences, in the order of ``token_counts``
+        """
+        counts: Counter = Counter()
+        single = self._single
+        for token, occurrences in token_counts.items():
+            term_ids = single.get(token)
+            if term_ids:
+                for term_id in term_ids:
+                    counts[term_id] += occurrences
+        return counts
+
+    def count_phrases(
+        self, tokens: Sequence[str], boundary: Optional[int] = None
+    ) -> Counter:
+        """Count occurrences of multi-token terms
+
+        Args:
+            tokens: Lowercased word tokens in text order
+            boundary: Only count occurrences that start before this token
+                index and end at or after it
+
+        Returns:
+            Counter of term id -> occurrences
+        """
+        counts: Counter = Counter()
+        lengths = self.term_lengths
+        for end, term_id in self._scan_phrases(tokens):
+            start = end - lengths[term_id] + 1
+            if boundary is None or start < boundary <= end:
+                counts[term_id] += 1
+        return counts
+
+    def iter_matches(self, text: str) -> Iterator[GazetteerMatch]:
+        """Yield every occurrence of every term with character offsets
+
+        Matches are ordered by where they end; terms ending at the same word
+        are reported single-token terms first.
+        """
+        spans = []
+        tokens = []
+        for match in _WORD_RE.finditer(text):
+            spans.append(match.span())
+            tokens.append(match.group().lower())
+
+        phrases = self._scan_phrases(tokens)
+        pending = next(phrases, None)
+        for i, token in enumerate(tokens):
+            for term_id in self._single.get(token, ()):
+                yield self._match(term_id, spans[i][0], spans[i][1])
+            while pending is not None and pending[0] == i:
+                term_id = pending[1]
+                start = spans[i - self.term_lengths[term_id] + 1][0]
+                yield self._match(term_id, start, spans[i][1])
+                pending = next(phrases, None)
+
+    def _match(self, term_id: int, start: int, end: int) -> GazetteerMatch:
+        return GazetteerMatch(self.terms[term_id], self.labels[term_id], start, end)
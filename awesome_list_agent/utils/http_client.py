@@ -0,0 +1,101 @@
+"""Shared aiohttp client with timeouts and a bound on concurrent requests"""
+
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from .deadline import DeadlineExceeded, time_left
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AwesomeListAgent/1.0)"}
+
+
+class HTTPClient:
+    """One aiohttp session shared by many concurrent requests.
+
+    At most ``max_concurrency`` requests are in flight at once; the others
+    wait for a slot instead of opening more connections. The session is
+    created on first use and recreated if it was closed or belongs to an
+    event loop that is no longer running.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Create the client
+
+        Args:
+            max_concurrency: Maximum number of requests in flight
+            timeout: Default total timeout of a request in seconds
+            headers: Headers sent with every request
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the session of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self.session
+
+    async def get_text(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        encoding: Optional[str] = None,
+    ) -> str:
+        """GET ``url`` and return the response body as text
+
+        Args:
+            url: URL to fetch
+            timeout: Total timeout in seconds, instead of the default. Both
+                are cut short by the deadline of the current context.
+            encoding: Encoding of the body, instead of the response charset
+
+        Raises:
+            aiohttp.ClientError: On connection errors and non-2xx statuses
+            asyncio.TimeoutError: If the request takes longer than the timeout
+            DeadlineExceeded: If the deadline passed before the request
+                could start
+        """
+        session = self._get_session()
+        options = {"raise_for_status": True}
+        async with self._semaphore:
+            # Measured after waiting for a slot, which may take a while
+            remaining = time_left()
+            if remaining is not None:
+                # aiohttp reads a total of 0 as no timeout at all
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"Deadline exceeded before fetching {url}")
+                timeout = min(timeout or self.timeout, remaining)
+            if timeout is not None:
+                options["timeout"] = aiohttp.ClientTimeout(total=timeout)
+            async with session.get(url, **options) as response:
+                return await response.text(encoding=encoding)
+
+    async def close(self) -> None:
+        """Close the session, if open."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def __aenter__(self) -> "HTTPClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -0,0 +1,137 @@
+"""Persistent on-disk cache for scraped markdown"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "awesome_list_agent" / "markdown"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+logger = logging.getLogger("awesome_list_agent.MarkdownCache")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file so readers never observe a partial write"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class MarkdownCache:
+    """URL -> markdown cache with a TTL and content-addressed storage.
+
+    Each URL has a small entry file recording when it was fetched and the
+    SHA-256 of its markdown. The markdown itself is stored once per content
+    hash, so pages that mirror the same list share one blob, and the hash is
+    re-checked on read to detect corrupted or truncated blobs.
+
+    Layout::
+
+        <directory>/entries/<sha256(url)>.json
+        <directory>/blobs/<sha256(markdown)>.md
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Create a cache
+
+        Args:
+            directory: Cache directory (default: $MARKDOWN_CACHE_DIR or
+                ~/.cache/awesome_list_agent/markdown)
+            ttl_seconds: Age after which entries are stale (default:
+                $MARKDOWN_CACHE_TTL or 24 hours)
+        """
+        if directory is None:
+            directory = os.getenv("MARKDOWN_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("MARKDOWN_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _entry_path(self, url: str) -> Path:
+        return self.directory / "entries" / f"{_sha256(url.encode('utf-8'))}.json"
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.directory / "blobs" / f"{content_hash}.md"
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached markdown for a URL, or None if missing or stale"""
+        try:
+            entry = json.loads(self._entry_path(url).read_text(encoding="utf-8"))
+            if time.time() - entry["fetched_at"] > self.ttl_seconds:
+                return None
+            data = self._blob_path(entry["content_hash"]).read_bytes()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if _sha256(data) != entry["content_hash"]:
+            logger.warning(f"Discarding corrupted cache blob for {url}")
+            return None
+        return data.decode("utf-8")
+
+    def set(self, url: str, markdown: str) -> str:
+        """Store markdown for a URL and return its content hash"""
+        data = markdown.encode("utf-8")
+        content_hash = _sha256(data)
+
+        blob_path = self._blob_path(content_hash)
+        if not blob_path.exists():
+            _atomic_write(blob_path, data)
+
+        entry = {"url": url, "content_hash": content_hash, "fetched_at": time.time()}
+        _atomic_write(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+        return content_hash
+
+    def prune(self) -> int:
+        """Delete stale entries and blobs no entry refers to
+
+        Returns:
+            Number of files deleted
+        """
+        now = time.time()
+        referenced = set()
+        deleted = 0
+        for entry_path in sorted((self.directory / "entries").glob("*.json")):
+            try:
+                entry = json.loads(entry_path.read_text(encoding="utf-8"))
+                if now - entry["fetched_at"] <= self.ttl_seconds:
+                    referenced.add(entry["content_hash"])
+                    continue
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            entry_path.unlink(missing_ok=True)
+            deleted += 1
+
+        for blob_path in sorted((self.directory / "blobs").glob("*.md")):
+            if blob_path.stem not in referenced:
+                blob_path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    def invalidate(self, url: str) -> None:
+        """Drop the entry for a URL; its blob is left for other URLs"""
+        try:
+            self._entry_path(url).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,273 @@
+"""Near-duplicate text detection with MinHash signatures and LSH banding"""
+
+import random
+import re
+import zlib
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+K = TypeVar("K", bound=Hashable)
+
+# Same tokenization as TokenizedText.words
+_WORD_RE = re.compile(r"\b\w+\b")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_MASK_64 = (1 << 64) - 1
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_MIN_SHINGLES = 5
+
+
+class MinHasher:
+    """MinHash signatures of word shingles.
+
+    A text is reduced to the set of its overlapping ``shingle_size``-word
+    windows, each hashed to 32 bits. Every one of ``num_perm`` universal hash
+    functions ``(a * x + b) mod p`` keeps its minimum over the set; the share
+    of equal positions in two signatures estimates the Jaccard similarity of
+    the shingle sets. With numpy the whole signature is one vectorized
+    reduction; the pure Python fallback produces the same values.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        """Draw the hash functions
+
+        Args:
+            num_perm: Signature length
+            shingle_size: Words per shingle; texts shorter than this are one
+                shingle
+            seed: Seed of the hash functions; only signatures from hashers
+                with the same seed and length are comparable
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._a = [rng.randint(1, _MERSENNE_PRIME - 1) for _ in range(num_perm)]
+        self._b = [rng.randint(0, _MERSENNE_PRIME - 1) for _ in range(num_perm)]
+        if np is not None:
+            self._a_array = np.array(self._a, dtype=np.uint64)
+            self._b_array = np.array(self._b, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[int]:
+        """32-bit hashes of the word shingles of ``text``"""
+        words = _WORD_RE.findall(text.lower())
+        size = min(self.shingle_size, len(words))
+        if not size:
+            return set()
+        return {
+            zlib.crc32(" ".join(words[i : i + size]).encode("utf-8"))
+            for i in range(len(words) - size + 1)
+        }
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of ``text``, or None if it has no words"""
+        return self.minhash(self.shingles(text))
+
+    def minhash(self, shingles: Set[int]) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of a shingle set, or None if it is empty"""
+        if not shingles:
+            return None
+        if np is not None:
+            hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+            # uint64 products wrap modulo 2**64, as the fallback masks them
+            permuted = np.outer(hashes, self._a_array) + self._b_array
+            permuted %= np.uint64(_MERSENNE_PRIME)
+            permuted &= np.uint64(_MAX_HASH)
+            return tuple(permuted.min(axis=0).tolist())
+        return tuple(
+            min(
+                ((a * x + b) & _MASK_64) % _MERSENNE_PRIME & _MAX_HASH for x in shingles
+            )
+            for a, b in zip(self._a, self._b)
+        )
+
+
+def word_jaccard(left: str, right: str) -> float:
+    """Jaccard similarity of the lowercased word sets of two short texts"""
+    left_words = set(_WORD_RE.findall(left.lower()))
+    right_words = set(_WORD_RE.findall(right.lower()))
+    if not left_words or not right_words:
+        return 0.0
+    return len(left_words & right_words) / len(left_words | right_words)
+
+
+def estimate_jaccard(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    if len(left) != len(right):
+        raise ValueError("Signatures must have the same length")
+    return sum(a == b for a, b in zip(left, right)) / len(left)
+
+
+class LSHIndex(Generic[K]):
+    """Locality-sensitive hashing over MinHash signatures.
+
+    A signature is cut into ``bands`` bands of equal width; two keys are
+    candidates when any band matches exactly, which happens with probability
+    ``1 - (1 - s ** rows) ** bands`` for Jaccard similarity ``s``. A lookup
+    probes one bucket per band, so its cost does not grow with the number of
+    indexed keys.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS):
+        """Create an empty index
+
+        Args:
+            num_perm: Signature length
+            bands: Number of bands; must divide ``num_perm``
+        """
+        if bands <= 0 or num_perm % bands:
+            raise ValueError(f"bands must divide num_perm: {bands}, {num_perm}")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[K]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: Sequence[int]) -> List[Tuple[int, ...]]:
+        if len(signature) != self.num_perm:
+            raise ValueError(
+                f"Expected a signature of length {self.num_perm}, got {len(signature)}"
+            )
+        rows = self.rows
+        return [
+            tuple(signature[start : start + rows])
+            for start in range(0, self.num_perm, rows)
+        ]
+
+    def insert(self, key: K, signature: Sequence[int]) -> None:
+        """Index ``key`` under every band of its signature"""
+        for buckets, band in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band, []).append(key)
+
+    def candidates(self, signature: Sequence[int]) -> List[K]:
+        """Keys sharing at least one band with ``signature``, in insertion order"""
+        found: Dict[K, None] = {}
+        for buckets, band in zip(self._buckets, self._band_keys(signature)):
+            for key in buckets.get(band, ()):
+                found[key] = None
+        return list(found)
+
+
+class NearDuplicateIndex(Generic[K]):
+    """Incremental grouping of texts whose shingle sets are nearly equal.
+
+    Each added text is compared only with the LSH candidates of its
+    signature; a candidate whose estimated Jaccard similarity reaches
+    ``threshold`` makes the new text a duplicate of that candidate's group.
+    The first text of a group is its representative.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        min_shingles: int = DEFAULT_MIN_SHINGLES,
+    ):
+        """Create an empty index
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of duplicates
+            num_perm: Signature length
+            bands: LSH bands; more bands find less similar candidates
+            shingle_size: Words per shingle
+            min_shingles: Texts with fewer distinct shingles are too short to
+                judge (two talks can share a one-word title) and are never
+                duplicates
+        """
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.lsh: LSHIndex[K] = LSHIndex(num_perm=num_perm, bands=bands)
+        self._signatures: Dict[K, Tuple[int, ...]] = {}
+        self._representatives: Dict[K, K] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        shingles = self.hasher.shingles(text)
+        if len(shingles) < self.min_shingles:
+            return None
+        return self.hasher.minhash(shingles)
+
+    def find(self, text: str) -> Optional[Tuple[K, float]]:
+        """Most similar indexed key at or above the threshold, with its score"""
+        signature = self._signature(text)
+        return self._best_match(signature) if signature else None
+
+    def _best_match(
+        self,
+        signature: Tuple[int, ...],
+        accept: Optional[Callable[[K], bool]] = None,
+    ) -> Optional[Tuple[K, float]]:
+        best = None
+        for key in self.lsh.candidates(signature):
+            if accept is not None and not accept(key):
+                continue
+            similarity = estimate_jaccard(signature, self._signatures[key])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def add(
+        self, key: K, text: str, accept: Optional[Callable[[K], bool]] = None
+    ) -> Optional[K]:
+        """Index a text under ``key``
+
+        Args:
+            key: Key of the text
+            text: Text to compare with the indexed texts
+            accept: Called with the key of each similar indexed text; those
+                it returns False for are not considered duplicates
+
+        Returns:
+            The representative of the group the text joined, or None if it is
+            not a near-duplicate of any indexed text. Texts shorter than
+            ``min_shingles`` are never duplicates and are not indexed.
+        """
+        if key in self._signatures:
+            raise ValueError(f"Key already indexed: {key!r}")
+        signature = self._signature(text)
+        if signature is None:
+            return None
+        match = self._best_match(signature, accept)
+        self._signatures[key] = signature
+        self.lsh.insert(key, signature)
+        if match is None:
+            self._representatives[key] = key
+            return None
+        representative = self._representatives[match[0]]
+        self._representatives[key] = representative
+        return representative
+
+    def groups(self) -> Dict[K, List[K]]:
+        """Representative -> its duplicates, for groups with duplicates"""
+        groups: Dict[K, List[K]] = {}
+        for key, representative in self._representatives.items():
+            if key != representative:
+                groups.setdefault(representative, []).append(key)
+        return groups
@@ -0,0 +1,213 @@
+"""Readability metrics computed from one set of counters"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .text_tokens import TokenizedText, tokenize_text
+
+METRIC_NAMES = (
+    "flesch_reading_ease",
+    "flesch_kincaid_grade",
+    "gunning_fog_index",
+    "smog_index",
+    "coleman_liau_index",
+    "automated_readability_index",
+)
+
+# Words with more syllables than this count as "complex" (Gunning Fog, SMOG)
+COMPLEX_WORD_SYLLABLES = 2
+
+_VOWELS = frozenset("aeiouy")
+
+
+@lru_cache(maxsize=65536)
+def count_word_syllables(word: str) -> int:
+    """Count syllables in a single word (simplified vowel-group heuristic)
+
+    Results are memoized in a bounded LRU cache shared across documents, so
+    each distinct word is only counted once while it stays in the cache.
+    """
+    word = word.lower()
+    count = 0
+    on_vowel = False
+
+    for char in word:
+        is_vowel = char in _VOWELS
+        if is_vowel and not on_vowel:
+            count += 1
+        on_vowel = is_vowel
+
+    # Adjust for common patterns
+    if word.endswith("e"):
+        count -= 1
+    if count == 0:
+        count = 1
+
+    return count
+
+
+def count_syllables(text: str) -> int:
+    """Count syllables in text as the sum over its words"""
+    tokens = tokenize_text(text)
+    return max(
+        1,
+        sum(count_word_syllables(w) * n for w, n in tokens.word_counts.items()),
+    )
+
+
+@dataclass(frozen=True)
+class ReadabilityCounts:
+    """The counters every readability metric is derived from"""
+
+    sentences: int
+    words: int
+    syllables: int
+    complex_words: int
+    letters: int
+
+
+def syllable_totals(word_counts: Mapping[str, int]) -> Tuple[int, int]:
+    """Total syllables and complex words for a mapping of word -> occurrences"""
+    syllables = 0
+    complex_words = 0
+    for word, occurrences in word_counts.items():
+        word_syllables = count_word_syllables(word)
+        syllables += word_syllables * occurrences
+        if word_syllables > COMPLEX_WORD_SYLLABLES:
+            complex_words += occurrences
+    return syllables, complex_words
+
+
+def readability_counts(tokens: TokenizedText) -> ReadabilityCounts:
+    """Collect readability counters for a document in one pass over its vocabulary"""
+    syllables, complex_words = syllable_totals(tokens.word_counts)
+    return ReadabilityCounts(
+        sentences=len(tokens.sentences),
+        words=len(tokens.words),
+        syllables=syllables,
+        complex_words=complex_words,
+        letters=tokens.letter_count,
+    )
+
+
+def readability_metrics(counts: ReadabilityCounts) -> Dict[str, float]:
+    """Compute Flesch, Flesch-Kincaid, Fog, SMOG, Coleman-Liau and ARI"""
+    if counts.sentences == 0 or counts.words == 0:
+        return {name: 0 for name in METRIC_NAMES}
+
+    words_per_sentence = counts.words / counts.sentences
+    syllables_per_word = counts.syllables / counts.words
+    letters_per_word = counts.letters / counts.words
+
+    flesch_ease = 206.835 - (1.015 * words_per_sentence) - (84.6 * syllables_per_word)
+    flesch_grade = (0.39 * words_per_sentence) + (11.8 * syllables_per_word) - 15.59
+    fog_index = 0.4 * (
+        words_per_sentence + (100 * (counts.complex_words / counts.words))
+    )
+    smog_index = (
+        1.043 * ((counts.complex_words * (30 / counts.sentences)) ** 0.5) + 3.1291
+    )
+    coleman_liau = (
+        (0.0588 * (letters_per_word * 100))
+        - (0.296 * (counts.sentences / counts.words * 100))
+        - 15.8
+    )
+    ari = (4.71 * letters_per_word) + (0.5 * words_per_sentence) - 21.43
+
+    return {
+        "flesch_reading_ease": max(0, min(100, flesch_ease)),
+        "flesch_kincaid_grade": max(0, flesch_grade),
+        "gunning_fog_index": max(0, fog_index),
+        "smog_index": max(0, smog_index),
+        "coleman_liau_index": max(0, coleman_liau),
+        "automated_readability_index": max(0, ari),
+    }
+
+
+def readability_arrays(counts: Sequence[ReadabilityCounts]) -> Dict[str, "np.ndarray"]:
+    """Compute every metric for many documents at once with NumPy
+
+    Args:
+        counts: Counters for each document
+
+    Returns:
+        Mapping of metric name to a float array with one entry per document.
+        Documents without sentences or words score 0.
+    """
+    if np is None:
+        raise ImportError("numpy is required for vectorized readability metrics")
+
+    table = np.array(
+        [
+            (c.sentences, c.words, c.syllables, c.complex_words, c.letters)
+            for c in counts
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 5)
+    return readability_arrays_from_columns(*table.T)
+
+
+def readability_arrays_from_columns(
+    sentences: "np.ndarray",
+    words: "np.ndarray",
+    syllables: "np.ndarray",
+    complex_words: "np.ndarray",
+    letters: "np.ndarray",
+) -> Dict[str, "np.ndarray"]:
+    """Compute every metric from per-document counter columns
+
+    Each argument is an array with one entry per document, e.g. the result
+    of multiplying a document-term matrix by per-term syllable counts.
+    """
+    sentences, words, syllables, complex_words, letters = (
+        np.asarray(column, dtype=np.float64)
+        for column in (sentences, words, syllables, complex_words, letters)
+    )
+
+    valid = (sentences > 0) & (words > 0)
+    # Substitute 1 for empty documents; their scores are zeroed below
+    safe_sentences = np.where(valid, sentences, 1.0)
+    safe_words = np.where(valid, words, 1.0)
+
+    words_per_sentence = words / safe_sentences
+    syllables_per_word = syllables / safe_words
+    letters_per_word = letters / safe_words
+
+    flesch_ease = 206.835 - (1.015 * words_per_sentence) - (84.6 * syllables_per_word)
+    flesch_grade = (0.39 * words_per_sentence) + (11.8 * syllables_per_word) - 15.59
+    fog_index = 0.4 * (words_per_sentence + (100 * (complex_words / safe_words)))
+    smog_index = 1.043 * ((complex_words * (30 / safe_sentences)) ** 0.5) + 3.1291
+    coleman_liau = (
+        (0.0588 * (letters_per_word * 100))
+        - (0.296 * (sentences / safe_words * 100))
+        - 15.8
+    )
+    ari = (4.71 * letters_per_word) + (0.5 * words_per_sentence) - 21.43
+
+    metrics = {
+        "flesch_reading_ease": np.clip(flesch_ease, 0, 100),
+        "flesch_kincaid_grade": np.maximum(0, flesch_grade),
+        "gunning_fog_index": np.maximum(0, fog_index),
+        "smog_index": np.maximum(0, smog_index),
+        "coleman_liau_index": np.maximum(0, coleman_liau),
+        "automated_readability_index": np.maximum(0, ari),
+    }
+    return {name: np.where(valid, values, 0.0) for name, values in metrics.items()}
+
+
+def readability_metrics_many(
+    counts: Sequence[ReadabilityCounts],
+) -> List[Dict[str, float]]:
+    """Compute metrics for many documents, vectorized when NumPy is available"""
+    if np is None:
+        return [readability_metrics(c) for c in counts]
+
+    arrays = readability_arrays(counts)
+    columns = [arrays[name].tolist() for name in METRIC_NAMES]
+    return [dict(zip(METRIC_NAMES, row)) for row in zip(*columns)]
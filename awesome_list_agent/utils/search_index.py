@@ -0,0 +1,271 @@
+"""Local full-text search over processed awesome lists and their videos"""
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+LIST_KIND = "list"
+VIDEO_KIND = "video"
+
+# bm25() weights of the title, categories, description and transcript columns
+_COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+_QUERY_TERM_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    list_url TEXT,
+    title TEXT,
+    language TEXT COLLATE NOCASE,
+    duration_seconds INTEGER,
+    view_count INTEGER,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_list_url ON documents (list_url);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+    title, categories, description, transcript,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+def match_all_terms(query: str) -> str:
+    """FTS5 query matching every word of ``query``
+
+    Each word is quoted, so operators and punctuation in user input are never
+    interpreted. Empty if ``query`` has no words.
+    """
+    return " ".join(f'"{term}"' for term in _QUERY_TERM_RE.findall(query))
+
+
+def match_any_term(query: str) -> str:
+    """FTS5 query matching any word of ``query``, quoted as in match_all_terms()"""
+    return " OR ".join(f'"{term}"' for term in _QUERY_TERM_RE.findall(query))
+
+
+class SearchHit(NamedTuple):
+    """One ranked search result"""
+
+    kind: str
+    url: str
+    title: str
+    list_url: Optional[str]
+    language: Optional[str]
+    duration_seconds: Optional[int]
+    view_count: Optional[int]
+    score: float
+    snippet: str
+
+
+class SearchIndex:
+    """SQLite FTS5 index of list topics, categories, items and videos.
+
+    Every list and every video is one document. Text goes into an FTS5
+    table ranked with BM25 (titles weigh most, transcripts least); the
+    filterable attributes live in a plain table sharing its rowid. Indexing
+    a result again replaces its documents, so the index can be updated as
+    results are produced.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """Open or create the index
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        try:
+            self.connection.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self.connection.close()
+            raise RuntimeError(f"SQLite FTS5 is required for search: {e}") from e
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add_result(self, result: Dict[str, Any]) -> int:
+        """Index a process_awesome_list() result, replacing earlier copies
+
+        The list document holds the topic, categories, description and the
+        text of every linked item; each video holds its title, tags,
+        description and transcript.
+
+        Returns:
+            Number of documents indexed
+        """
+        parsed_data = result.get("parsed_data") or {}
+        list_url = result.get("url") or parsed_data.get("url")
+        if not list_url:
+            raise ValueError("Result has no list URL")
+        language = parsed_data.get("language")
+
+        links = (parsed_data.get("web_scraping_data") or {}).get("links") or []
+        items = [
+            " ".join(filter(None, (link.get("text"), link.get("title"))))
+            for link in links
+            if isinstance(link, dict)
+        ]
+        documents = [
+            {
+                "kind": LIST_KIND,
+                "url": list_url,
+                "title": parsed_data.get("topic") or "",
+                "categories": " ".join(parsed_data.get("categories") or []),
+                "description": "\n".join(
+                    [parsed_data.get("description") or "", *items]
+                ),
+                "transcript": "",
+                "language": language,
+            }
+        ]
+        for video in parsed_data.get("youtube_metadata") or []:
+            if not isinstance(video, dict):
+                continue
+            url = video.get("webpage_url") or video.get("url")
+            if not url:
+                continue
+            documents.append(
+                {
+                    "kind": VIDEO_KIND,
+                    "url": url,
+                    "title": video.get("title") or "",
+                    "categories": " ".join(
+                        [*(video.get("categories") or []), *(video.get("tags") or [])]
+                    ),
+                    "description": video.get("description") or "",
+                    "transcript": _transcript_text(video),
+                    "language": language,
+                    "duration_seconds": video.get("duration_seconds"),
+                    "view_count": video.get("view_count"),
+                }
+            )
+
+        with self.connection:
+            # Videos dropped from the list since it was last indexed go too
+            self._delete(
+                "SELECT id FROM documents WHERE url = ? OR list_url = ?",
+                (list_url, list_url),
+            )
+            for document in documents:
+                self._insert(document, list_url)
+        return len(documents)
+
+    def _delete(self, select_ids: str, parameters: tuple) -> None:
+        ids = [(row[0],) for row in self.connection.execute(select_ids, parameters)]
+        self.connection.executemany("DELETE FROM documents_fts WHERE rowid = ?", ids)
+        self.connection.executemany("DELETE FROM documents WHERE id = ?", ids)
+
+    def _insert(self, document: Dict[str, Any], list_url: str) -> None:
+        # A video linked from several lists is kept once, under the latest
+        self._delete("SELECT id FROM documents WHERE url = ?", (document["url"],))
+        cursor = self.connection.execute(
+            "INSERT INTO documents (kind, url, list_url, title, language,"
+            " duration_seconds, view_count, indexed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                document["kind"],
+                document["url"],
+                None if document["kind"] == LIST_KIND else list_url,
+                document["title"],
+                document["language"],
+                document.get("duration_seconds"),
+                document.get("view_count"),
+                time.time(),
+            ),
+        )
+        self.connection.execute(
+            "INSERT INTO documents_fts"
+            " (rowid, title, categories, description, transcript)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                cursor.lastrowid,
+                document["title"],
+                document["categories"],
+                document["description"],
+                document["transcript"],
+            ),
+        )
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        language: Optional[str] = None,
+        min_duration: Optional[int] = None,
+        max_duration: Optional[int] = None,
+        min_views: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """Rank documents containing every word of ``query``
+
+        Args:
+            query: Words to search for; each must appear (stemmed) in the
+                document
+            kind: Only "list" or only "video" documents
+            language: Only documents of lists in this language
+            min_duration: Only videos at least this many seconds long
+            max_duration: Only videos at most this many seconds long
+            min_views: Only videos with at least this many views
+            limit: Maximum number of hits
+
+        Returns:
+            Hits, best BM25 score first
+        """
+        match = match_all_terms(query)
+        if not match:
+            return []
+
+        conditions = ["documents_fts MATCH ?"]
+        parameters: List[Any] = [match]
+        for condition, value in (
+            ("d.kind = ?", kind),
+            ("d.language = ?", language),
+            ("d.duration_seconds >= ?", min_duration),
+            ("d.duration_seconds <= ?", max_duration),
+            ("d.view_count >= ?", min_views),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        parameters.append(limit)
+
+        weights = ", ".join(str(weight) for weight in _COLUMN_WEIGHTS)
+        rows = self.connection.execute(
+            f"SELECT d.kind, d.url, d.title, d.list_url, d.language,"
+            f" d.duration_seconds, d.view_count,"
+            f" bm25(documents_fts, {weights}) AS rank,"
+            f" snippet(documents_fts, -1, '[', ']', '…', 12)"
+            f" FROM documents_fts JOIN documents AS d ON d.id = documents_fts.rowid"
+            f" WHERE {' AND '.join(conditions)}"
+            f" ORDER BY rank LIMIT ?",
+            parameters,
+        )
+        # bm25() is lower for better matches; report higher-is-better scores
+        return [SearchHit(*row[:7], -row[7], row[8]) for row in rows]
+
+
+def _transcript_text(video: Dict[str, Any]) -> str:
+    """Transcript text of a video, from its cues if the plain text is missing"""
+    transcript = video.get("transcript")
+    if isinstance(transcript, str) and transcript:
+        return transcript
+    segments = video.get("transcript_segments")
+    if isinstance(segments, dict) and isinstance(segments.get("text"), str):
+        return segments["text"]
+    return ""
@@ -0,0 +1,465 @@
+"""Mergeable partial results for analyzing long texts in chunks"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .gazetteer import Gazetteer
+from .readability import ReadabilityCounts, syllable_totals
+from .text_tokens import tokenize_text
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Patterns shared with ContentAnalysisTool, so whole-text and chunked
+# analysis match the same things
+CAPITALIZED_WORD_RE = re.compile(r"\b[A-Z][a-z]+\b")
+ORGANIZATION_RE = re.compile(
+    r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Inc|Corp|LLC|Ltd|Company|Organization|Foundation|Institute|University|College)\b"
+)
+URL_RE = re.compile(r"https?://[^\s]+")
+HEADING_RE = re.compile(r"^#{1,6}\s+", re.MULTILINE)
+BULLET_LIST_RE = re.compile(r"^[\s]*[-*+]\s+", re.MULTILINE)
+NUMBERED_LIST_RE = re.compile(r"^[\s]*\d+\.\s+", re.MULTILINE)
+MARKDOWN_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+FENCED_CODE_RE = re.compile(r"```[\s\S]*?```")
+INLINE_CODE_RE = re.compile(r"`[^`]+`")
+
+# Organizations and URLs reported as entities, in text order
+MAX_LISTED_ENTITIES = 5
+
+# A chunk may only end right before whitespace that follows a word character
+# or a sentence terminator; sentence ends are preferred
+_SENTENCE_CUT_RE = re.compile(r"[.!?]\s")
+_WORD_CUT_RE = re.compile(r"\w\s")
+_NON_SPACE_RE = re.compile(r"\S")
+_CUT_WINDOW = 4096
+
+# MARKDOWN_LINK_RE as an NFA over the symbols "[", "]", "(", ")" and any
+# other run of characters, so a link split across chunks is still found.
+# States: 0 scanning, 1 after "[", 2 in link text, 3 after "]", 4 after
+# "(", 5 in target, 6 matched. Each table maps a state to its successors.
+_LINK_SYMBOL_RE = re.compile(r"[\[\]()]|[^\[\]()]+")
+_LINK_MATCHED = 1 << 6
+_LINK_TRANSITIONS = {
+    "[": (0b11, 1 << 2, 1 << 2, 0, 1 << 5, 1 << 5, _LINK_MATCHED),
+    "]": (0b1, 0, 1 << 3, 0, 1 << 5, 1 << 5, _LINK_MATCHED),
+    "(": (0b1, 1 << 2, 1 << 2, 1 << 4, 1 << 5, 1 << 5, _LINK_MATCHED),
+    ")": (0b1, 1 << 2, 1 << 2, 0, 0, _LINK_MATCHED, _LINK_MATCHED),
+    "": (0b1, 1 << 2, 1 << 2, 0, 1 << 5, 1 << 5, _LINK_MATCHED),
+}
+_LINK_STATES = len(_LINK_TRANSITIONS[""])
+# Every state maps to itself: the transfer function of empty text
+_LINK_IDENTITY = tuple(1 << state for state in range(_LINK_STATES))
+
+# (contains non-whitespace, whitespace-separated words)
+Segment = Tuple[bool, int]
+_EMPTY_SEGMENT: Segment = (False, 0)
+
+
+def _join(left: Segment, right: Segment) -> Segment:
+    return left[0] or right[0], left[1] + right[1]
+
+
+def _successors(states: int, table: Tuple[int, ...]) -> int:
+    """Union of ``table[state]`` over the states set in the ``states`` bitmask"""
+    successors = 0
+    for state in range(_LINK_STATES):
+        if states >> state & 1:
+            successors |= table[state]
+    return successors
+
+
+def _link_transfer(text: str) -> Tuple[int, ...]:
+    """States reachable after ``text`` from each link-matching state"""
+    transfer = list(_LINK_IDENTITY)
+    for match in _LINK_SYMBOL_RE.finditer(text):
+        symbol = match.group()
+        if symbol not in _LINK_TRANSITIONS:
+            symbol = ""
+        table = _LINK_TRANSITIONS[symbol]
+        transfer = [_successors(states, table) for states in transfer]
+    return tuple(transfer)
+
+
+def _search_lines(pattern: "re.Pattern", text: str, at_start: bool) -> bool:
+    """Search a line-anchored pattern; only the first chunk starts on a new line"""
+    match = pattern.search(text)
+    if match is not None and match.start() == 0 and not at_start:
+        match = pattern.search(text, 1)
+    return match is not None
+
+
+@dataclass
+class SegmentTally:
+    """Counts of non-blank segments of a text split on a separator.
+
+    A chunk can end inside a segment, so the segments before its first and
+    after its last separator stay open and are joined with the neighbouring
+    chunk's open segments when tallies are merged.
+    """
+
+    head: Segment = _EMPTY_SEGMENT
+    # Open segment after the last separator; None until a separator is seen
+    tail: Optional[Segment] = None
+    closed: int = 0
+    closed_words: int = 0
+
+    @classmethod
+    def from_segments(
+        cls, segments: List[str], count_words: bool = False
+    ) -> "SegmentTally":
+        """Tally the result of splitting a chunk on the separator"""
+        summaries = [
+            (not s.isspace() and s != "", len(s.split()) if count_words else 0)
+            for s in segments
+        ]
+        if len(summaries) == 1:
+            return cls(head=summaries[0])
+        inner = summaries[1:-1]
+        return cls(
+            head=summaries[0],
+            tail=summaries[-1],
+            closed=sum(1 for nonblank, _ in inner if nonblank),
+            closed_words=sum(words for _, words in inner),
+        )
+
+    def merge(self, other: "SegmentTally") -> "SegmentTally":
+        """Append the tally of the text that follows; returns self"""
+        if self.tail is None:
+            self.head = _join(self.head, other.head)
+            self.tail = other.tail
+            self.closed = other.closed
+            self.closed_words = other.closed_words
+        elif other.tail is None:
+            self.tail = _join(self.tail, other.head)
+        else:
+            nonblank, words = _join(self.tail, other.head)
+            self.closed += nonblank + other.closed
+            self.closed_words += words + other.closed_words
+            self.tail = other.tail
+        return self
+
+    @property
+    def count(self) -> int:
+        """Number of non-blank segments"""
+        open_segments = [self.head] if self.tail is None else [self.head, self.tail]
+        return self.closed + sum(1 for nonblank, _ in open_segments if nonblank)
+
+    @property
+    def words(self) -> int:
+        """Whitespace-separated words over all segments"""
+        tail_words = 0 if self.tail is None else self.tail[1]
+        return self.head[1] + self.closed_words + tail_words
+
+
+@dataclass
+class ContentTally:
+    """Everything ContentAnalysisTool derives its results from, for one chunk.
+
+    Tallies of consecutive chunks merge into the tally of their concatenation,
+    so chunks can be analyzed independently (or in parallel) and reduced in
+    order afterwards. Memory grows with the vocabulary, not the text length.
+    A default-constructed tally is the tally of empty text.
+
+    Merging is exact only for chunks cut by iter_text_chunks(), which never
+    splits a token, sentence terminator or entity across chunks.
+    """
+
+    text_length: int = 0
+    whitespace_words: int = 0
+    letters: int = 0
+    cased_words: int = 0
+    cased_word_characters: int = 0
+    # Lowercased words, in first-seen order like TokenizedText.word_counts
+    word_counts: Counter = field(default_factory=Counter)
+    alpha_word_counts: Counter = field(default_factory=Counter)
+    capitalized_counts: Counter = field(default_factory=Counter)
+    organizations: List[str] = field(default_factory=list)
+    urls: List[str] = field(default_factory=list)
+    sentences: SegmentTally = field(default_factory=SegmentTally)
+    paragraphs: SegmentTally = field(default_factory=SegmentTally)
+    has_headings: bool = False
+    has_lists: bool = False
+    link_transfer: Tuple[int, ...] = _LINK_IDENTITY
+    code_fences: int = 0
+    has_inline_code: bool = False
+    has_backticks: bool = False
+    # Multi-word gazetteer terms, plus the words at each end of the chunk
+    # needed to count terms that span two chunks
+    phrase_counts: Counter = field(default_factory=Counter)
+    phrase_head: List[str] = field(default_factory=list)
+    phrase_tail: List[str] = field(default_factory=list)
+    gazetteer: Optional[Gazetteer] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        at_start: bool = True,
+        extract_entities: bool = True,
+        gazetteer: Optional[Gazetteer] = None,
+    ) -> "ContentTally":
+        """Tally one chunk
+
+        Args:
+            text: The chunk
+            at_start: Whether the chunk starts the text (later chunks do not
+                begin a new line)
+            extract_entities: Whether to count capitalized words and
+                organizations
+            gazetteer: Gazetteer whose multi-word terms are counted
+        """
+        tokens = tokenize_text(text)
+        cased_words = tokens.cased_words
+        tally = cls(
+            text_length=len(text),
+            whitespace_words=tokens.whitespace_word_count,
+            letters=tokens.letter_count,
+            cased_words=len(cased_words),
+            cased_word_characters=sum(map(len, cased_words)),
+            word_counts=tokens.word_counts,
+            alpha_word_counts=Counter(tokens.alpha_words),
+            urls=[
+                m.group() for m in islice(URL_RE.finditer(text), MAX_LISTED_ENTITIES)
+            ],
+            sentences=SegmentTally.from_segments(
+                tokens.sentence_segments, count_words=True
+            ),
+            paragraphs=SegmentTally.from_segments(text.split("\n\n")),
+            has_headings=_search_lines(HEADING_RE, text, at_start),
+            has_lists=_search_lines(BULLET_LIST_RE, text, at_start)
+            or _search_lines(NUMBERED_LIST_RE, text, at_start),
+            link_transfer=_link_transfer(text),
+            code_fences=text.count("```"),
+            has_inline_code=INLINE_CODE_RE.search(text) is not None,
+            has_backticks="`" in text,
+        )
+        if gazetteer is not None and gazetteer.max_term_tokens > 1:
+            edge = gazetteer.max_term_tokens - 1
+            tally.gazetteer = gazetteer
+            tally.phrase_counts = gazetteer.count_phrases(tokens.words)
+            tally.phrase_head = tokens.words[:edge]
+            tally.phrase_tail = tokens.words[-edge:]
+        if extract_entities:
+            tally.capitalized_counts = Counter(CAPITALIZED_WORD_RE.findall(text))
+            tally.organizations = [
+                m.group()
+                for m in islice(ORGANIZATION_RE.finditer(text), MAX_LISTED_ENTITIES)
+            ]
+        return tally
+
+    def merge(self, other: "ContentTally") -> "ContentTally":
+        """Append the tally of the chunk that follows; returns self"""
+        self.text_length += other.text_length
+        self.whitespace_words += other.whitespace_words
+        self.letters += other.letters
+        self.cased_words += other.cased_words
+        self.cased_word_characters += other.cased_word_characters
+        self.word_counts.update(other.word_counts)
+        self.alpha_word_counts.update(other.alpha_word_counts)
+        self.capitalized_counts.update(other.capitalized_counts)
+        self.organizations = (self.organizations + other.organizations)[
+            :MAX_LISTED_ENTITIES
+        ]
+        self.urls = (self.urls + other.urls)[:MAX_LISTED_ENTITIES]
+        self.sentences.merge(other.sentences)
+        self.paragraphs.merge(other.paragraphs)
+        self.has_headings = self.has_headings or other.has_headings
+        self.has_lists = self.has_lists or other.has_lists
+        self.link_transfer = tuple(
+            _successors(states, other.link_transfer) for states in self.link_transfer
+        )
+        self.code_fences += other.code_fences
+        # Chunks never start or end with a backtick, so a backtick on each
+        # side of the boundary always encloses some inline code
+        self.has_inline_code = (
+            self.has_inline_code
+            or other.has_inline_code
+            or (self.has_backticks and other.has_backticks)
+        )
+        self.has_backticks = self.has_backticks or other.has_backticks
+
+        self.gazetteer = self.gazetteer or other.gazetteer
+        if self.gazetteer is not None:
+            edge = self.gazetteer.max_term_tokens - 1
+            if self.phrase_tail and other.phrase_head:
+                self.phrase_counts.update(
+                    self.gazetteer.count_phrases(
+                        self.phrase_tail + other.phrase_head, len(self.phrase_tail)
+                    )
+                )
+            self.phrase_counts.update(other.phrase_counts)
+            self.phrase_head = (self.phrase_head + other.phrase_head)[:edge]
+            self.phrase_tail = (self.phrase_tail + other.phrase_tail)[-edge:]
+        return self
+
+    @property
+    def word_total(self) -> int:
+        """Number of ``\\w+`` words"""
+        return sum(self.word_counts.values())
+
+    @property
+    def has_links(self) -> bool:
+        """Whether the text has a markdown link or a bare URL"""
+        return bool(self.urls) or bool(self.link_transfer[0] & _LINK_MATCHED)
+
+    @property
+    def has_code_blocks(self) -> bool:
+        """Whether the text has a fenced code block or inline code"""
+        return self.code_fences >= 2 or self.has_inline_code
+
+    @property
+    def average_sentence_length(self) -> float:
+        """Mean number of whitespace-separated words per sentence"""
+        count = self.sentences.count
+        return self.sentences.words / count if count else 0
+
+    @property
+    def average_word_length(self) -> float:
+        """Mean length of the ``\\w+`` words as they appear in the text"""
+        if not self.cased_words:
+            return 0
+        return self.cased_word_characters / self.cased_words
+
+    def readability_counts(self) -> ReadabilityCounts:
+        """Readability counters of the whole text"""
+        syllables, complex_words = syllable_totals(self.word_counts)
+        return ReadabilityCounts(
+            sentences=self.sentences.count,
+            words=self.word_total,
+            syllables=syllables,
+            complex_words=complex_words,
+            letters=self.letters,
+        )
+
+
+def merge_tallies(tallies: Iterable[ContentTally]) -> ContentTally:
+    """Reduce tallies of consecutive chunks, in order, into one"""
+    total = ContentTally()
+    for tally in tallies:
+        total.merge(tally)
+    return total
+
+
+def _is_safe_cut(text: str, cut: int) -> bool:
+    """Check the cut rules that depend on more than the two characters at it"""
+    before = text[cut - 1]
+    if before == "." and cut >= 2 and text[cut - 2].isdigit():
+        # "1. " could be a numbered list item
+        return False
+    if "a" <= before <= "z":
+        # "Acme Corp" could be an organization name
+        following = _NON_SPACE_RE.search(text, cut)
+        if following is None or "A" <= following.group() <= "Z":
+            return False
+    return True
+
+
+def _last_cut(text: str, pattern: "re.Pattern", lower: int, limit: int) -> int:
+    """Last safe cut in ``(lower, limit]``, scanning backwards, or -1"""
+    end = limit
+    while end > lower:
+        start = max(lower, end - _CUT_WINDOW)
+        cut = -1
+        for match in pattern.finditer(text, start, end + 1):
+            if _is_safe_cut(text, match.start() + 1):
+                cut = match.start() + 1
+        if cut > 0:
+            return cut
+        end = start
+    return -1
+
+
+def _find_cut(text: str, limit: int) -> int:
+    """Pick where to end the next chunk of ``text``, ideally near ``limit``"""
+    cut = _last_cut(text, _SENTENCE_CUT_RE, limit // 2, limit)
+    if cut < 0:
+        cut = _last_cut(text, _WORD_CUT_RE, 0, limit)
+    if cut < 0:
+        # No boundary before the limit; take the first one after it
+        for match in _WORD_CUT_RE.finditer(text, limit):
+            if _is_safe_cut(text, match.start() + 1):
+                return match.start() + 1
+    return cut
+
+
+class TextChunker:
+    """Re-cut a stream of text pieces into chunks that can be tallied apart.
+
+    Chunks end right before whitespace that follows a word character or a
+    sentence terminator, preferably at the end of a sentence, so no word,
+    sentence terminator, list marker or organization name spans two chunks.
+    Chunks are about ``chunk_size`` characters; a longer stretch of text
+    without such a boundary is kept whole.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._pieces: List[str] = []
+        self._size = 0
+
+    def feed(self, piece: str) -> List[str]:
+        """Add text and return the chunks that are now complete"""
+        self._pieces.append(piece)
+        self._size += len(piece)
+        if self._size <= self.chunk_size:
+            return []
+
+        buffer = "".join(self._pieces)
+        chunks = []
+        while len(buffer) > self.chunk_size:
+            cut = _find_cut(buffer, self.chunk_size)
+            if cut < 0:
+                break
+            chunks.append(buffer[:cut])
+            buffer = buffer[cut:]
+
+        self._pieces = [buffer]
+        self._size = len(buffer)
+        return chunks
+
+    def close(self) -> List[str]:
+        """Return the rest of the text at the end of the stream"""
+        buffer = "".join(self._pieces)
+        self._pieces = []
+        self._size = 0
+        return [buffer] if buffer else []
+
+
+def iter_text_chunks(
+    pieces: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield chunks of a text given as arbitrary pieces (see TextChunker)"""
+    chunker = TextChunker(chunk_size)
+    for piece in pieces:
+        yield from chunker.feed(piece)
+    yield from chunker.close()
+
+
+async def aiter_text_chunks(
+    pieces: Union[Iterable[str], AsyncIterable[str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """Async version of iter_text_chunks() for sync or async pieces"""
+    if not hasattr(pieces, "__aiter__"):
+        for chunk in iter_text_chunks(pieces, chunk_size):
+            yield chunk
+        return
+
+    chunker = TextChunker(chunk_size)
+    async for piece in pieces:
+        for chunk in chunker.feed(piece):
+            yield chunk
+    for chunk in chunker.close():
+        yield chunk
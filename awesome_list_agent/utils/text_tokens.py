@@ -0,0 +1,89 @@
+"""Shared tokenization pass for text analysis"""
+
+import re
+import string
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List
+
+_WORD_RE = re.compile(r"\b\w+\b")
+_ALPHA_WORD_RE = re.compile(r"\b[a-zA-Z]{3,}\b")
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+# Deletes ASCII letters; counting what was removed is much faster than a regex
+_DELETE_LETTERS = str.maketrans("", "", string.ascii_letters)
+
+
+@dataclass
+class TokenizedText:
+    """Tokens, sentences and counts of one document, each computed at most once.
+
+    Every view is computed lazily on first access and then cached, so the
+    analyzers of ContentAnalysisTool share one tokenization per document and
+    analyses that are turned off cost nothing.
+    """
+
+    text: str
+
+    @cached_property
+    def lower(self) -> str:
+        """The lowercased text"""
+        return self.text.lower()
+
+    @cached_property
+    def words(self) -> List[str]:
+        """Lowercased ``\\w+`` tokens in text order"""
+        return _WORD_RE.findall(self.lower)
+
+    @cached_property
+    def word_counts(self) -> Counter:
+        """Occurrences of each lowercased word, in first-seen order"""
+        return Counter(self.words)
+
+    @cached_property
+    def cased_words(self) -> List[str]:
+        """``\\w+`` tokens as they appear in the text
+
+        Kept separate from ``words`` because lowercasing can change the length
+        of a token (e.g. ``"İ".lower()`` is two characters).
+        """
+        return _WORD_RE.findall(self.text)
+
+    @cached_property
+    def alpha_words(self) -> List[str]:
+        """Lowercased ASCII-letter tokens of three or more letters"""
+        return _ALPHA_WORD_RE.findall(self.lower)
+
+    @cached_property
+    def whitespace_word_count(self) -> int:
+        """Number of whitespace-separated tokens"""
+        return len(self.text.split())
+
+    @cached_property
+    def sentence_segments(self) -> List[str]:
+        """Raw text between runs of ``.``, ``!`` and ``?``, blank ones included"""
+        return _SENTENCE_SPLIT_RE.split(self.text)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Non-empty, stripped sentences split on ``.``, ``!`` and ``?``"""
+        return [
+            stripped
+            for stripped in (s.strip() for s in self.sentence_segments)
+            if stripped
+        ]
+
+    @cached_property
+    def paragraph_count(self) -> int:
+        """Number of non-blank blocks separated by a blank line"""
+        return sum(1 for p in self.text.split("\n\n") if p.strip())
+
+    @cached_property
+    def letter_count(self) -> int:
+        """Number of ASCII letters"""
+        return len(self.text) - len(self.text.translate(_DELETE_LETTERS))
+
+
+def tokenize_text(text: str) -> TokenizedText:
+    """Create the shared token structure for a document"""
+    return TokenizedText(text)
@@ -0,0 +1,128 @@
+"""Persistent corpus-level document frequency index for TF-IDF scoring"""
+
+import math
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# File layout (little-endian):
+#   header: magic, format version, document count, vocabulary size
+#   document frequencies: uint32 * vocabulary size, in term-id order
+#   terms: UTF-8, NUL-separated, in term-id order
+_MAGIC = b"DFIX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHQI")
+
+
+class DocumentFrequencyIndex:
+    """Document frequencies of every term across all analyzed documents.
+
+    Terms are interned to dense integer IDs; frequencies live in a flat
+    ``array`` indexed by ID, so the index stays compact and IDF lookups are a
+    dict probe plus an array read. Documents are added incrementally.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Create an empty index
+
+        Args:
+            path: Default location used by save()
+        """
+        self.path = Path(path) if path else None
+        self.num_documents = 0
+        self.terms: List[str] = []
+        self.term_ids: Dict[str, int] = {}
+        self.doc_freqs = array("I")
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add_document(self, terms: Iterable[str]) -> None:
+        """Count one document; repeated terms within it count once"""
+        term_ids = self.term_ids
+        doc_freqs = self.doc_freqs
+        for term in set(terms):
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_ids[term] = len(self.terms)
+                self.terms.append(term)
+                doc_freqs.append(1)
+            else:
+                doc_freqs[term_id] += 1
+        self.num_documents += 1
+
+    def document_frequency(self, term: str) -> int:
+        """Number of documents containing ``term``"""
+        term_id = self.term_ids.get(term)
+        return 0 if term_id is None else self.doc_freqs[term_id]
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency: ln((1 + N) / (1 + df)) + 1
+
+        Unseen terms get the highest weight; a term in every document gets 1.
+        """
+        return (
+            math.log((1 + self.num_documents) / (1 + self.document_frequency(term))) + 1
+        )
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Write the index atomically to ``path`` (default: self.path)"""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No path given for saving the index")
+
+        doc_freqs = array("I", self.doc_freqs)
+        if sys.byteorder == "big":
+            doc_freqs.byteswap()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(
+                    _HEADER.pack(_MAGIC, _VERSION, self.num_documents, len(self.terms))
+                )
+                handle.write(doc_freqs.tobytes())
+                handle.write("\0".join(self.terms).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DocumentFrequencyIndex":
+        """Read an index written by save()"""
+        data = Path(path).read_bytes()
+        magic, version, num_documents, vocab_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a document frequency index: {path}")
+
+        offset = _HEADER.size
+        doc_freqs = array("I")
+        doc_freqs.frombytes(data[offset : offset + vocab_size * doc_freqs.itemsize])
+        if sys.byteorder == "big":
+            doc_freqs.byteswap()
+        offset += vocab_size * doc_freqs.itemsize
+
+        terms = data[offset:].decode("utf-8").split("\0") if vocab_size else []
+        if len(terms) != vocab_size:
+            raise ValueError(f"Corrupted document frequency index: {path}")
+
+        index = cls(path)
+        index.num_documents = num_documents
+        index.terms = terms
+        index.term_ids = {term: i for i, term in enumerate(terms)}
+        index.doc_freqs = doc_freqs
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: Union[str, Path]) -> "DocumentFrequencyIndex":
+        """Load the index at ``path``, or start an empty one saved there"""
+        if Path(path).exists():
+            return cls.load(path)
+        return cls(path)
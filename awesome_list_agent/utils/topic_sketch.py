@@ -0,0 +1,426 @@
+"""Fixed-size, mergeable heavy-hitter sketch of topic frequencies"""
+
+import datetime
+import hashlib
+import heapq
+import operator
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+# File layout (little-endian):
+#   header: magic, format version, width, depth, capacity, document count,
+#           total count, number of tracked terms
+#   counters: uint64 * depth * width, row by row
+#   tracked terms: UTF-8, NUL-separated
+_MAGIC = b"TSKT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIHIQQI")
+
+DEFAULT_WIDTH = 1 << 14
+DEFAULT_DEPTH = 4
+DEFAULT_CAPACITY = 200
+DEFAULT_WINDOW_WEEKS = 4
+DEFAULT_RETENTION_WEEKS = 26
+
+
+class CountMinSketch:
+    """Approximate counts of arbitrarily many strings in fixed memory.
+
+    ``depth`` rows of ``width`` counters; a string increments one counter per
+    row and its estimate is the smallest of them. Estimates never undercount,
+    and overcount by at most ``e / width`` of the total with probability
+    ``1 - exp(-depth)``. Row positions come from a keyed hash that does not
+    depend on the process, so sketches built anywhere with the same shape
+    can be added together.
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH):
+        """Create an empty sketch
+
+        Args:
+            width: Counters per row
+            depth: Number of rows
+        """
+        if width <= 0 or depth <= 0:
+            raise ValueError(f"Invalid sketch shape: {width} x {depth}")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.counts = array("Q", bytes(8 * width * depth))
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count ``key`` and return its new estimate"""
+        counts = self.counts
+        estimate = None
+        for position in self._positions(key):
+            value = counts[position] + count
+            counts[position] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self.total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """Upper bound on the occurrences of ``key``"""
+        counts = self.counts
+        return min(counts[position] for position in self._positions(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """Add the counts of a sketch of the same shape"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(
+                f"Cannot merge a {other.width} x {other.depth} sketch into "
+                f"a {self.width} x {self.depth} sketch"
+            )
+        self.counts = array("Q", map(operator.add, self.counts, other.counts))
+        self.total += other.total
+
+
+class TopicSketch:
+    """Most frequent topics over a corpus of any size.
+
+    A CountMinSketch estimates every topic's frequency; a bounded set of
+    ``capacity`` candidates with the highest estimates is kept next to it,
+    with a lazily updated min-heap to find the weakest one to evict. Memory
+    is fixed by the sketch shape and capacity, not by the corpus. Sketches
+    from worker processes or earlier runs merge into one, and the whole
+    state round-trips through a compact binary file.
+    """
+
+    def __init__(
+        self,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        capacity: int = DEFAULT_CAPACITY,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        """Create an empty sketch
+
+        Args:
+            width: Counters per Count-Min row
+            depth: Count-Min rows
+            capacity: Number of candidate topics tracked
+            path: Default location used by save()
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        self.sketch = CountMinSketch(width, depth)
+        self.capacity = capacity
+        self.path = Path(path) if path else None
+        self.num_documents = 0
+        self._top: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._top)
+
+    def add(self, topic: str, count: int = 1) -> None:
+        """Count occurrences of one topic"""
+        self._offer(topic, self.sketch.add(topic, count))
+
+    def add_document(self, topic_counts: Union[Mapping[str, int], Iterable]) -> None:
+        """Count the topics of one document
+
+        Args:
+            topic_counts: topic -> frequency, or ContentAnalysisTool topic
+                dictionaries with ``topic`` and ``frequency`` keys
+        """
+        if isinstance(topic_counts, Mapping):
+            items = topic_counts.items()
+        else:
+            items = ((topic["topic"], topic["frequency"]) for topic in topic_counts)
+        for topic, count in items:
+            self.add(topic, count)
+        self.num_documents += 1
+
+    def _offer(self, topic: str, estimate: int) -> None:
+        top = self._top
+        if topic in top or len(top) < self.capacity:
+            top[topic] = estimate
+            heapq.heappush(self._heap, (estimate, topic))
+        else:
+            weakest = self._weakest()
+            if estimate <= weakest[0]:
+                return
+            heapq.heappop(self._heap)
+            del top[weakest[1]]
+            top[topic] = estimate
+            heapq.heappush(self._heap, (estimate, topic))
+        # Every update pushes a new entry; drop the stale ones now and then
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, topic) for topic, count in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def _weakest(self) -> Tuple[int, str]:
+        """Tracked topic with the lowest estimate, with stale entries popped"""
+        heap = self._heap
+        while heap[0][0] != self._top.get(heap[0][1]):
+            heapq.heappop(heap)
+        return heap[0]
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """The ``n`` (default: all tracked) most frequent topics
+
+        Returns:
+            (topic, estimated frequency) pairs, most frequent first
+        """
+        # Tracked estimates can grow through collisions after they were taken
+        estimate = self.sketch.estimate
+        ranked = sorted(
+            ((topic, estimate(topic)) for topic in self._top),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked if n is None else ranked[:n]
+
+    def estimate(self, topic: str) -> int:
+        """Estimated frequency of any topic, tracked or not"""
+        return self.sketch.estimate(topic)
+
+    def merge(self, other: "TopicSketch") -> None:
+        """Add the counts and candidates of another sketch of the same shape"""
+        self.sketch.merge(other.sketch)
+        self.num_documents += other.num_documents
+        candidates = dict.fromkeys([*self._top, *other._top])
+        estimates = {topic: self.sketch.estimate(topic) for topic in candidates}
+        kept = heapq.nlargest(
+            self.capacity, estimates.items(), key=lambda item: (item[1], item[0])
+        )
+        self._top = dict(kept)
+        self._rebuild_heap()
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Write the sketch atomically to ``path`` (default: self.path)"""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No path given for saving the sketch")
+
+        sketch = self.sketch
+        counts = array("Q", sketch.counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(
+                    _HEADER.pack(
+                        _MAGIC,
+                        _VERSION,
+                        sketch.width,
+                        sketch.depth,
+                        self.capacity,
+                        self.num_documents,
+                        sketch.total,
+                        len(self._top),
+                    )
+                )
+                handle.write(counts.tobytes())
+                handle.write("\0".join(self._top).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TopicSketch":
+        """Read a sketch written by save()"""
+        data = Path(path).read_bytes()
+        (
+            magic,
+            version,
+            width,
+            depth,
+            capacity,
+            num_documents,
+            total,
+            num_tracked,
+        ) = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a topic sketch: {path}")
+
+        offset = _HEADER.size
+        size = 8 * width * depth
+        counts = array("Q")
+        counts.frombytes(data[offset : offset + size])
+        if sys.byteorder == "big":
+            counts.byteswap()
+        offset += size
+
+        topics = data[offset:].decode("utf-8").split("\0") if num_tracked else []
+        if len(counts) != width * depth or len(topics) != num_tracked:
+            raise ValueError(f"Corrupted topic sketch: {path}")
+
+        topic_sketch = cls(width, depth, capacity, path)
+        topic_sketch.sketch.counts = counts
+        topic_sketch.sketch.total = total
+        topic_sketch.num_documents = num_documents
+        topic_sketch._top = {
+            topic: topic_sketch.sketch.estimate(topic) for topic in topics
+        }
+        topic_sketch._rebuild_heap()
+        return topic_sketch
+
+    @classmethod
+    def load_or_create(cls, path: Union[str, Path]) -> "TopicSketch":
+        """Load the sketch at ``path``, or start an empty one saved there"""
+        if Path(path).exists():
+            return cls.load(path)
+        return cls(path=path)
+
+
+def iso_week(when: Optional[Union[datetime.date, datetime.datetime]] = None) -> str:
+    """ISO week of a date as ``YYYY-Www`` (default: the current UTC week)"""
+    if when is None:
+        when = datetime.datetime.now(datetime.timezone.utc)
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _week_start(period: str) -> datetime.date:
+    year, week = period.split("-W")
+    return datetime.date.fromisocalendar(int(year), int(week), 1)
+
+
+class TopicTrends:
+    """Topic frequencies per ISO week, merged over a recent window on query.
+
+    Every week has its own TopicSketch, so old documents stop counting once
+    their week leaves the window, and weeks past the retention are deleted
+    when saving. Weeks are stored as one sketch file each in a directory and
+    read only when a query or update needs them.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        window_weeks: int = DEFAULT_WINDOW_WEEKS,
+        retention_weeks: int = DEFAULT_RETENTION_WEEKS,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        capacity: int = DEFAULT_CAPACITY,
+    ):
+        """Create empty trends
+
+        Args:
+            path: Directory holding one ``<YYYY>-W<ww>.sketch`` file per week
+            window_weeks: Weeks merged by default when querying
+            retention_weeks: Weeks kept when saving
+            width: Counters per Count-Min row of each weekly sketch
+            depth: Count-Min rows of each weekly sketch
+            capacity: Number of candidate topics tracked per week
+        """
+        if window_weeks <= 0 or retention_weeks < window_weeks:
+            raise ValueError(
+                f"Invalid window and retention: {window_weeks}, {retention_weeks}"
+            )
+        self.path = Path(path) if path else None
+        self.window_weeks = window_weeks
+        self.retention_weeks = retention_weeks
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self._weeks: Dict[str, TopicSketch] = {}
+        self._changed: Set[str] = set()
+
+    def _week_path(self, period: str) -> Optional[Path]:
+        return self.path / f"{period}.sketch" if self.path else None
+
+    def week(self, period: str) -> TopicSketch:
+        """Sketch of one ISO week, read from disk on first use"""
+        sketch = self._weeks.get(period)
+        if sketch is None:
+            week_path = self._week_path(period)
+            if week_path is not None and week_path.exists():
+                sketch = TopicSketch.load(week_path)
+            else:
+                sketch = TopicSketch(self.width, self.depth, self.capacity)
+            self._weeks[period] = sketch
+        return sketch
+
+    def add_document(
+        self,
+        topic_counts: Union[Mapping[str, int], Iterable],
+        when: Optional[Union[datetime.date, datetime.datetime]] = None,
+    ) -> None:
+        """Count the topics of one document in the week of ``when`` (default: now)
+
+        Args:
+            topic_counts: As for TopicSketch.add_document()
+            when: Date the document was seen
+        """
+        period = iso_week(when)
+        self.week(period).add_document(topic_counts)
+        self._changed.add(period)
+
+    def window(
+        self,
+        weeks: Optional[int] = None,
+        now: Optional[Union[datetime.date, datetime.datetime]] = None,
+    ) -> TopicSketch:
+        """The weeks ending with the week of ``now`` merged into one sketch
+
+        Args:
+            weeks: Number of weeks (default: window_weeks)
+            now: Last day of the window (default: today, UTC)
+        """
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc)
+        merged = TopicSketch(self.width, self.depth, self.capacity)
+        for i in range(weeks or self.window_weeks):
+            merged.merge(self.week(iso_week(now - datetime.timedelta(weeks=i))))
+        return merged
+
+    def top(
+        self,
+        n: Optional[int] = None,
+        weeks: Optional[int] = None,
+        now: Optional[Union[datetime.date, datetime.datetime]] = None,
+    ) -> List[Tuple[str, int]]:
+        """Most frequent topics over a window, as for TopicSketch.top()"""
+        return self.window(weeks, now).top(n)
+
+    def save(
+        self, now: Optional[Union[datetime.date, datetime.datetime]] = None
+    ) -> None:
+        """Write the weeks that changed and delete weeks past the retention
+
+        Args:
+            now: Date the retention counts back from (default: today, UTC)
+        """
+        if self.path is None:
+            raise ValueError("No path given for saving the topic trends")
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc)
+        oldest = _week_start(
+            iso_week(now - datetime.timedelta(weeks=self.retention_weeks - 1))
+        )
+        for period in sorted(self._changed):
+            if _week_start(period) >= oldest:
+                self._weeks[period].save(self._week_path(period))
+        self._changed.clear()
+
+        for week_path in self.path.glob("*-W*.sketch"):
+            try:
+                expired = _week_start(week_path.stem) < oldest
+            except ValueError:
+                continue
+            if expired:
+                week_path.unlink(missing_ok=True)
+                self._weeks.pop(week_path.stem, None)
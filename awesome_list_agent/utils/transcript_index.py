@@ -0,0 +1,276 @@
+"""Term lookup over timestamped transcripts, answering with the moment to jump to"""
+
+import sqlite3
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .search_index import match_all_terms, match_any_term
+from .transcript_segments import TranscriptSegments
+
+# Window rowids are <transcript id> << _SEGMENT_BITS | <first segment index>
+_SEGMENT_BITS = 24
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    video_url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    language TEXT,
+    starts BLOB NOT NULL,
+    ends BLOB NOT NULL,
+    offsets BLOB NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_windows_fts USING fts5 (
+    text, content = '', tokenize = 'porter unicode61'
+);
+-- Holds one cue at a time, to find which cue of a window matched
+CREATE VIRTUAL TABLE IF NOT EXISTS temp.transcript_cue_probe USING fts5 (
+    text, tokenize = 'porter unicode61'
+);
+"""
+
+
+class TranscriptHit(NamedTuple):
+    """Best matching moment of one video; times in seconds"""
+
+    video_url: str
+    title: Optional[str]
+    start: float
+    end: float
+    text: str
+    score: float
+    url: str
+
+
+def _pack(values: "array[int]") -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack(data: bytes) -> "array[int]":
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def timestamped_url(url: str, seconds: float) -> str:
+    """``url`` with a ``t=`` parameter that starts playback at ``seconds``"""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "t"]
+    query.append(("t", f"{int(seconds)}s"))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class TranscriptIndex:
+    """SQLite FTS5 index of caption windows, stored once per video.
+
+    Each video's TranscriptSegments are stored as packed ``uint32`` arrays
+    plus the shared text buffer, so a transcript is read back without
+    downloading or parsing captions again. Every pair of consecutive cues
+    is one row of a contentless FTS5 table, so phrases split across cues
+    still match; a hit's rowid encodes the video and the first cue, which
+    gives the timestamp without storing the text twice.
+
+    The tables do not clash with SearchIndex, so both can share one file.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """Open or create the index
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        try:
+            self.connection.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self.connection.close()
+            raise RuntimeError(f"SQLite FTS5 is required for search: {e}") from e
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "TranscriptIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute(
+            "SELECT COUNT(*) FROM transcripts"
+        ).fetchone()
+        return count
+
+    @staticmethod
+    def _windows(segments: TranscriptSegments) -> Iterator[Tuple[int, str]]:
+        """(first cue, text) of each pair of consecutive cues"""
+        offsets = segments.offsets
+        count = len(segments)
+        for i in range(count):
+            end = offsets[min(i + 2, count)] - 1
+            yield i, segments.text[offsets[i] : end]
+
+    def add(
+        self,
+        video_url: str,
+        segments: TranscriptSegments,
+        title: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> None:
+        """Index the transcript of a video, replacing an earlier one"""
+        if len(segments) >= 1 << _SEGMENT_BITS:
+            raise ValueError(f"Too many segments to index: {len(segments)}")
+        with self.connection:
+            self._remove(video_url)
+            cursor = self.connection.execute(
+                "INSERT INTO transcripts"
+                " (video_url, title, language, starts, ends, offsets, text)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    video_url,
+                    title,
+                    language,
+                    _pack(segments.starts),
+                    _pack(segments.ends),
+                    _pack(segments.offsets),
+                    segments.text,
+                ),
+            )
+            base = cursor.lastrowid << _SEGMENT_BITS
+            self.connection.executemany(
+                "INSERT INTO transcript_windows_fts (rowid, text) VALUES (?, ?)",
+                ((base | i, text) for i, text in self._windows(segments)),
+            )
+
+    def remove(self, video_url: str) -> None:
+        """Drop the transcript of a video, if indexed"""
+        with self.connection:
+            self._remove(video_url)
+
+    def _remove(self, video_url: str) -> None:
+        row = self.connection.execute(
+            "SELECT id FROM transcripts WHERE video_url = ?", (video_url,)
+        ).fetchone()
+        if row is None:
+            return
+        segments = self._load(row[0])
+        base = row[0] << _SEGMENT_BITS
+        # A contentless table forgets a row only when given its original text
+        self.connection.executemany(
+            "INSERT INTO transcript_windows_fts (transcript_windows_fts, rowid, text)"
+            " VALUES ('delete', ?, ?)",
+            ((base | i, text) for i, text in self._windows(segments)),
+        )
+        self.connection.execute("DELETE FROM transcripts WHERE id = ?", (row[0],))
+
+    def _load(self, transcript_id: int) -> TranscriptSegments:
+        starts, ends, offsets, text = self.connection.execute(
+            "SELECT starts, ends, offsets, text FROM transcripts WHERE id = ?",
+            (transcript_id,),
+        ).fetchone()
+        return TranscriptSegments(
+            _unpack(starts), _unpack(ends), _unpack(offsets), text
+        )
+
+    def get(self, video_url: str) -> Optional[TranscriptSegments]:
+        """The indexed transcript of a video, or None"""
+        row = self.connection.execute(
+            "SELECT id FROM transcripts WHERE video_url = ?", (video_url,)
+        ).fetchone()
+        return self._load(row[0]) if row else None
+
+    def _first_matching_cue(
+        self, segments: TranscriptSegments, first: int, last: int, match: str
+    ) -> int:
+        """First cue from ``first`` to ``last`` holding a word of the match
+
+        Cues are checked with the tokenizer of the index, so stemmed forms
+        count as they do in the search; ``last`` is the fallback.
+        """
+        offsets = segments.offsets
+        with self.connection:
+            for cue in range(first, last):
+                self.connection.execute("DELETE FROM transcript_cue_probe")
+                self.connection.execute(
+                    "INSERT INTO transcript_cue_probe (text) VALUES (?)",
+                    (segments.text[offsets[cue] : offsets[cue + 1] - 1],),
+                )
+                found = self.connection.execute(
+                    "SELECT 1 FROM transcript_cue_probe"
+                    " WHERE transcript_cue_probe MATCH ?",
+                    (match,),
+                ).fetchone()
+                if found:
+                    return cue
+        return last
+
+    def search(self, query: str, limit: int = 10) -> List[TranscriptHit]:
+        """Videos whose captions contain every word of ``query`` close together
+
+        Args:
+            query: Words to search for; all must occur (stemmed) within two
+                consecutive cues
+            limit: Maximum number of videos
+
+        Returns:
+            One hit per video at its best matching moment, best BM25 first;
+            the moment starts at the first cue of the window holding a word
+            of ``query``
+        """
+        match = match_all_terms(query)
+        if not match:
+            return []
+
+        best: Dict[int, Tuple[int, float]] = {}
+        rows = self.connection.execute(
+            "SELECT rowid, bm25(transcript_windows_fts) AS rank"
+            " FROM transcript_windows_fts WHERE transcript_windows_fts MATCH ?"
+            " ORDER BY rank",
+            (match,),
+        )
+        for rowid, rank in rows:
+            transcript_id = rowid >> _SEGMENT_BITS
+            if transcript_id not in best:
+                best[transcript_id] = (rowid & ((1 << _SEGMENT_BITS) - 1), rank)
+                if len(best) == limit:
+                    break
+
+        any_term = match_any_term(query)
+        hits = []
+        for transcript_id, (index, rank) in best.items():
+            video_url, title = self.connection.execute(
+                "SELECT video_url, title FROM transcripts WHERE id = ?",
+                (transcript_id,),
+            ).fetchone()
+            segments = self._load(transcript_id)
+            last = min(index + 1, len(segments) - 1)
+            # The window may start with a cue before the matching words
+            cue = self._first_matching_cue(segments, index, last, any_term)
+            start = segments.starts[cue] / 1000
+            hits.append(
+                TranscriptHit(
+                    video_url=video_url,
+                    title=title,
+                    start=start,
+                    end=segments.ends[last] / 1000,
+                    text=segments.text[
+                        segments.offsets[index] : segments.offsets[last + 1] - 1
+                    ],
+                    # bm25() is lower for better matches
+                    score=-rank,
+                    url=timestamped_url(video_url, start),
+                )
+            )
+        return hits
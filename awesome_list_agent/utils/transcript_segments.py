@@ -0,0 +1,349 @@
+"""Timestamped transcript segments parsed from YouTube caption formats"""
+
+import html
+import json
+import re
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+_CUE_TIMING_RE = re.compile(
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})\s*-->\s*"
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})"
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SRV_TEXT_RE = re.compile(
+    r'<text start="([\d.]+)"(?: dur="([\d.]+)")?[^>]*>([^<]*)</text>'
+)
+
+# A caption body, whole or as chunks of text
+CaptionSource = Union[str, Iterable[str]]
+
+
+class TranscriptSegment(NamedTuple):
+    """One caption cue; times in seconds"""
+
+    start: float
+    end: float
+    text: str
+
+
+class TranscriptSegments:
+    """Caption cues of one video in parallel arrays.
+
+    Start and end times are ``uint32`` milliseconds; the cue texts are
+    joined with single spaces into one ``text`` buffer, which is exactly the
+    flattened transcript. ``offsets[i]`` is where cue ``i`` starts in it, and
+    the last offset is one separator past the end of the buffer. A transcript
+    of thousands of cues is three flat arrays and one string rather than
+    thousands of objects.
+    """
+
+    __slots__ = ("starts", "ends", "offsets", "text")
+
+    def __init__(
+        self,
+        starts: "array[int]",
+        ends: "array[int]",
+        offsets: "array[int]",
+        text: str,
+    ):
+        if not (len(starts) == len(ends) == len(offsets) - 1):
+            raise ValueError("Segment arrays have inconsistent lengths")
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+        self.text = text
+
+    @classmethod
+    def from_cues(
+        cls, cues: Iterable[Tuple[float, float, str]]
+    ) -> "TranscriptSegments":
+        """Build from ``(start seconds, end seconds, text)`` cues in order
+
+        Cues whose text is blank are dropped.
+        """
+        starts = array("I")
+        ends = array("I")
+        offsets = array("I")
+        texts: List[str] = []
+        position = 0
+        for start, end, text in cues:
+            text = text.strip()
+            if not text:
+                continue
+            starts.append(round(start * 1000))
+            ends.append(round(max(end, start) * 1000))
+            offsets.append(position)
+            texts.append(text)
+            position += len(text) + 1
+        offsets.append(position)
+        return cls(starts, ends, offsets, " ".join(texts))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> TranscriptSegment:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return TranscriptSegment(
+            self.starts[index] / 1000,
+            self.ends[index] / 1000,
+            self.segment_text(index),
+        )
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        return (self[i] for i in range(len(self)))
+
+    def segment_text(self, index: int) -> str:
+        """Text of one cue, sliced from the shared buffer"""
+        return self.text[self.offsets[index] : self.offsets[index + 1] - 1]
+
+    def segment_at(self, seconds: float) -> int:
+        """Index of the last cue starting at or before ``seconds``, or -1"""
+        return bisect_right(self.starts, round(seconds * 1000)) - 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form"""
+        return {
+            "starts_ms": self.starts.tolist(),
+            "ends_ms": self.ends.tolist(),
+            "offsets": self.offsets.tolist(),
+            "text": self.text,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TranscriptSegments":
+        """Inverse of to_dict()"""
+        return cls(
+            array("I", data["starts_ms"]),
+            array("I", data["ends_ms"]),
+            array("I", data["offsets"]),
+            data["text"],
+        )
+
+
+Cue = Tuple[float, float, str]
+
+# Formats of a track in the order they are chosen; the structured formats
+# carry each line once, while VTT auto-captions repeat it in rolling cues
+PREFERRED_CAPTION_EXTS = ("json3", "srv3", "srv2", "srv1", "vtt")
+
+
+def choose_caption_format(formats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The format of a yt-dlp caption track that parses best
+
+    Args:
+        formats: Non-empty list of format dicts of one track, each with
+            an ``ext``
+
+    Returns:
+        The first format in PREFERRED_CAPTION_EXTS order, else the first one
+    """
+    by_ext = {fmt.get("ext"): fmt for fmt in reversed(formats)}
+    for ext in PREFERRED_CAPTION_EXTS:
+        if ext in by_ext:
+            return by_ext[ext]
+    return formats[0]
+
+
+def _chunks(source: CaptionSource) -> Iterable[str]:
+    return (source,) if isinstance(source, str) else source
+
+
+def _lines(source: CaptionSource) -> Iterator[str]:
+    """Lines of a caption body given whole or in chunks of any size"""
+    if isinstance(source, str):
+        for line in source.split("\n"):
+            yield line.rstrip("\r")
+        return
+    pending = ""
+    for chunk in source:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _timestamp(hours: str, minutes: str, seconds: str, millis: str) -> float:
+    return (
+        int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+    )
+
+
+def _clean_line(line: str) -> str:
+    """Caption line without markup or inline timing tags"""
+    if "<" in line:
+        line = _TAG_RE.sub("", line)
+    if "&" in line:
+        line = html.unescape(line)
+    return line.strip()
+
+
+def _new_lines(lines: List[str], previous: List[str]) -> List[str]:
+    """``lines`` without the leading lines that repeat the end of ``previous``"""
+    if not previous or not lines:
+        return lines
+    for overlap in range(min(len(lines), len(previous)), 0, -1):
+        if lines[:overlap] == previous[-overlap:]:
+            return lines[overlap:]
+    return lines
+
+
+def iter_vtt_cues(source: CaptionSource) -> Iterator[Cue]:
+    """Stream ``(start, end, text)`` cues of WebVTT (or SRT) captions
+
+    Header, NOTE and STYLE blocks and cue identifiers are skipped; markup and
+    inline timing tags are removed and the lines of a cue are joined with
+    spaces. YouTube auto-captions roll: each cue repeats the line before the
+    new one, and a short cue in between repeats it alone. Leading lines that
+    repeat the end of the previous cue are dropped, so every line is kept
+    once, under the cue where it first appears.
+
+    Args:
+        source: The whole caption body, or an iterable of chunks of it such
+            as a text file or HTTP response
+    """
+    timing = None
+    lines: List[str] = []
+    previous: List[str] = []
+    # The trailing blank line ends the last cue
+    for line in chain(_lines(source), ("",)):
+        match = _CUE_TIMING_RE.search(line) if "-->" in line else None
+        # Only an empty line ends a cue; YouTube puts " " lines inside cues
+        if timing is not None and (match or not line):
+            new_lines = _new_lines(lines, previous)
+            previous = lines
+            # Times are only converted for cues that are kept
+            if new_lines:
+                groups = timing.groups()
+                yield (
+                    _timestamp(*groups[:4]),
+                    _timestamp(*groups[4:]),
+                    " ".join(new_lines),
+                )
+            timing = None
+        if match:
+            timing = match
+            lines = []
+        elif timing is not None and line:
+            clean_line = _clean_line(line)
+            if clean_line:
+                lines.append(clean_line)
+
+
+def _srv_cue(element: ET.Element) -> Optional[Cue]:
+    attributes = element.attrib
+    if "start" in attributes:
+        start = float(attributes["start"])
+        end = start + float(attributes.get("dur", 0))
+    elif "t" in attributes:
+        start = int(attributes["t"]) / 1000
+        end = start + int(attributes.get("d", 0)) / 1000
+    else:
+        return None
+    # srv1 escapes entities twice
+    text = " ".join(html.unescape("".join(element.itertext())).split())
+    return start, end, text
+
+
+def iter_srv_cues(source: CaptionSource) -> Iterator[Cue]:
+    """Stream cues of YouTube's XML timedtext formats (srv1, srv2 and srv3)
+
+    Args:
+        source: The whole caption body, or an iterable of chunks of it
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    chunks = iter(_chunks(source))
+    received: List[str] = []
+    yielded = False
+    try:
+        for chunk in chain(chunks, (None,)):
+            if chunk is None:
+                parser.close()
+            else:
+                received.append(chunk)
+                parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag not in ("text", "p"):
+                    continue
+                cue = _srv_cue(element)
+                element.clear()
+                if cue is not None:
+                    yielded = True
+                    yield cue
+    except ET.ParseError:
+        # Malformed XML is matched with a regex, unless cues were already
+        # streamed from it
+        if yielded:
+            return
+        content = "".join(received) + "".join(chunks)
+        for start, duration, text in _SRV_TEXT_RE.findall(content):
+            start = float(start)
+            yield start, start + float(duration or 0), html.unescape(text)
+
+
+def iter_json3_cues(source: CaptionSource) -> Iterator[Cue]:
+    """Cues of YouTube's json3 timedtext format
+
+    JSON has to be read whole before it can be decoded, so ``source`` is
+    joined first.
+    """
+    events = json.loads("".join(_chunks(source))).get("events") or []
+    for event in events:
+        segs = event.get("segs")
+        if not segs or "tStartMs" not in event:
+            continue
+        start = event["tStartMs"] / 1000
+        end = start + event.get("dDurationMs", 0) / 1000
+        yield start, end, " ".join("".join(seg.get("utf8", "") for seg in segs).split())
+
+
+def iter_cues(source: CaptionSource, ext: str) -> Iterator[Cue]:
+    """Stream cues of captions in the format named by a yt-dlp subtitle ``ext``"""
+    if ext == "json3":
+        return iter_json3_cues(source)
+    if ext.startswith("srv") or ext == "xml":
+        return iter_srv_cues(source)
+    return iter_vtt_cues(source)
+
+
+def parse_vtt(source: CaptionSource) -> TranscriptSegments:
+    """Parse WebVTT (or SRT) captions, collapsing rolling auto-captions"""
+    return TranscriptSegments.from_cues(iter_vtt_cues(source))
+
+
+def parse_srv(source: CaptionSource) -> TranscriptSegments:
+    """Parse YouTube's XML timedtext formats (srv1, srv2 and srv3)"""
+    return TranscriptSegments.from_cues(iter_srv_cues(source))
+
+
+def parse_json3(source: CaptionSource) -> TranscriptSegments:
+    """Parse YouTube's json3 timedtext format"""
+    return TranscriptSegments.from_cues(iter_json3_cues(source))
+
+
+def parse_captions(source: CaptionSource, ext: str) -> TranscriptSegments:
+    """Parse captions in the format named by a yt-dlp subtitle ``ext``
+
+    Args:
+        source: The whole caption body, or an iterable of chunks of it
+        ext: Format of the captions
+    """
+    return TranscriptSegments.from_cues(iter_cues(source, ext))
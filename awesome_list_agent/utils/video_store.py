@@ -0,0 +1,423 @@
+"""Columnar store of enriched YouTube videos with vectorized aggregates"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Counts stored as int64; unknown values are MISSING
+COUNT_COLUMNS = ("view_count", "like_count", "comment_count", "duration_seconds")
+STRING_COLUMNS = ("video_id", "url", "title")
+MISSING = -1
+
+# Columns top() can rank by, besides "engagement"
+RANK_COLUMNS = COUNT_COLUMNS + ("upload_date",)
+
+
+def _count(value: Any) -> int:
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return MISSING
+    return value if value >= 0 else MISSING
+
+
+def _date(value: Any) -> "np.datetime64":
+    """YYYYMMDD or ISO upload date as a day, NaT if unknown"""
+    if not value:
+        return np.datetime64("NaT", "D")
+    value = str(value)
+    if len(value) == 8 and value.isdigit():
+        value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    try:
+        return np.datetime64(value[:10], "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+class VideoStore:
+    """Videos of every processed list as NumPy columns.
+
+    View, like and comment counts and durations are ``int64`` columns with
+    MISSING for unknown values, upload dates a ``datetime64[D]`` column, and
+    the video ID, URL and title object columns. Each row also holds an index
+    into the table of list URLs. Aggregates, filters and top-N ranking are
+    array operations over these columns, for one list or all of them.
+
+    Rows are keyed by list and video: adding a list replaces its earlier
+    rows, and a video linked from several lists has a row in each, so every
+    list aggregates all of its videos. Queries across all lists count such a
+    video once, using its most recently added row. The store is saved as an
+    Arrow IPC file, which load() memory-maps so that the count columns are
+    read without copying, or as Parquet when the path ends in ``.parquet``.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Create an empty store
+
+        Args:
+            path: Default file for save()
+        """
+        if np is None:
+            raise ImportError("numpy is required for the video store")
+        self.path = Path(path) if path is not None else None
+        self.list_urls: List[str] = []
+        self._list_ids: Dict[str, int] = {}
+        self._columns: Dict[str, "np.ndarray"] = self._empty_columns()
+        # Rows added since the last consolidation, one dict of arrays per list
+        self._pending: List[Dict[str, "np.ndarray"]] = []
+        # Every add_list() call is a generation; a row is live while it
+        # belongs to the latest generation of its list
+        self._generation = 0
+        self._list_generations: Dict[int, int] = {}
+        # Row mask with the newest row of each video, for all-list queries
+        self._newest: Optional["np.ndarray"] = None
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, "np.ndarray"]:
+        columns = {name: np.empty(0, dtype=np.int64) for name in COUNT_COLUMNS}
+        columns.update({name: np.empty(0, dtype=object) for name in STRING_COLUMNS})
+        columns["upload_date"] = np.empty(0, dtype="datetime64[D]")
+        columns["list_index"] = np.empty(0, dtype=np.int32)
+        columns["generation"] = np.empty(0, dtype=np.int64)
+        return columns
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[Dict[str, Any]]) -> "VideoStore":
+        """Store holding one anonymous list of videos"""
+        store = cls()
+        store.add_list("", videos)
+        return store
+
+    @property
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """Column arrays by name, with every added list merged in"""
+        if self._pending:
+            self._consolidate()
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self.columns["list_index"])
+
+    def _list_id(self, list_url: str) -> int:
+        if list_url not in self._list_ids:
+            self._list_ids[list_url] = len(self.list_urls)
+            self.list_urls.append(list_url)
+        return self._list_ids[list_url]
+
+    def _consolidate(self) -> None:
+        """Merge pending rows and drop those replaced since they were added"""
+        columns = {
+            name: np.concatenate([column] + [chunk[name] for chunk in self._pending])
+            for name, column in self._columns.items()
+        }
+        self._pending = []
+        self._newest = None
+        list_generations = np.array(
+            [self._list_generations.get(i, -1) for i in range(len(self.list_urls))],
+            dtype=np.int64,
+        )
+        live = list_generations[columns["list_index"]] == columns["generation"]
+        if live.all():
+            self._columns = columns
+        else:
+            self._columns = {name: column[live] for name, column in columns.items()}
+
+    def _newest_rows(self) -> "np.ndarray":
+        """Row mask keeping the last added row of each video"""
+        columns = self.columns
+        if self._newest is None:
+            video_ids = columns["video_id"]
+            keys = np.where(video_ids != "", video_ids, columns["url"])
+            # Rows are in insertion order, so the first of the reversed keys
+            # is the newest row of each video
+            _, first = np.unique(keys[::-1], return_index=True)
+            self._newest = np.zeros(len(keys), dtype=bool)
+            self._newest[len(keys) - 1 - first] = True
+        return self._newest
+
+    def add_list(self, list_url: str, videos: Iterable[Dict[str, Any]]) -> int:
+        """Store the videos of a list, replacing its earlier videos
+
+        Rows are only buffered here and merged into the columns on the next
+        read, so adding many lists in a row stays linear in their size.
+
+        Args:
+            list_url: URL of the awesome list
+            videos: Video metadata dicts as returned by YouTubeMetadataTool
+
+        Returns:
+            Number of videos stored for the list
+        """
+        rows = {name: [] for name in (*COUNT_COLUMNS, *STRING_COLUMNS)}
+        dates = []
+        seen = set()
+        for video in videos:
+            if not isinstance(video, dict):
+                continue
+            video_id = video.get("video_id") or video.get("id")
+            url = video.get("webpage_url") or video.get("url") or ""
+            key = video_id or url
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            rows["video_id"].append(video_id or "")
+            rows["url"].append(url)
+            rows["title"].append(video.get("title") or "")
+            for name in COUNT_COLUMNS:
+                rows[name].append(_count(video.get(name)))
+            dates.append(_date(video.get("upload_date")))
+
+        self._generation += 1
+        generation = self._generation
+        list_id = self._list_id(list_url)
+        self._list_generations[list_id] = generation
+
+        added = {name: np.array(rows[name], dtype=np.int64) for name in COUNT_COLUMNS}
+        for name in STRING_COLUMNS:
+            added[name] = np.empty(len(rows[name]), dtype=object)
+            added[name][:] = rows[name]
+        added["upload_date"] = np.array(dates, dtype="datetime64[D]")
+        added["list_index"] = np.full(len(dates), list_id, dtype=np.int32)
+        added["generation"] = np.full(len(dates), generation, dtype=np.int64)
+        self._pending.append(added)
+        return len(dates)
+
+    def mask(
+        self,
+        list_url: Optional[str] = None,
+        min_views: Optional[int] = None,
+        min_duration: Optional[int] = None,
+        max_duration: Optional[int] = None,
+        uploaded_after: Optional[str] = None,
+        uploaded_before: Optional[str] = None,
+    ) -> "np.ndarray":
+        """Boolean row mask of the videos matching every given filter
+
+        Args:
+            list_url: Only videos of this list; without it, each video
+                linked from several lists is selected once
+            min_views: Only videos with at least this many views
+            min_duration: Only videos at least this many seconds long
+            max_duration: Only videos at most this many seconds long
+            uploaded_after: Only videos uploaded on or after this date
+                (YYYYMMDD or ISO)
+            uploaded_before: Only videos uploaded on or before this date
+        """
+        columns = self.columns
+        if list_url is not None:
+            list_id = self._list_ids.get(list_url, -1)
+            selected = columns["list_index"] == list_id
+        else:
+            selected = self._newest_rows().copy()
+        if min_views is not None:
+            selected &= columns["view_count"] >= min_views
+        durations = columns["duration_seconds"]
+        if min_duration is not None:
+            selected &= durations >= min_duration
+        if max_duration is not None:
+            selected &= (durations != MISSING) & (durations <= max_duration)
+        # Comparisons with NaT are False, so unknown dates never match
+        if uploaded_after is not None:
+            selected &= columns["upload_date"] >= _date(uploaded_after)
+        if uploaded_before is not None:
+            selected &= columns["upload_date"] <= _date(uploaded_before)
+        return selected
+
+    def aggregate(self, **filters: Any) -> Dict[str, Any]:
+        """Totals and averages over the videos matching ``filters``
+
+        Args:
+            **filters: Arguments of mask()
+
+        Returns:
+            video_count, total_views, total_likes, total_comments,
+            avg_duration_minutes (over videos with a known duration) and
+            engagement_rate (likes and comments per view)
+        """
+        selected = self.mask(**filters)
+        totals = {}
+        for name in ("view_count", "like_count", "comment_count"):
+            column = self.columns[name][selected]
+            totals[name] = int(column[column != MISSING].sum())
+        durations = self.columns["duration_seconds"][selected]
+        durations = durations[durations != MISSING]
+        views = totals["view_count"]
+        return {
+            "video_count": int(selected.sum()),
+            "total_views": views,
+            "total_likes": totals["like_count"],
+            "total_comments": totals["comment_count"],
+            "avg_duration_minutes": (
+                float(durations.mean()) / 60 if len(durations) else 0.0
+            ),
+            "engagement_rate": (
+                (totals["like_count"] + totals["comment_count"]) / views
+                if views
+                else 0.0
+            ),
+        }
+
+    def view_counts(self) -> Dict[str, int]:
+        """Known view counts by video ID, from the newest row of each video"""
+        ids = self.columns["video_id"]
+        views = self.columns["view_count"]
+        known = self._newest_rows() & (views != MISSING) & (ids != "")
+        return dict(zip(ids[known], views[known].tolist()))
+
+    def engagement(self) -> "np.ndarray":
+        """Likes and comments per view of every row; 0 without views"""
+        views = self.columns["view_count"]
+        reactions = np.maximum(self.columns["like_count"], 0) + np.maximum(
+            self.columns["comment_count"], 0
+        )
+        rates = np.zeros(len(self), dtype=np.float64)
+        np.divide(reactions, views, out=rates, where=views > 0)
+        return rates
+
+    def top(self, n: int = 10, by: str = "engagement", **filters: Any) -> List[Dict]:
+        """The ``n`` highest ranked videos matching ``filters``
+
+        Args:
+            n: Number of videos
+            by: "engagement" or one of RANK_COLUMNS
+            **filters: Arguments of mask()
+
+        Returns:
+            Video dicts, highest first; ties keep insertion order
+        """
+        if by == "engagement":
+            scores = self.engagement()
+        elif by == "upload_date":
+            # Days since the epoch, with unknown dates ranked last
+            dates = self.columns["upload_date"]
+            scores = np.where(np.isnat(dates), -np.inf, dates.astype(np.float64))
+        elif by in COUNT_COLUMNS:
+            scores = self.columns[by]
+        else:
+            raise ValueError(f"Cannot rank videos by {by!r}")
+
+        rows = np.flatnonzero(self.mask(**filters))
+        if n < len(rows):
+            # Partition first so only the top n are sorted
+            rows = rows[np.argpartition(-scores[rows], n - 1, kind="introselect")[:n]]
+        rows = rows[np.lexsort((rows, -scores[rows]))]
+        return [self.row(int(i)) for i in rows]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """One stored video as a dict, with None for unknown values"""
+        video = {name: self.columns[name][index] for name in STRING_COLUMNS}
+        for name in COUNT_COLUMNS:
+            value = int(self.columns[name][index])
+            video[name] = None if value == MISSING else value
+        date = self.columns["upload_date"][index]
+        video["upload_date"] = None if np.isnat(date) else str(date)
+        video["list_url"] = self.list_urls[self.columns["list_index"][index]]
+        return video
+
+    def to_arrow(self) -> "pa.Table":
+        """The store as an Arrow table"""
+        if pa is None:
+            raise ImportError("pyarrow is required to save the video store")
+        arrays = {
+            name: pa.array(self.columns[name], type=pa.string())
+            for name in STRING_COLUMNS
+        }
+        arrays.update({name: pa.array(self.columns[name]) for name in COUNT_COLUMNS})
+        arrays["upload_date"] = pa.array(self.columns["upload_date"])
+        arrays["list_url"] = pa.DictionaryArray.from_arrays(
+            pa.array(self.columns["list_index"]),
+            pa.array(self.list_urls, type=pa.string()),
+        )
+        return pa.table(arrays)
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Write the store atomically, as Parquet if the path ends in .parquet
+
+        Returns:
+            Path written to
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path to save the video store to")
+        table = self.to_arrow()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            if path.suffix == ".parquet":
+                pq.write_table(table, tmp_path)
+            else:
+                with pa.OSFile(tmp_path, "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "VideoStore":
+        """Read a store written by save()
+
+        Arrow files are memory-mapped and their count columns used in place.
+
+        Raises:
+            ValueError: If the file is not a video store
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required to load the video store")
+        path = Path(path)
+        try:
+            if path.suffix == ".parquet":
+                table = pq.read_table(path, memory_map=True)
+            else:
+                table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+            list_urls = table.column("list_url").combine_chunks()
+            columns = {
+                name: table.column(name).combine_chunks().to_numpy(zero_copy_only=True)
+                for name in COUNT_COLUMNS
+            }
+        except (pa.ArrowException, KeyError) as e:
+            raise ValueError(f"Not a video store file: {path}: {e}") from e
+
+        store = cls(path)
+        loaded = store._columns
+        for name in STRING_COLUMNS:
+            values = table.column(name).to_numpy(zero_copy_only=False)
+            loaded[name] = values.astype(object)
+        loaded.update(columns)
+        loaded["upload_date"] = (
+            table.column("upload_date")
+            .to_numpy(zero_copy_only=False)
+            .astype("datetime64[D]")
+        )
+        loaded["list_index"] = list_urls.indices.to_numpy(zero_copy_only=False).astype(
+            np.int32
+        )
+        # Loaded rows are all live, as generation 0
+        loaded["generation"] = np.zeros(len(table), dtype=np.int64)
+        store.list_urls = list_urls.dictionary.to_pylist()
+        store._list_ids = {url: i for i, url in enumerate(store.list_urls)}
+        store._list_generations = dict.fromkeys(range(len(store.list_urls)), 0)
+        return store
+
+    @classmethod
+    def load_or_create(cls, path: Union[str, Path]) -> "VideoStore":
+        """Load the store at ``path``, or start an empty one saving there"""
+        if Path(path).exists():
+            return cls.load(path)
+        return cls(path)
@@ -0,0 +1,107 @@
+"""Thread-safe pool of reusable YoutubeDL instances, kept per option profile"""
+
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator
+
+
+def profile_key(ydl_opts: Dict[str, Any]) -> str:
+    """Key identifying a set of YoutubeDL options; equal options share a key"""
+    return json.dumps(ydl_opts, sort_keys=True, default=repr)
+
+
+class YoutubeDLPool:
+    """Idle YoutubeDL instances grouped by the options they were built with.
+
+    Building a YoutubeDL parses its options, registers every extractor and
+    sets up the request handlers, which costs more than a cached extraction
+    itself. The pool hands each worker its own instance for the options it
+    asks for, reusing an idle one when there is one, so instances are built
+    once per concurrent worker and option profile rather than once per
+    call. An instance is never used by two threads at once.
+    """
+
+    def __init__(self, factory: Callable[[Dict[str, Any]], Any], max_idle: int = 4):
+        """Create an empty pool
+
+        Args:
+            factory: Builds an instance from options, e.g. ``yt_dlp.YoutubeDL``
+            max_idle: Idle instances kept per profile; instances released
+                beyond that are closed
+        """
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle: Dict[str, Deque[Any]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _build(self, ydl_opts: Dict[str, Any]) -> Any:
+        # Each instance gets its own copy, as YoutubeDL keeps its params
+        instance = self.factory(dict(ydl_opts))
+        with self._lock:
+            self.created += 1
+        return instance
+
+    def _take(self, key: str) -> Any:
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _put(self, key: str, instance: Any) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_idle:
+                idle.append(instance)
+                return
+        self._close(instance)
+
+    @staticmethod
+    def _close(instance: Any) -> None:
+        close = getattr(instance, "close", None)
+        if close is not None:
+            close()
+
+    @contextmanager
+    def acquire(self, ydl_opts: Dict[str, Any]) -> Iterator[Any]:
+        """Borrow an instance built with ``ydl_opts`` for the ``with`` block
+
+        An instance whose block raised is closed instead of returned, so a
+        failed extraction never leaves state behind for the next caller.
+        """
+        key = profile_key(ydl_opts)
+        instance = self._take(key)
+        if instance is None:
+            instance = self._build(ydl_opts)
+        try:
+            yield instance
+        except GeneratorExit:
+            # A generator holding the instance was closed early
+            self._put(key, instance)
+            raise
+        except BaseException:
+            self._close(instance)
+            raise
+        self._put(key, instance)
+
+    def warm(self, ydl_opts: Dict[str, Any], count: int = 1) -> None:
+        """Build instances for a profile ahead of the first calls"""
+        key = profile_key(ydl_opts)
+        with self._lock:
+            missing = count - len(self._idle.get(key, ()))
+        for _ in range(max(missing, 0)):
+            self._put(key, self._build(ydl_opts))
+
+    def idle_count(self) -> int:
+        """Number of idle instances over all profiles"""
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def close(self) -> None:
+        """Close every idle instance"""
+        with self._lock:
+            instances = [instance for idle in self._idle.values() for instance in idle]
+            self._idle.clear()
+        for instance in instances:
+            self._close(instance)
@@ -63,6 +63,12 @@ def parse_arguments():
         help="Set agent verbosity level (default: low)"
     )
     
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Overall time budget in seconds; stages that cannot finish in time are skipped (default: no limit)"
+    )
+    
     return parser.parse_args()
 
 async def main():
@@ -110,7 +116,7 @@ async def main():
         logger.info(f"Starting to process URL: {args.url}")
         start_time = datetime.now()
         
-        result = await agent.process_awesome_list(args.url)
+        result = await agent.process_awesome_list(args.url, timeout=args.timeout)
         
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds()
@@ -126,6 +132,8 @@ async def main():
             logger.info(f"Found {parsed_data.get('total_items', 0)} items")
             logger.info(f"Detected language: {parsed_data.get('language', 'N/A')}")
             logger.info(f"Categories: {len(parsed_data.get('categories', []))}")
+            if result.get('partial'):
+                logger.warning(f"Partial result, skipped: {', '.join(result['skipped_stages'])}")
         else:
             logger.error(f"Processing failed: {result.get('error', 'Unknown error')}")
         
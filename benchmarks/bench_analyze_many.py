@@ -0,0 +1,60 @@
+"""Measure ContentAnalysisTool throughput in documents per second.
+
+Compares one execute() call per document with analyze_many(), in-process and
+sharded across worker processes. Run from the repository root::
+
+    python -m benchmarks.bench_analyze_many
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+from benchmarks.bench_content_analysis import make_text
+
+
+def make_corpus(documents: int, words: int) -> list:
+    """Transcript-sized documents with varied vocabulary order."""
+    return [make_text(words, seed=i) for i in range(documents)]
+
+
+async def sequential(texts: list) -> None:
+    tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+    for text in texts:
+        await tool.execute(text)
+
+
+async def batched(texts: list, processes: int = None) -> None:
+    tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+    await tool.analyze_many(texts, processes=processes)
+
+
+def docs_per_second(texts: list, run) -> float:
+    start = time.perf_counter()
+    asyncio.run(run)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    workers = min(4, os.cpu_count() or 1)
+    for documents, words in ((2_000, 300), (500, 3_000)):
+        texts = make_corpus(documents, words)
+        print(f"{documents} documents x {words} words:")
+        print(
+            f"  execute() loop      {docs_per_second(texts, sequential(texts)):8.0f} docs/s"
+        )
+        print(
+            f"  analyze_many()      {docs_per_second(texts, batched(texts)):8.0f} docs/s"
+        )
+        print(
+            f"  analyze_many({workers} procs) "
+            f"{docs_per_second(texts, batched(texts, workers)):8.0f} docs/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Compare caption parsing speed and transcript size on long auto-captioned videos.
+
+The line-by-line VTT reader that ``_download_subtitle_content`` used before
+keeps every repeated line of rolling auto-captions; the streaming parser
+collapses them, and json3 carries each line once to begin with. Run from the
+repository root::
+
+    python -m benchmarks.bench_captions
+"""
+
+import json
+import random
+import re
+import time
+from typing import Callable
+
+from awesome_list_agent.utils.transcript_segments import parse_captions
+from benchmarks.bench_content_analysis import VOCABULARY
+
+LINE_SECONDS = 2.5
+CHUNK_SIZE = 1 << 14
+
+
+def _timestamp(seconds: float) -> str:
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
+
+
+def make_lines(hours: float, seed: int = 0) -> list:
+    """Caption lines of an ``hours`` long video, one per LINE_SECONDS."""
+    rng = random.Random(seed)
+    return [
+        rng.choices(VOCABULARY, k=rng.randint(5, 9))
+        for _ in range(int(hours * 3600 / LINE_SECONDS))
+    ]
+
+
+def rolling_vtt(lines: list) -> str:
+    """Auto-caption VTT as YouTube serves it, with word timing tags."""
+    out = ["WEBVTT", "Kind: captions", "Language: en", ""]
+    previous = ""
+    for i, words in enumerate(lines):
+        start = i * LINE_SECONDS
+        step = LINE_SECONDS / len(words)
+        timed = words[0] + "".join(
+            f"<{_timestamp(start + j * step)}><c> {word}</c>"
+            for j, word in enumerate(words[1:], 1)
+        )
+        out += [
+            f"{_timestamp(start)} --> {_timestamp(start + LINE_SECONDS - 0.01)}"
+            " align:start position:0%",
+            previous or " ",
+            timed,
+            "",
+        ]
+        previous = " ".join(words)
+        end = start + LINE_SECONDS
+        out += [
+            f"{_timestamp(end - 0.01)} --> {_timestamp(end)} align:start position:0%",
+            previous,
+            " ",
+            "",
+        ]
+    return "\n".join(out)
+
+
+def json3(lines: list) -> str:
+    events = [
+        {
+            "tStartMs": int(i * LINE_SECONDS * 1000),
+            "dDurationMs": int(LINE_SECONDS * 1000),
+            "segs": [{"utf8": " ".join(words)}],
+        }
+        for i, words in enumerate(lines)
+    ]
+    return json.dumps({"events": events})
+
+
+def legacy_vtt_text(content: str) -> str:
+    """The previous line-by-line VTT reader."""
+    text_lines = []
+    for line in content.split("\n"):
+        line = line.strip()
+        if (
+            line
+            and not line.startswith("WEBVTT")
+            and not line.startswith("NOTE")
+            and not "-->" in line
+            and not re.match(r"^\d+$", line)
+        ):
+            clean_line = re.sub(r"<[^>]+>", "", line)
+            if clean_line:
+                text_lines.append(clean_line)
+    return " ".join(text_lines)
+
+
+def best_of(run: Callable[[], str], repeat: int = 3) -> tuple:
+    """Return (best seconds, transcript) of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = run()
+        best = min(best, time.perf_counter() - start)
+    return best, text
+
+
+def main() -> None:
+    for hours in (1, 4):
+        lines = make_lines(hours)
+        vtt = rolling_vtt(lines)
+        json_body = json3(lines)
+        chunks = [vtt[i : i + CHUNK_SIZE] for i in range(0, len(vtt), CHUNK_SIZE)]
+        print(f"{hours}h video, {len(lines)} lines, {len(vtt) >> 10} KiB of VTT:")
+        for name, run in (
+            ("legacy VTT", lambda: legacy_vtt_text(vtt)),
+            ("parse_captions VTT", lambda: parse_captions(vtt, "vtt").text),
+            ("  in 16 KiB chunks", lambda: parse_captions(chunks, "vtt").text),
+            ("parse_captions json3", lambda: parse_captions(json_body, "json3").text),
+        ):
+            seconds, text = best_of(run)
+            print(
+                f"  {name:22} {seconds * 1000:8.1f} ms"
+                f"  {len(text):>10,} chars  {len(text.split()):>9,} words"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark ContentAnalysisTool with shared versus per-analyzer tokenization.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_content_analysis
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Callable
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+
+VOCABULARY = (
+    "the a great Python tool is awesome fast easy simple bug broken slow "
+    "learning model data science tutorial video React Google University "
+    "framework library async parser markdown transcript channel playlist"
+).split()
+
+
+def make_text(words: int, seed: int = 0) -> str:
+    """Build a transcript-like document with sentences and paragraphs."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        out.append(rng.choice(VOCABULARY))
+        if i % 17 == 16:
+            out[-1] += rng.choice(".!?")
+        if i % 200 == 199:
+            out[-1] += "\n\n"
+    return " ".join(out)
+
+
+def per_analyzer(tool: ContentAnalysisTool, text: str) -> None:
+    """Run every analyzer with its own tokenization, as before."""
+    tool._calculate_basic_stats(text)
+    tool._analyze_sentiment(text)
+    tool._extract_topics(text, 10)
+    tool._extract_entities(text)
+    tool._extract_keywords(text, 20)
+    tool._calculate_readability(text)
+    tool._analyze_content_structure(text)
+
+
+def shared(tool: ContentAnalysisTool, text: str) -> None:
+    """Run every analyzer through execute(), which tokenizes once."""
+    asyncio.run(tool.execute(text))
+
+
+def best_of(runs: int, fn: Callable[[], None]) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    tool = ContentAnalysisTool()
+    for words in (1_000, 50_000, 300_000):
+        text = make_text(words)
+        before = best_of(3, lambda: per_analyzer(tool, text))
+        after = best_of(3, lambda: shared(tool, text))
+        print(
+            f"{words:>7} words: per-analyzer {before * 1e3:8.1f} ms  "
+            f"shared {after * 1e3:8.1f} ms  speedup {before / after:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare peak memory and time of execute() and analyze_stream() on long text.
+
+The text is generated piece by piece for analyze_stream(), as it would be
+read from a file or a transcript download. Run from the repository root::
+
+    python -m benchmarks.bench_streaming_analysis
+"""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Iterator
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+from benchmarks.bench_content_analysis import make_text
+
+PIECE_WORDS = 2_000
+
+
+def pieces(total_words: int) -> Iterator[str]:
+    """Yield a long transcript-like text in small pieces."""
+    for seed in range(total_words // PIECE_WORDS):
+        yield make_text(PIECE_WORDS, seed=seed) + " "
+
+
+def measure(run: Callable[[], Awaitable[None]]) -> tuple:
+    """Return (seconds, peak MiB) of one run."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1 << 20)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    for total_words in (200_000, 1_000_000):
+        print(f"{total_words} words:")
+
+        async def whole() -> None:
+            tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+            await tool.execute("".join(pieces(total_words)))
+
+        async def streamed() -> None:
+            tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+            await tool.analyze_stream(pieces(total_words), chunk_size=1 << 18)
+
+        for name, run in (("execute()", whole), ("analyze_stream()", streamed)):
+            elapsed, peak = measure(run)
+            print(f"  {name:18} {elapsed:6.2f}s  peak {peak:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Compare memory and serialization cost of full YouTubeData and field projection.
+
+Builds yt-dlp-sized info dicts (dozens of formats, thumbnails and caption
+tracks) and turns each into the tool's metadata dict, once through the full
+YouTubeData model and once through a LISTING_FIELDS VideoRecord. The info
+dicts are dropped afterwards, as they are after extraction. Run from the
+repository root::
+
+    python -m benchmarks.bench_video_projection
+"""
+
+import json
+import logging
+import time
+import tracemalloc
+from typing import Callable
+
+from awesome_list_agent.tools.youtube_metadata_tool import (
+    LISTING_FIELDS,
+    YouTubeDownloader,
+    YouTubeMetadataTool,
+)
+
+VIDEOS = 200
+LANGUAGES = [f"l{i}" for i in range(100)]
+
+
+def make_info(i: int) -> dict:
+    """An info dict shaped like yt-dlp's for a typical video."""
+    video_id = f"video{i:05d}"
+    tracks = [
+        {"ext": ext, "url": f"https://www.youtube.com/api/timedtext?v={video_id}"}
+        for ext in ("json3", "srv1", "srv2", "srv3", "ttml", "vtt")
+    ]
+    return {
+        "id": video_id,
+        "title": f"Conference talk {i}",
+        "description": "Talk description. " * 40,
+        "duration": 1800 + i,
+        "upload_date": "20240101",
+        "channel": "Conference",
+        "channel_id": "UC123",
+        "view_count": 1000 * i,
+        "like_count": 10 * i,
+        "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+        "tags": ["python", "async", "talk"],
+        "categories": ["Education"],
+        "thumbnail": f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
+        "thumbnails": [
+            {"url": f"https://i.ytimg.com/vi/{video_id}/{n}.jpg", "id": str(n)}
+            for n in range(40)
+        ],
+        "formats": [
+            {
+                "format_id": str(n),
+                "url": f"https://rr1---sn.googlevideo.com/videoplayback?id={n}&"
+                + "x" * 600,
+                "ext": "mp4",
+                "vcodec": "avc1.640028",
+                "acodec": "none",
+                "width": 1920,
+                "height": 1080,
+                "fps": 30,
+                "tbr": 2500.0,
+                "http_headers": {"User-Agent": "Mozilla/5.0", "Accept": "*/*"},
+            }
+            for n in range(80)
+        ],
+        "subtitles": {"en": tracks},
+        "automatic_captions": {lang: tracks for lang in LANGUAGES},
+    }
+
+
+def full(downloader: YouTubeDownloader, tool: YouTubeMetadataTool, i: int) -> dict:
+    info = make_info(i)
+    return tool._convert_youtube_data_to_metadata(
+        downloader._process_info(info, info["webpage_url"])
+    )
+
+
+def projected(downloader: YouTubeDownloader, tool: YouTubeMetadataTool, i: int) -> dict:
+    info = make_info(i)
+    return tool._convert_youtube_data_to_metadata(
+        downloader._project_info(info, info["webpage_url"], LISTING_FIELDS)
+    )
+
+
+def measure(convert: Callable) -> tuple:
+    """Return (ms per video, retained KiB per video, JSON KiB per video)."""
+    downloader = YouTubeDownloader()
+    tool = YouTubeMetadataTool()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = [convert(downloader, tool, i) for i in range(VIDEOS)]
+    body = json.dumps(results)
+    elapsed = time.perf_counter() - start
+    del body
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = len(json.dumps(results))
+    return (
+        elapsed * 1000 / VIDEOS,
+        retained / 1024 / VIDEOS,
+        size / 1024 / VIDEOS,
+    )
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{VIDEOS} videos, convert to metadata dicts and serialize to JSON:")
+    for name, convert in (("YouTubeData", full), ("VideoRecord", projected)):
+        ms, retained, json_size = measure(convert)
+        print(
+            f"  {name:12} {ms:7.2f} ms/video  retained {retained:8.1f} KiB/video"
+            f"  JSON {json_size:8.1f} KiB/video"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare aggregating videos as lists of dicts with the columnar VideoStore.
+
+The agent used to sum views and durations by looping over each list's video
+dicts; VideoStore keeps the videos of every list in NumPy columns, so totals,
+filters and top-N rankings over all lists are array operations. Run from the
+repository root::
+
+    python -m benchmarks.bench_video_store
+"""
+
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from awesome_list_agent.utils.video_store import VideoStore
+
+LISTS = 200
+VIDEOS_PER_LIST = 500
+
+
+def make_lists(seed: int = 0) -> dict:
+    """Video dicts of LISTS awesome lists, keyed by list URL."""
+    rng = random.Random(seed)
+    lists = {}
+    for n in range(LISTS):
+        lists[f"https://github.com/org/awesome-{n}"] = [
+            {
+                "video_id": f"v{n:03d}{i:04d}",
+                "title": f"Talk {i}",
+                "view_count": rng.randint(0, 1_000_000),
+                "like_count": rng.randint(0, 10_000),
+                "comment_count": rng.randint(0, 1_000),
+                "duration_seconds": rng.randint(60, 7200),
+                "upload_date": f"20{rng.randint(10, 24)}0{rng.randint(1, 9)}15",
+            }
+            for i in range(VIDEOS_PER_LIST)
+        ]
+    return lists
+
+
+def dict_stats(lists: dict) -> list:
+    """Totals across lists and the top 10 by engagement, looping over dicts."""
+    videos = [video for videos in lists.values() for video in videos]
+    total_views = sum(video.get("view_count", 0) for video in videos)
+    avg_duration = sum(video.get("duration_seconds", 0) for video in videos) / len(
+        videos
+    )
+    top = sorted(
+        videos,
+        key=lambda v: (v["like_count"] + v["comment_count"]) / max(v["view_count"], 1),
+        reverse=True,
+    )[:10]
+    return [total_views, avg_duration, top]
+
+
+def store_stats(store: VideoStore) -> list:
+    return [store.aggregate(), store.top(10)]
+
+
+def ms(run: Callable, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    lists = make_lists()
+    start = time.perf_counter()
+    store = VideoStore()
+    for url, videos in lists.items():
+        store.add_list(url, videos)
+    len(store)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{LISTS} lists x {VIDEOS_PER_LIST} videos:")
+    print(f"  build VideoStore            {build_ms:8.1f} ms")
+    print(f"  dict loops: totals + top 10 {ms(lambda: dict_stats(lists)):8.1f} ms")
+    print(f"  VideoStore: totals + top 10 {ms(lambda: store_stats(store)):8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("videos.arrow", "videos.parquet"):
+            path = store.save(Path(directory) / name)
+            load_ms = ms(lambda: VideoStore.load(path))
+            size = path.stat().st_size >> 10
+            print(f"  load {name:22} {load_ms:8.1f} ms  {size:>7,} KiB")
+
+
+if __name__ == "__main__":
+    main()
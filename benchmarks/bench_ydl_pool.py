@@ -0,0 +1,85 @@
+"""Measure per-call YoutubeDL overhead with and without the instance pool.
+
+Extracts a direct media link from a local HTTP server, so each call costs
+only yt-dlp's own work: a fresh YoutubeDL per call (as before) against
+instances borrowed from a YoutubeDLPool. Run from the repository root::
+
+    python -m benchmarks.bench_ydl_pool
+"""
+
+import functools
+import http.server
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from yt_dlp import YoutubeDL
+
+from awesome_list_agent.utils.ydl_pool import YoutubeDLPool
+
+CALLS = 40
+WORKERS = 4
+YDL_OPTS = {"skip_download": True, "quiet": True, "no_warnings": True}
+
+
+def serve(directory: str) -> http.server.ThreadingHTTPServer:
+    """Serve ``directory`` on a free local port in a background thread."""
+
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fresh(url: str) -> None:
+    with YoutubeDL(dict(YDL_OPTS)) as ydl:
+        ydl.extract_info(url, download=False)
+
+
+def pooled(pool: YoutubeDLPool, url: str) -> None:
+    with pool.acquire(YDL_OPTS) as ydl:
+        ydl.extract_info(url, download=False)
+
+
+def ms_per_call(run, workers: int) -> float:
+    start = time.perf_counter()
+    if workers == 1:
+        for _ in range(CALLS):
+            run()
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(lambda _: run(), range(CALLS)))
+    return (time.perf_counter() - start) * 1000 / CALLS
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        (Path(directory) / "clip.mp4").write_bytes(b"\0" * 4096)
+        server = serve(directory)
+        url = f"http://127.0.0.1:{server.server_port}/clip.mp4"
+        try:
+            print(f"{CALLS} extractions of a local media URL:")
+            for workers in (1, WORKERS):
+                pool = YoutubeDLPool(YoutubeDL, max_idle=workers)
+                results = (
+                    ("new YoutubeDL per call", lambda: fresh(url)),
+                    ("YoutubeDLPool", lambda: pooled(pool, url)),
+                )
+                for name, run in results:
+                    ms = ms_per_call(run, workers)
+                    print(f"  {workers} worker(s)  {name:24} {ms:7.1f} ms/call")
+                print(f"  {workers} worker(s)  pooled instances built: {pool.created}")
+                pool.close()
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark the single-pass YouTube URL matcher against per-pattern scanning.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_youtube_matcher
+"""
+
+import random
+import re
+import timeit
+from typing import List, Set
+
+from src.extract_youtube_urls import extract_youtube_urls_from_markdown
+
+# The per-pattern scan the matcher replaced
+LEGACY_PATTERNS = [
+    r"https?://(?:www\.)?youtube\.com/watch\?v=[\w-]+(?:&[\w=&-]*)?",
+    r"https?://(?:www\.)?youtube\.com/embed/[\w-]+(?:\?[\w=&-]*)?",
+    r"https?://(?:www\.)?youtube\.com/v/[\w-]+(?:\?[\w=&-]*)?",
+    r"https?://youtu\.be/[\w-]+(?:\?[\w=&-]*)?",
+    r"https?://(?:www\.)?youtube\.com/playlist\?list=[\w-]+(?:&[\w=&-]*)?",
+    r"https?://(?:www\.)?youtube\.com/channel/[\w-]+(?:\?[\w=&-]*)?",
+    r"https?://(?:www\.)?youtube\.com/c/[\w-]+(?:\?[\w=&-]*)?",
+    r"https?://(?:www\.)?youtube\.com/@[\w-]+(?:\?[\w=&-]*)?",
+]
+
+
+def legacy_extract(markdown_text: str) -> List[str]:
+    """Scan once per pattern, then re-match every markdown link and image."""
+    urls: Set[str] = set()
+    for pattern in LEGACY_PATTERNS:
+        urls.update(re.findall(pattern, markdown_text, re.IGNORECASE))
+    for link_pattern in (r"\[([^\]]*)\]\(([^)]+)\)", r"!\[([^\]]*)\]\(([^)]+)\)"):
+        for _, url in re.findall(link_pattern, markdown_text):
+            for pattern in LEGACY_PATTERNS:
+                if re.match(pattern, url, re.IGNORECASE):
+                    urls.add(url)
+    return sorted(urls)
+
+
+def make_markdown(lines: int, seed: int = 0) -> str:
+    """Build an awesome-list style document where ~10% of lines link YouTube."""
+    rng = random.Random(seed)
+    youtube_forms = [
+        "https://www.youtube.com/watch?v={id}",
+        "https://youtu.be/{id}",
+        "https://www.youtube.com/embed/{id}",
+        "https://www.youtube.com/playlist?list=PL{id}",
+        "https://www.youtube.com/channel/UC{id}",
+    ]
+    out = ["# Awesome Benchmark", ""]
+    for i in range(lines):
+        if i % 50 == 0:
+            out.append(f"## Section {i // 50}")
+        video_id = "".join(
+            rng.choice("abcdefghijkLMNOP0123456789_-") for _ in range(11)
+        )
+        if rng.random() < 0.1:
+            url = rng.choice(youtube_forms).format(id=video_id)
+        else:
+            url = f"https://github.com/example/project-{i}"
+        out.append(f"- [Project {i}]({url}) - A short description of item {i}.")
+    return "\n".join(out)
+
+
+def main() -> None:
+    for lines in (1_000, 10_000, 50_000):
+        text = make_markdown(lines)
+        assert legacy_extract(text) == extract_youtube_urls_from_markdown(text)
+
+        number = 5
+        legacy = timeit.timeit(lambda: legacy_extract(text), number=number) / number
+        single = (
+            timeit.timeit(
+                lambda: extract_youtube_urls_from_markdown(text), number=number
+            )
+            / number
+        )
+        print(
+            f"{lines:>6} lines ({len(text) / 1e6:.1f} MB): "
+            f"legacy {legacy * 1e3:8.2f} ms  single-pass {single * 1e3:8.2f} ms  "
+            f"speedup {legacy / single:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Canonicalize and deduplicate URLs before they are fetched."""
+
+import re
+from typing import Iterable, List, NamedTuple, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only carry attribution/tracking state and never change
+# the resource that is served. Plain "ref" is not one of them: it selects a
+# branch or tag on GitHub and similar hosts.
+TRACKING_PARAMS: Set[str] = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "ref_src",
+    "ref_url",
+    "spm",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+YOUTUBE_HOSTS: Set[str] = {
+    "youtube.com",
+    "www.youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+    "www.youtube-nocookie.com",
+}
+YOUTUBE_SHORT_HOSTS: Set[str] = {"youtu.be", "www.youtu.be"}
+
+# Path prefixes whose next segment is a video ID
+_VIDEO_PATH_PREFIXES = {"embed", "v", "e", "shorts", "live"}
+_YOUTUBE_ID_RE = re.compile(r"^[\w-]+$")
+
+
+class YouTubeRef(NamedTuple):
+    """A YouTube resource reduced to its identity.
+
+    ``kind`` is one of ``"video"``, ``"playlist"`` or ``"channel"``. Channel IDs
+    keep their addressing form: ``UC...`` channel IDs, ``@handle``, ``c/name``
+    or ``user/name``.
+    """
+
+    kind: str
+    id: str
+
+    @property
+    def canonical_url(self) -> str:
+        """The single URL used to fetch this resource."""
+        if self.kind == "video":
+            return f"https://www.youtube.com/watch?v={self.id}"
+        if self.kind == "playlist":
+            return f"https://www.youtube.com/playlist?list={self.id}"
+        if self.id.startswith("@") or "/" in self.id:
+            return f"https://www.youtube.com/{self.id}"
+        return f"https://www.youtube.com/channel/{self.id}"
+
+
+def _valid_id(value: Optional[str]) -> bool:
+    return bool(value) and bool(_YOUTUBE_ID_RE.match(value))
+
+
+def parse_youtube_url(url: str) -> Optional[YouTubeRef]:
+    """Map any supported YouTube URL form to a video, playlist or channel ID.
+
+    Handles ``youtu.be/ID``, ``watch?v=ID``, ``/embed/ID``, ``/v/ID``,
+    ``/shorts/ID``, ``/live/ID``, ``/playlist?list=ID``, ``/channel/ID``,
+    ``/c/name``, ``/user/name`` and ``/@handle`` on any YouTube host.
+
+    Args:
+        url: Absolute URL to inspect
+
+    Returns:
+        YouTubeRef for the resource, or None if the URL is not a YouTube URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+
+    if parts.scheme.lower() not in ("http", "https"):
+        return None
+
+    host = (parts.hostname or "").lower()
+    segments = [s for s in parts.path.split("/") if s]
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+
+    if host in YOUTUBE_SHORT_HOSTS:
+        if segments and _valid_id(segments[0]):
+            return YouTubeRef("video", segments[0])
+        return None
+
+    if host not in YOUTUBE_HOSTS:
+        return None
+
+    if not segments:
+        return None
+
+    head = segments[0]
+    if head == "watch":
+        if _valid_id(query.get("v")):
+            return YouTubeRef("video", query["v"])
+        return None
+    if head == "playlist":
+        if _valid_id(query.get("list")):
+            return YouTubeRef("playlist", query["list"])
+        return None
+    if head in _VIDEO_PATH_PREFIXES and len(segments) > 1:
+        if head == "embed" and segments[1] == "videoseries":
+            if _valid_id(query.get("list")):
+                return YouTubeRef("playlist", query["list"])
+            return None
+        if _valid_id(segments[1]):
+            return YouTubeRef("video", segments[1])
+        return None
+    if head == "channel" and len(segments) > 1 and _valid_id(segments[1]):
+        return YouTubeRef("channel", segments[1])
+    if head in ("c", "user") and len(segments) > 1 and _valid_id(segments[1]):
+        return YouTubeRef("channel", f"{head}/{segments[1]}")
+    if head.startswith("@") and _valid_id(head[1:]):
+        # Handles are case-insensitive
+        return YouTubeRef("channel", head.lower())
+
+    return None
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
+    """Resolve and normalize a URL so equivalent links compare equal.
+
+    Relative references are resolved against ``base_url``. The scheme and host
+    are lowercased, default ports, fragments and tracking parameters are
+    removed, and the remaining query parameters are sorted. YouTube URLs are
+    collapsed to the canonical URL of the video, playlist or channel they
+    point at.
+
+    Args:
+        url: The URL or href to canonicalize
+        base_url: URL of the page the href was found on
+
+    Returns:
+        The canonical absolute URL, or None for non-HTTP(S) links
+    """
+    if not url:
+        return None
+
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    youtube_ref = parse_youtube_url(url)
+    if youtube_ref:
+        return youtube_ref.canonical_url
+
+    host = parts.hostname.lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def dedupe_urls(urls: Iterable[str], base_url: Optional[str] = None) -> List[str]:
+    """Canonicalize URLs and drop duplicates, keeping first-seen order.
+
+    Args:
+        urls: URLs or hrefs to deduplicate
+        base_url: URL of the page the hrefs were found on
+
+    Returns:
+        List of unique canonical URLs
+    """
+    seen: Set[str] = set()
+    unique: List[str] = []
+    for url in urls:
+        canonical = canonicalize_url(url, base_url)
+        if canonical and canonical not in seen:
+            seen.add(canonical)
+            unique.append(canonical)
+    return unique
+
+
+def dedupe_youtube_urls(urls: Iterable[str]) -> List[str]:
+    """Collapse YouTube URLs to one canonical URL per video, playlist or channel.
+
+    Args:
+        urls: YouTube URLs in any supported form; other URLs are ignored
+
+    Returns:
+        List of unique canonical YouTube URLs in first-seen order
+    """
+    seen: Set[YouTubeRef] = set()
+    unique: List[str] = []
+    for url in urls:
+        ref = parse_youtube_url(url)
+        if ref and ref not in seen:
+            seen.add(ref)
+            unique.append(ref.canonical_url)
+    return unique
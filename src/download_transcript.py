@@ -1,26 +1,244 @@
-import io
-import tempfile
-from typing import Dict, Any, List, Union
+import asyncio
+from typing import AsyncIterator, Dict, Any, List, Optional, Sequence, Union
 from yt_dlp import YoutubeDL
 
+# ffmpeg encoder and streamable container for each audio format
+AUDIO_CODECS = {
+    "mp3": ("libmp3lame", "mp3"),
+    "aac": ("aac", "adts"),
+    "m4a": ("aac", "adts"),
+    "opus": ("libopus", "ogg"),
+    "vorbis": ("libvorbis", "ogg"),
+    "flac": ("flac", "flac"),
+    "wav": ("pcm_s16le", "wav"),
+}
+
+CHUNK_SIZE = 64 * 1024
+# Encoded audio kept per video; an hour of 192 kbps mp3 is about 86 MB
+MAX_AUDIO_BYTES = 256 * 1024 * 1024
+MAX_CONCURRENT_DOWNLOADS = 4
+
+
+class AudioTooLarge(ValueError):
+    """Raised when a video's encoded audio exceeds the per-job memory cap."""
+
+
+def _resolve_audio_stream(url: str) -> Dict[str, Any]:
+    """Look up the best audio stream of a video without downloading it.
+
+    Returns:
+        The yt-dlp info dict; its ``url`` and ``http_headers`` describe the
+        selected audio format.
+    """
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+    }
+    with YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if not info or not info.get("url"):
+        raise ValueError(f"No audio stream found for {url}")
+    return info
+
+
+def ffmpeg_command(
+    stream_url: str,
+    headers: Optional[Dict[str, str]] = None,
+    audio_format: str = "mp3",
+    quality: str = "192",
+    ffmpeg: str = "ffmpeg",
+) -> List[str]:
+    """Build an ffmpeg command that encodes a stream URL's audio to stdout.
+
+    Args:
+        stream_url: Direct media URL, e.g. the ``url`` of a yt-dlp format
+        headers: HTTP headers ffmpeg sends when fetching the stream
+        audio_format: One of AUDIO_CODECS
+        quality: Audio bitrate in kbps
+        ffmpeg: ffmpeg executable
+
+    Returns:
+        Argument list for the ffmpeg process
+    """
+    if audio_format not in AUDIO_CODECS:
+        raise ValueError(f"Unsupported audio format: {audio_format}")
+    codec, container = AUDIO_CODECS[audio_format]
+
+    command = [ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error"]
+    if headers:
+        header_lines = "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        command += ["-headers", header_lines]
+    command += ["-i", stream_url, "-vn", "-acodec", codec]
+    if audio_format not in ("flac", "wav"):
+        command += ["-b:a", f"{quality}k"]
+    command += ["-f", container, "pipe:1"]
+    return command
+
+
+async def stream_process_output(
+    command: Sequence[str],
+    chunk_size: int = CHUNK_SIZE,
+    max_bytes: int = MAX_AUDIO_BYTES,
+) -> AsyncIterator[bytes]:
+    """Yield a process's stdout in chunks as it is produced.
+
+    Only one chunk is held at a time; the process blocks on its pipe until
+    the consumer asks for more. The process is killed if the consumer stops
+    early or the output exceeds ``max_bytes``.
+
+    Raises:
+        AudioTooLarge: If the output exceeds ``max_bytes``
+        RuntimeError: If the process exits with an error
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    # Drain stderr alongside stdout so a chatty process never blocks on it
+    stderr_task = asyncio.ensure_future(process.stderr.read())
+    total = 0
+    try:
+        while chunk := await process.stdout.read(chunk_size):
+            total += len(chunk)
+            if total > max_bytes:
+                raise AudioTooLarge(f"Audio exceeds {max_bytes} bytes")
+            yield chunk
+        stderr = await stderr_task
+        if await process.wait() != 0:
+            message = stderr.decode(errors="replace").strip()
+            raise RuntimeError(
+                f"{command[0]} exited with code {process.returncode}: {message}"
+            )
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stderr_task.cancel()
+
+
+async def stream_youtube_audio(
+    url: str,
+    audio_format: str = "mp3",
+    quality: str = "192",
+    chunk_size: int = CHUNK_SIZE,
+    max_bytes: int = MAX_AUDIO_BYTES,
+    info: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[bytes]:
+    """Yield a YouTube video's audio, encoded by ffmpeg, chunk by chunk.
+
+    Nothing is written to disk: ffmpeg reads the audio stream yt-dlp
+    selected and writes the encoded audio to a pipe.
+
+    Args:
+        url: YouTube URL
+        audio_format: One of AUDIO_CODECS (default: 'mp3')
+        quality: Audio quality in kbps (default: '192')
+        chunk_size: Bytes read from ffmpeg at a time
+        max_bytes: Encoded audio allowed before the job is aborted
+        info: Info dict from an earlier stream lookup, to skip another one
+    """
+    if info is None:
+        info = await asyncio.to_thread(_resolve_audio_stream, url)
+    command = ffmpeg_command(
+        info["url"], info.get("http_headers"), audio_format, quality
+    )
+    async for chunk in stream_process_output(command, chunk_size, max_bytes):
+        yield chunk
+
+
+async def download_youtube_audio_async(
+    urls: Union[str, List[str]],
+    audio_format: str = "mp3",
+    quality: str = "192",
+    max_bytes: int = MAX_AUDIO_BYTES,
+    concurrency: int = MAX_CONCURRENT_DOWNLOADS,
+) -> Dict[str, Any]:
+    """Download YouTube audio into memory, several videos at a time.
+
+    Args:
+        urls: Single URL string or list of YouTube URLs
+        audio_format: One of AUDIO_CODECS (default: 'mp3')
+        quality: Audio quality in kbps (default: '192')
+        max_bytes: Encoded audio kept per video; larger videos fail
+        concurrency: Videos downloaded at once
+
+    Returns:
+        The same dictionary as download_youtube_audio_to_memory()
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def download(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            info = await asyncio.to_thread(_resolve_audio_stream, url)
+            buffer = bytearray()
+            async for chunk in stream_youtube_audio(
+                url, audio_format, quality, max_bytes=max_bytes, info=info
+            ):
+                buffer += chunk
+            title = info.get("title", "Unknown")
+            # Handed over as is; copying it into bytes would double the peak
+            return {
+                "data": buffer,
+                "size": len(buffer),
+                "title": title,
+                "url": info.get("original_url", url),
+                "format": audio_format,
+            }
+
+    results = await asyncio.gather(
+        *(download(url) for url in urls), return_exceptions=True
+    )
+
+    audio_data: Dict[str, Any] = {}
+    errors = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            errors.append(f"{url}: {result}")
+        else:
+            audio_data[result["title"]] = result
+
+    if errors:
+        audio_data["error"] = "Error during processing: " + "; ".join(errors)
+    elif not audio_data:
+        audio_data["error"] = "No audio data was successfully downloaded"
+    return audio_data
+
 
 def download_youtube_audio_to_memory(
     urls: Union[str, List[str]],
     audio_format: str = "mp3",
     quality: str = "192",
+    max_bytes: int = MAX_AUDIO_BYTES,
+    concurrency: int = MAX_CONCURRENT_DOWNLOADS,
 ) -> Dict[str, Any]:
     """Download YouTube audio and keep it in memory.
 
+    Audio is streamed from ffmpeg's stdout rather than encoded to a
+    temporary file and read back; see download_youtube_audio_async().
+    This runs its own event loop, so async code must await
+    download_youtube_audio_async() instead.
+
     Args:
         urls: Single URL string or list of YouTube URLs
         audio_format: Audio format to convert to (default: 'mp3')
         quality: Audio quality (default: '192')
+        max_bytes: Encoded audio kept per video; larger videos fail
+        concurrency: Videos downloaded at once
 
     Returns:
         Dictionary containing audio data for each video:
         {
             'video_title': {
-                'data': bytes,  # Raw audio data
+                'data': bytearray,  # Raw audio data
                 'size': int,    # Size in bytes
                 'title': str,   # Video title
                 'url': str,     # Original URL
@@ -28,81 +246,33 @@ def download_youtube_audio_to_memory(
             },
             'error': str | None  # Error message if any
         }
+
+    Raises:
+        RuntimeError: If called while an event loop is running
     """
-    # Ensure urls is a list
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError(
+            "download_youtube_audio_to_memory() cannot be called from a running "
+            "event loop; await download_youtube_audio_async() instead"
+        )
     if isinstance(urls, str):
         urls = [urls]
+    print(f"Processing {len(urls)} video(s) in memory...")
+    result = asyncio.run(
+        download_youtube_audio_async(
+            urls, audio_format, quality, max_bytes, concurrency
+        )
+    )
 
-    # Store downloaded audio data
-    audio_data = {}
-    error_message = None
-
-    def progress_hook(d):
-        """Hook to capture download progress and data."""
-        nonlocal audio_data
-
-        if d["status"] == "finished":
-            filename = d["filename"]
-            info_dict = d.get("info_dict", {})
-            title = info_dict.get("title", "Unknown")
-            original_url = info_dict.get("original_url", "")
-
-            # Read the file into memory
-            try:
-                with open(filename, "rb") as f:
-                    file_data = f.read()
-                    audio_data[title] = {
-                        "data": file_data,
-                        "size": len(file_data),
-                        "title": title,
-                        "url": original_url,
-                        "format": audio_format,
-                    }
-                print(f"Loaded '{title}' into memory ({len(file_data)} bytes)")
-
-            except Exception as e:
-                print(f"Error loading file to memory: {e}")
-
-    # Use a temporary directory for intermediate files
-    try:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": audio_format,
-                        "preferredquality": quality,
-                    }
-                ],
-                # Use temporary directory
-                "outtmpl": f"{temp_dir}/%(title)s.%(ext)s",
-                "ignoreerrors": True,
-                "progress_hooks": [progress_hook],
-                "quiet": True,  # Reduce output noise
-                "no_warnings": True,
-            }
-
-            with YoutubeDL(ydl_opts) as ydl:
-                print(f"Processing {len(urls)} video(s) in memory...")
-                ydl.download(urls)
-
-                if audio_data:
-                    print(f"\nProcessing completed! Audio data stored in memory:")
-                    for title, data in audio_data.items():
-                        print(f"- {title}: {data['size']} bytes")
-                else:
-                    error_message = "No audio data was successfully downloaded"
-
-    except Exception as e:
-        error_message = f"Error during processing: {e}"
-        print(error_message)
-
-    # Add error to result if present
-    result = dict(audio_data)
-    if error_message:
-        result["error"] = error_message
-
+    if "error" in result:
+        print(result["error"])
+    for title, data in result.items():
+        if title != "error":
+            print(f"- {title}: {data['size']} bytes")
     return result
 
 
@@ -119,7 +289,7 @@ def get_youtube_audio_bytes(
     Returns:
         Dictionary with audio data or error:
         {
-            'data': bytes | None,
+            'data': bytearray | None,
             'title': str | None,
             'size': int | None,
             'error': str | None
@@ -1,7 +1,33 @@
 """Extract YouTube URLs from markdown text."""
 
-import re
-from typing import List, Set
+import mmap
+import os
+from typing import (
+    Any,
+    AnyStr,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from src.canonicalize_urls import YouTubeRef
+from src.markdown_index import MarkdownIndex
+
+from src.youtube_url_matcher import (
+    YouTubeMatch,
+    iter_youtube_matches,
+    match_youtube_url,
+)
+
+# Longest URL kept across a chunk boundary. Text further back than this from
+# the end of a chunk cannot start a match that is still incomplete.
+MAX_URL_LENGTH = 4096
 
 
 def extract_youtube_urls_from_markdown(markdown_text: str) -> List[str]:
@@ -11,6 +37,7 @@ def extract_youtube_urls_from_markdown(markdown_text: str) -> List[str]:
     This function finds YouTube URLs in various formats:
     - Direct links: https://www.youtube.com/watch?v=VIDEO_ID
     - Short links: https://youtu.be/VIDEO_ID
+    - Embed, shorts, playlist and channel URLs
     - Embedded in markdown links: [text](youtube_url)
     - Embedded in markdown images: ![alt](youtube_url)
 
@@ -23,96 +50,259 @@ def extract_youtube_urls_from_markdown(markdown_text: str) -> List[str]:
     if not markdown_text:
         return []
 
-    # YouTube URL patterns
-    youtube_patterns = [
-        # Standard YouTube URLs
-        r'https?://(?:www\.)?youtube\.com/watch\?v=[\w-]+(?:&[\w=&-]*)?',
-        r'https?://(?:www\.)?youtube\.com/embed/[\w-]+(?:\?[\w=&-]*)?',
-        r'https?://(?:www\.)?youtube\.com/v/[\w-]+(?:\?[\w=&-]*)?',
+    # One scan finds bare URLs as well as URLs inside markdown links and images
+    urls: Set[str] = {match.url for match in iter_youtube_matches(markdown_text)}
 
-        # YouTube short URLs
-        r'https?://youtu\.be/[\w-]+(?:\?[\w=&-]*)?',
+    return sorted(list(urls))
 
-        # YouTube playlist URLs
-        r'https?://(?:www\.)?youtube\.com/playlist\?list=[\w-]+(?:&[\w=&-]*)?',
 
-        # YouTube channel URLs
-        r'https?://(?:www\.)?youtube\.com/channel/[\w-]+(?:\?[\w=&-]*)?',
-        r'https?://(?:www\.)?youtube\.com/c/[\w-]+(?:\?[\w=&-]*)?',
-        r'https?://(?:www\.)?youtube\.com/@[\w-]+(?:\?[\w=&-]*)?',
-    ]
+def extract_video_ids_from_urls(urls: List[str]) -> List[str]:
+    """
+    Extract YouTube video IDs from a list of YouTube URLs.
 
-    urls: Set[str] = set()
+    Args:
+        urls: List of YouTube URLs
 
-    # Search for URLs in the text
-    for pattern in youtube_patterns:
-        matches = re.findall(pattern, markdown_text, re.IGNORECASE)
-        urls.update(matches)
+    Returns:
+        List of YouTube video IDs
+    """
+    video_ids = []
 
-    # Also search within markdown link syntax [text](url)
-    markdown_link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-    markdown_links = re.findall(markdown_link_pattern, markdown_text)
+    for url in urls:
+        match = match_youtube_url(url)
+        if match and match.kind == 'video':
+            video_ids.append(match.id)
 
-    for _, url in markdown_links:
-        for pattern in youtube_patterns:
-            if re.match(pattern, url, re.IGNORECASE):
-                urls.add(url)
+    return video_ids
 
-    # Search within markdown image syntax ![alt](url)
-    markdown_image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    markdown_images = re.findall(markdown_image_pattern, markdown_text)
 
-    for _, url in markdown_images:
-        for pattern in youtube_patterns:
-            if re.match(pattern, url, re.IGNORECASE):
-                urls.add(url)
+def get_youtube_urls_with_metadata(
+    markdown_text: str, unique: bool = False, context_lines: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Extract YouTube URLs from markdown together with where they appear.
 
-    return sorted(list(urls))
+    The markdown is indexed once (line starts, headings, inline links), so
+    the line, context, link text and section of each match are binary-search
+    lookups rather than rescans of the document.
 
+    Args:
+        markdown_text: The markdown text to search for YouTube URLs
+        unique: Keep only the first occurrence of each video, playlist or
+            channel
+        context_lines: Extra lines of context to include around each URL
 
-def extract_video_ids_from_urls(urls: List[str]) -> List[str]:
+    Returns:
+        List of records in document order, each with ``url``,
+        ``canonical_url``, ``url_type``, ``resource_id``, ``video_id`` (None
+        for playlists and channels), ``link_text``, ``context``, ``section``,
+        ``section_path``, ``line`` (1-based), ``start`` and ``end``
+    """
+    if not markdown_text:
+        return []
+
+    index = MarkdownIndex(markdown_text)
+    seen: Set[YouTubeRef] = set()
+    records = []
+
+    for match in iter_youtube_matches(markdown_text):
+        if unique:
+            if match.ref in seen:
+                continue
+            seen.add(match.ref)
+
+        section_path = index.section_path(match.start)
+        records.append(
+            {
+                'url': match.url,
+                'canonical_url': match.canonical_url,
+                'url_type': match.kind,
+                'resource_id': match.id,
+                'video_id': match.id if match.kind == 'video' else None,
+                'link_text': index.link_text(match.start, match.end),
+                'context': index.context(match.start, match.end, context_lines),
+                'section': section_path[-1] if section_path else None,
+                'section_path': section_path,
+                'line': index.line_number(match.start) + 1,
+                'start': match.start,
+                'end': match.end,
+            }
+        )
+
+    return records
+
+
+class _ChunkScanner:
+    """Incremental matcher over a sequence of text or byte chunks.
+
+    After each chunk, every match that ends before the end of the buffer is
+    final and is emitted. A match touching the end of the buffer may still
+    grow, so it is carried over to the next chunk together with at most
+    ``max_url_length`` trailing characters that could start a URL.
     """
-    Extract YouTube video IDs from a list of YouTube URLs.
+
+    def __init__(self, max_url_length: int = MAX_URL_LENGTH):
+        self.max_url_length = max_url_length
+        self._buffer: Optional[Union[str, bytes]] = None
+        # Absolute offset of the start of the buffer in the whole stream
+        self._offset = 0
+
+    def feed(self, chunk: AnyStr) -> List[YouTubeMatch]:
+        """Add a chunk and return the matches that are now complete."""
+        buffer = chunk if self._buffer is None else self._buffer + chunk
+        size = len(buffer)
+        carry_start = max(0, size - self.max_url_length)
+        complete = []
+
+        for match in iter_youtube_matches(buffer):
+            if match.end == size:
+                # More data could extend this URL; rescan it with the next chunk
+                carry_start = match.start
+                break
+            complete.append(self._shift(match))
+            carry_start = max(carry_start, match.end)
+
+        self._buffer = buffer[carry_start:]
+        self._offset += carry_start
+        return complete
+
+    def close(self) -> List[YouTubeMatch]:
+        """Flush the matches left in the buffer at the end of the stream."""
+        if not self._buffer:
+            return []
+        complete = [self._shift(match) for match in iter_youtube_matches(self._buffer)]
+        self._offset += len(self._buffer)
+        self._buffer = None
+        return complete
+
+    def _shift(self, match: YouTubeMatch) -> YouTubeMatch:
+        return match._replace(
+            start=match.start + self._offset, end=match.end + self._offset
+        )
+
+
+def iter_youtube_matches_from_chunks(
+    chunks: Iterable[AnyStr], max_url_length: int = MAX_URL_LENGTH
+) -> Iterator[YouTubeMatch]:
+    """
+    Yield YouTube URL matches from a stream of text or byte chunks.
+
+    URLs that straddle chunk boundaries are matched exactly once. Only the
+    current chunk plus a bounded carry-over is held in memory.
 
     Args:
-        urls: List of YouTube URLs
+        chunks: Iterable of ``str`` or ``bytes`` chunks (not mixed)
+        max_url_length: Longest URL that may span a chunk boundary
 
     Returns:
-        List of YouTube video IDs
+        Iterator of matches with offsets into the whole stream
     """
-    video_ids = []
+    scanner = _ChunkScanner(max_url_length)
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+    yield from scanner.close()
 
-    for url in urls:
-        # Extract video ID from various YouTube URL formats
-        video_id = None
-
-        # Standard watch URLs
-        match = re.search(r'[?&]v=([^&]+)', url)
-        if match:
-            video_id = match.group(1)
-
-        # Short URLs
-        elif 'youtu.be/' in url:
-            match = re.search(r'youtu\.be/([^?&]+)', url)
-            if match:
-                video_id = match.group(1)
-
-        # Embed URLs
-        elif '/embed/' in url:
-            match = re.search(r'/embed/([^?&]+)', url)
-            if match:
-                video_id = match.group(1)
-
-        # v/ URLs
-        elif '/v/' in url:
-            match = re.search(r'/v/([^?&]+)', url)
-            if match:
-                video_id = match.group(1)
-
-        if video_id:
-            video_ids.append(video_id)
 
-    return video_ids
+async def aiter_youtube_matches_from_chunks(
+    chunks: AsyncIterable[AnyStr], max_url_length: int = MAX_URL_LENGTH
+) -> AsyncIterator[YouTubeMatch]:
+    """
+    Async variant of iter_youtube_matches_from_chunks.
+
+    Args:
+        chunks: Async iterable of ``str`` or ``bytes`` chunks, such as an
+            aiohttp response's ``content.iter_chunked()``
+        max_url_length: Longest URL that may span a chunk boundary
+
+    Returns:
+        Async iterator of matches with offsets into the whole stream
+    """
+    scanner = _ChunkScanner(max_url_length)
+    async for chunk in chunks:
+        for match in scanner.feed(chunk):
+            yield match
+    for match in scanner.close():
+        yield match
+
+
+def iter_youtube_matches_from_file(
+    path: Union[str, os.PathLike],
+) -> Iterator[YouTubeMatch]:
+    """
+    Yield YouTube URL matches from a file without reading it into memory.
+
+    The file is memory-mapped and scanned as bytes, so the OS pages it in on
+    demand. Offsets are byte offsets into the file.
+
+    Args:
+        path: Path to a markdown (or any text) file
+
+    Returns:
+        Iterator of matches in file order
+    """
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from iter_youtube_matches(data)
+
+
+def stream_youtube_urls(
+    source: Union[str, os.PathLike, bytes, mmap.mmap, Iterable[AnyStr]],
+    unique: bool = True,
+) -> Iterator[str]:
+    """
+    Stream YouTube URLs from a file, a bytes-like buffer or chunks.
+
+    Unlike extract_youtube_urls_from_markdown, URLs are yielded in the order
+    they appear, as soon as they are found.
+
+    Args:
+        source: A file path, a bytes-like buffer (``bytes``, ``mmap``) or an
+            iterable of ``str``/``bytes`` chunks. A plain ``str`` is treated
+            as a path.
+        unique: Yield each URL only the first time it is seen. The set of
+            seen URLs is the only state that grows with the input.
+
+    Returns:
+        Iterator of YouTube URLs
+    """
+    if isinstance(source, (str, os.PathLike)):
+        matches = iter_youtube_matches_from_file(source)
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        matches = iter_youtube_matches(source)
+    else:
+        matches = iter_youtube_matches_from_chunks(source)
+
+    seen: Set[str] = set()
+    for match in matches:
+        if unique:
+            if match.url in seen:
+                continue
+            seen.add(match.url)
+        yield match.url
+
+
+async def astream_youtube_urls(
+    chunks: AsyncIterable[AnyStr], unique: bool = True
+) -> AsyncIterator[str]:
+    """
+    Stream YouTube URLs from an async iterable of chunks.
+
+    Args:
+        chunks: Async iterable of ``str`` or ``bytes`` chunks
+        unique: Yield each URL only the first time it is seen
+
+    Returns:
+        Async iterator of YouTube URLs
+    """
+    seen: Set[str] = set()
+    async for match in aiter_youtube_matches_from_chunks(chunks):
+        if unique:
+            if match.url in seen:
+                continue
+            seen.add(match.url)
+        yield match.url
 
 
 if __name__ == "__main__":
@@ -145,5 +335,6 @@ if __name__ == "__main__":
         print(f"  URL: {item['url']}")
         print(f"  Video ID: {item['video_id']}")
         print(f"  Link Text: {item['link_text']}")
+        print(f"  Section: {item['section']}")
         print(f"  Context: {item['context'][:100]}...")
         print()
@@ -0,0 +1,113 @@
+"""Offset index over a markdown document for O(log n) context lookups."""
+
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+# ATX headings and code fences in one scan, so headings inside fenced code
+# blocks can be skipped.
+_BLOCK_RE = re.compile(
+    r"^[ ]{0,3}(?:(?P<fence>```|~~~).*|(?P<hashes>#{1,6})[ \t]+(?P<title>.*?)[ \t#]*)$",
+    re.MULTILINE,
+)
+# Inline links and images: [text](target) / ![alt](target)
+_LINK_RE = re.compile(r"!?\[(?P<text>[^\]\n]*)\]\((?P<target>[^)\s]+)[^)\n]*\)")
+
+
+class MarkdownIndex:
+    """Sorted offset tables for lines, headings and inline links.
+
+    The index is built with one pass per table. Afterwards the line, enclosing
+    section and link text of any character offset are found by binary search
+    instead of rescanning the document.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+        self.line_starts: List[int] = [0]
+        self.line_starts.extend(m.end() for m in re.finditer("\n", text))
+
+        # Parallel arrays, sorted by offset
+        self.heading_starts: List[int] = []
+        self.heading_levels: List[int] = []
+        self.heading_titles: List[str] = []
+        # Index of the enclosing heading, or -1 for top-level headings
+        self.heading_parents: List[int] = []
+        in_fence = False
+        stack: List[int] = []
+        for match in _BLOCK_RE.finditer(text):
+            if match.group("fence"):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+            level = len(match.group("hashes"))
+            while stack and self.heading_levels[stack[-1]] >= level:
+                stack.pop()
+            self.heading_parents.append(stack[-1] if stack else -1)
+            stack.append(len(self.heading_starts))
+            self.heading_starts.append(match.start())
+            self.heading_levels.append(level)
+            self.heading_titles.append(match.group("title").strip())
+
+        self.link_target_starts: List[int] = []
+        self.link_target_ends: List[int] = []
+        self.link_texts: List[str] = []
+        for match in _LINK_RE.finditer(text):
+            self.link_target_starts.append(match.start("target"))
+            self.link_target_ends.append(match.end("target"))
+            self.link_texts.append(match.group("text").strip())
+
+    def line_number(self, offset: int) -> int:
+        """Return the 0-based line number containing ``offset``."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """Return the start and end offsets of a line, without its newline."""
+        start = self.line_starts[line]
+        if line + 1 < len(self.line_starts):
+            return start, self.line_starts[line + 1] - 1
+        return start, len(self.text)
+
+    def context(self, start: int, end: Optional[int] = None, lines: int = 0) -> str:
+        """Return the line(s) around a span of text.
+
+        Args:
+            start: Start offset of the span
+            end: End offset of the span (defaults to ``start``)
+            lines: Number of extra lines to include before and after
+
+        Returns:
+            The stripped text of the surrounding lines
+        """
+        first = max(0, self.line_number(start) - lines)
+        last = min(
+            len(self.line_starts) - 1,
+            self.line_number(end if end is not None else start) + lines,
+        )
+        return self.text[self.line_span(first)[0] : self.line_span(last)[1]].strip()
+
+    def heading(self, offset: int) -> Optional[Tuple[int, str]]:
+        """Return the level and title of the nearest heading before ``offset``."""
+        i = bisect_right(self.heading_starts, offset) - 1
+        if i < 0:
+            return None
+        return self.heading_levels[i], self.heading_titles[i]
+
+    def section_path(self, offset: int) -> List[str]:
+        """Return the titles of all headings enclosing ``offset``, outermost first."""
+        path: List[str] = []
+        i = bisect_right(self.heading_starts, offset) - 1
+        while i >= 0:
+            path.append(self.heading_titles[i])
+            i = self.heading_parents[i]
+        path.reverse()
+        return path
+
+    def link_text(self, start: int, end: int) -> Optional[str]:
+        """Return the text of the inline link whose target contains the span."""
+        i = bisect_right(self.link_target_starts, start) - 1
+        if i >= 0 and end <= self.link_target_ends[i]:
+            return self.link_texts[i]
+        return None
@@ -10,6 +10,7 @@ from get_youtube import YouTubeData
 DEFAULT_MARKDOWN_URL: str = "https://github.com/josephmisiti/awesome-machine-learning"
 
 from firecrawl.firecrawl import FirecrawlApp
+from src.canonicalize_urls import dedupe_youtube_urls
 from src.extract_youtube_urls import extract_youtube_urls_from_markdown
 
 
@@ -68,7 +69,7 @@ def web(
     markdown: str = firecrawl_markdown(
         url=webhook.link,
     )
-    urls: list[str] = extract_youtube_urls_from_markdown(markdown)
+    urls: list[str] = dedupe_youtube_urls(extract_youtube_urls_from_markdown(markdown))
     print(urls)
     return WebhookOutput(data=urls)
 
@@ -79,6 +80,6 @@ def local() -> None:
     markdown: str = firecrawl_markdown(
         url=DEFAULT_MARKDOWN_URL,
     )
-    urls: list[str] = extract_youtube_urls_from_markdown(markdown)
+    urls: list[str] = dedupe_youtube_urls(extract_youtube_urls_from_markdown(markdown))
     print(urls)
     return WebhookOutput(data=urls)
@@ -0,0 +1,129 @@
+"""Single-pass matcher for YouTube URLs embedded in text."""
+
+import re
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+from src.canonicalize_urls import YouTubeRef, parse_youtube_url
+
+# One alternation covering every supported URL form. Each branch captures the
+# identifying part in its own named group, so the kind of match is known from
+# ``Match.lastgroup`` without re-matching.
+YOUTUBE_URL_PATTERN = r"""
+    https?://
+    (?:
+        (?:(?:www|m|music)\.)?youtube(?:-nocookie)?\.com/
+        (?:
+            watch\?(?:[\w=&-]*&)?v=(?P<watch>[\w-]+)
+          | (?:embed|v|shorts|live)/(?P<path>[\w-]+)
+          | playlist\?(?:[\w=&-]*&)?list=(?P<playlist>[\w-]+)
+          | channel/(?P<channel>[\w-]+)
+          | (?P<named>(?:c|user)/[\w-]+|@[\w-]+)
+        )
+      | youtu\.be/(?P<short>[\w-]+)
+    )
+    (?:[?&][\w=&-]*)?
+"""
+YOUTUBE_URL_FLAGS = re.IGNORECASE | re.VERBOSE | re.ASCII
+
+YOUTUBE_URL_RE = re.compile(YOUTUBE_URL_PATTERN, YOUTUBE_URL_FLAGS)
+# Same pattern for bytes-like input such as memory-mapped files. Matches are
+# pure ASCII, so they decode losslessly.
+YOUTUBE_URL_BYTES_RE = re.compile(
+    YOUTUBE_URL_PATTERN.encode("ascii"), re.IGNORECASE | re.VERBOSE
+)
+
+_GROUP_KINDS = {
+    "watch": "video",
+    "path": "video",
+    "short": "video",
+    "playlist": "playlist",
+    "channel": "channel",
+    "named": "channel",
+}
+
+
+class YouTubeMatch(NamedTuple):
+    """A YouTube URL found in text, with its kind, ID and character offsets."""
+
+    kind: str
+    id: str
+    start: int
+    end: int
+    url: str
+
+    @property
+    def ref(self) -> YouTubeRef:
+        """The video, playlist or channel this URL points at."""
+        return YouTubeRef(self.kind, self.id)
+
+    @property
+    def canonical_url(self) -> str:
+        """The canonical URL of the referenced resource."""
+        return self.ref.canonical_url
+
+
+def _to_match(match: re.Match, offset: int = 0) -> YouTubeMatch:
+    """Build a YouTubeMatch from a match of either compiled pattern."""
+    group = match.lastgroup
+    kind = _GROUP_KINDS[group]
+    resource_id = match.group(group)
+    url = match.group(0)
+    if isinstance(url, bytes):
+        resource_id = resource_id.decode("ascii")
+        url = url.decode("ascii")
+
+    if group == "named" and resource_id.startswith("@"):
+        # Handles are case-insensitive
+        resource_id = resource_id.lower()
+    elif group == "path" and resource_id == "videoseries":
+        # /embed/videoseries?list=ID is a playlist embed
+        ref = parse_youtube_url(url)
+        if ref:
+            kind, resource_id = ref
+
+    return YouTubeMatch(
+        kind, resource_id, match.start() + offset, match.end() + offset, url
+    )
+
+
+def iter_youtube_matches(
+    text: Union[str, bytes], pos: int = 0, endpos: Optional[int] = None
+) -> Iterator[YouTubeMatch]:
+    """Yield every YouTube URL in ``text`` in a single scan.
+
+    URLs inside markdown links ``[text](url)`` and images ``![alt](url)`` are
+    found by the same scan, so no separate link pass is needed. Bytes-like
+    input (``bytes``, ``bytearray``, ``mmap``) is scanned without decoding;
+    offsets are then byte offsets.
+
+    Args:
+        text: Text or bytes-like buffer to scan
+        pos: Offset to start scanning at
+        endpos: Offset to stop scanning at
+
+    Returns:
+        Iterator of typed matches in text order
+    """
+    regex = YOUTUBE_URL_RE if isinstance(text, str) else YOUTUBE_URL_BYTES_RE
+    if endpos is None:
+        endpos = len(text)
+    for match in regex.finditer(text, pos, endpos):
+        yield _to_match(match)
+
+
+def find_youtube_matches(text: str) -> List[YouTubeMatch]:
+    """Return every YouTube URL in ``text`` as a list of typed matches."""
+    return list(iter_youtube_matches(text))
+
+
+def match_youtube_url(url: str) -> Optional[YouTubeMatch]:
+    """Match a YouTube URL at the start of ``url``.
+
+    Args:
+        url: A link target such as an ``href`` value
+
+    Returns:
+        The match, or None if ``url`` does not start with a YouTube URL
+    """
+    match = YOUTUBE_URL_RE.match(url.strip())
+    return _to_match(match) if match else None
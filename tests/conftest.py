@@ -84,6 +84,18 @@ def reset_singletons() -> Generator[None, None, None]:
     pass
 
 
+@pytest.fixture(autouse=True)
+def markdown_cache_dir(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Keep the default markdown cache of each test out of the home directory.
+
+    Returns:
+        The cache directory used by MarkdownCache() during the test.
+    """
+    directory = tmp_path / "markdown_cache"
+    monkeypatch.setenv("MARKDOWN_CACHE_DIR", str(directory))
+    return directory
+
+
 # Test markers configuration
 pytest_plugins = []
 
@@ -106,3 +118,4 @@ def pytest_configure(config: Any) -> None:
     config.addinivalue_line(
         "markers", "asyncio: mark test as async"
     )
+
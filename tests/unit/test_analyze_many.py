@@ -0,0 +1,66 @@
+"""Unit tests for batch content analysis."""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+
+TEXTS = [
+    "",
+    "Python is great! Python is fast and easy. Bad docs though.",
+    "# Awesome Rust\n\n- Tokio by the Rust Foundation\n- https://tokio.rs is a "
+    "comprehensive, reliable async runtime.",
+    "The slow, broken build was frustrating. The tests crash? Terrible.",
+]
+
+
+def _normalize(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop timings and order sentiment word lists for comparison."""
+    normalized = []
+    for result in results:
+        result = dict(result)
+        result.pop("analysis_time_ms")
+        sentiment = dict(result["sentiment"])
+        sentiment["positive_words"] = sorted(sentiment["positive_words"])
+        sentiment["negative_words"] = sorted(sentiment["negative_words"])
+        result["sentiment"] = sentiment
+        normalized.append(result)
+    return normalized
+
+
+class TestAnalyzeMany:
+    """Test cases for ContentAnalysisTool.analyze_many."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    @pytest.mark.parametrize("processes", [None, 2])
+    async def test_matches_sequential_execute(self, processes: Optional[int]) -> None:
+        """Test that batch results equal one execute() call per text."""
+        sequential_tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+        batch_tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+
+        expected = [
+            await sequential_tool.execute(text, update_index=True) for text in TEXTS
+        ]
+        results = await batch_tool.analyze_many(
+            TEXTS, update_index=True, processes=processes
+        )
+
+        assert _normalize(results) == _normalize(expected)
+        assert batch_tool.df_index.num_documents == len(TEXTS)
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_disabled_analyses_are_omitted(self) -> None:
+        """Test that turned-off analyses are left out of the results."""
+        tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+
+        results = await tool.analyze_many(
+            TEXTS[1:2], analyze_sentiment=False, extract_keywords=False
+        )
+
+        assert "sentiment" not in results[0]
+        assert "keywords" not in results[0]
+        assert results[0]["topics"][0]["topic"] == "python"
@@ -0,0 +1,134 @@
+"""Unit tests for URL canonicalization and YouTube deduplication."""
+
+import pytest
+
+from src.canonicalize_urls import (
+    YouTubeRef,
+    canonicalize_url,
+    dedupe_urls,
+    dedupe_youtube_urls,
+    parse_youtube_url,
+)
+
+
+class TestParseYouTubeUrl:
+    """Test cases for mapping YouTube URL forms to IDs."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube.com/watch?v=dQw4w9WgXcQ&t=30",
+            "http://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+            "https://youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ?start=10",
+            "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+            "https://www.youtube.com/v/dQw4w9WgXcQ",
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        ],
+    )
+    def test_video_forms_share_one_id(self, url: str) -> None:
+        """Test that every video URL form maps to the same reference."""
+        assert parse_youtube_url(url) == YouTubeRef("video", "dQw4w9WgXcQ")
+
+    @pytest.mark.unit
+    def test_playlist_and_channels(self) -> None:
+        """Test playlist and channel references."""
+        assert parse_youtube_url(
+            "https://www.youtube.com/playlist?list=PL123&utm_source=x"
+        ) == YouTubeRef("playlist", "PL123")
+        assert parse_youtube_url(
+            "https://www.youtube.com/embed/videoseries?list=PL123"
+        ) == YouTubeRef("playlist", "PL123")
+        assert parse_youtube_url("https://www.youtube.com/channel/UCabc") == YouTubeRef(
+            "channel", "UCabc"
+        )
+        assert parse_youtube_url("https://www.youtube.com/@Fireship") == YouTubeRef(
+            "channel", "@fireship"
+        )
+        assert parse_youtube_url("https://www.youtube.com/c/Name") == YouTubeRef(
+            "channel", "c/Name"
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://example.com/watch?v=dQw4w9WgXcQ",
+            "https://www.youtube.com/invalid",
+            "https://www.youtube.com/watch",
+            "ftp://youtube.com/watch?v=123",
+        ],
+    )
+    def test_non_youtube_urls(self, url: str) -> None:
+        """Test that unrelated or incomplete URLs are rejected."""
+        assert parse_youtube_url(url) is None
+
+
+class TestCanonicalizeUrl:
+    """Test cases for general URL canonicalization."""
+
+    @pytest.mark.unit
+    def test_resolves_relative_hrefs(self) -> None:
+        """Test that relative hrefs resolve against the page URL."""
+        base = "https://github.com/sindresorhus/awesome/blob/main/readme.md"
+
+        assert (
+            canonicalize_url("../docs/guide.md", base)
+            == "https://github.com/sindresorhus/awesome/blob/docs/guide.md"
+        )
+        assert canonicalize_url("#license", base) == base
+
+    @pytest.mark.unit
+    def test_normalizes_and_strips_tracking(self) -> None:
+        """Test host, port, fragment and query normalization."""
+        url = "HTTPS://Example.COM:443/path?b=2&utm_source=x&a=1&fbclid=y#frag"
+
+        assert canonicalize_url(url) == "https://example.com/path?a=1&b=2"
+
+    @pytest.mark.unit
+    def test_keeps_ref_parameter(self) -> None:
+        """Test that ?ref= selects a different resource and is kept."""
+        main = "https://github.com/org/repo/blob/README.md?ref=main"
+        dev = "https://github.com/org/repo/blob/README.md?ref=dev"
+
+        assert canonicalize_url(main) == main
+        assert canonicalize_url(main) != canonicalize_url(dev)
+
+    @pytest.mark.unit
+    def test_rejects_non_http_links(self) -> None:
+        """Test that mailto and javascript links are dropped."""
+        assert canonicalize_url("mailto:me@example.com") is None
+        assert canonicalize_url("javascript:void(0)") is None
+        assert canonicalize_url("/relative/without/base") is None
+
+
+class TestDedupe:
+    """Test cases for order-preserving deduplication."""
+
+    @pytest.mark.unit
+    def test_dedupe_youtube_urls(self) -> None:
+        """Test that duplicate video forms collapse before fetching."""
+        urls = [
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=30",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ",
+            "https://www.youtube.com/playlist?list=PL123",
+            "https://example.com",
+        ]
+
+        assert dedupe_youtube_urls(urls) == [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://www.youtube.com/playlist?list=PL123",
+        ]
+
+    @pytest.mark.unit
+    def test_dedupe_urls(self) -> None:
+        """Test that equivalent links are returned once."""
+        urls = ["/a?utm_medium=x", "https://example.com/a", "/b", "mailto:x@y.z"]
+
+        assert dedupe_urls(urls, base_url="https://example.com/") == [
+            "https://example.com/a",
+            "https://example.com/b",
+        ]
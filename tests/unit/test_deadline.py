@@ -0,0 +1,167 @@
+"""Unit tests for the request deadline shared through context."""
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from awesome_list_agent.tools.awesome_list_parser import AwesomeListParser
+from awesome_list_agent.utils.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline,
+    deadline_expired,
+    time_left,
+    within_deadline,
+)
+from awesome_list_agent.utils.enrichment_queue import EnrichmentScheduler
+from awesome_list_agent.utils.http_client import HTTPClient
+
+
+class TestDeadline:
+    """Test cases for deadline scopes."""
+
+    @pytest.mark.unit
+    def test_no_deadline_by_default(self) -> None:
+        """Test that without a scope there is no limit."""
+        assert current_deadline() is None
+        assert time_left() is None
+        assert not deadline_expired()
+
+    @pytest.mark.unit
+    def test_nested_deadlines_only_shorten(self) -> None:
+        """Test that an inner scope cannot extend the outer deadline."""
+        with deadline(1) as outer:
+            with deadline(60) as inner:
+                assert inner == outer
+            with deadline(0.5) as shorter:
+                assert shorter < outer
+            with deadline(None) as unchanged:
+                assert unchanged == outer
+            assert current_deadline() == outer
+        assert current_deadline() is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tasks_and_threads_see_the_deadline(self) -> None:
+        """Test that the deadline is copied into tasks and worker threads."""
+        with deadline(5) as expected:
+            task = asyncio.ensure_future(asyncio.sleep(0, current_deadline()))
+            assert await task == expected
+            assert await asyncio.to_thread(current_deadline) == expected
+
+
+class TestWithinDeadline:
+    """Test cases for awaiting within the deadline."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancels_at_the_deadline(self) -> None:
+        """Test that a slow awaitable is cancelled when time runs out."""
+        cancelled = []
+
+        async def slow() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        start = time.monotonic()
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await within_deadline(slow())
+            assert deadline_expired()
+        assert time.monotonic() - start < 1
+        assert cancelled == [True]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_own_timeouts_are_not_deadlines(self) -> None:
+        """Test that a timeout raised by the awaitable itself passes through."""
+
+        async def times_out() -> None:
+            raise asyncio.TimeoutError()
+
+        with deadline(10):
+            with pytest.raises(asyncio.TimeoutError) as error:
+                await within_deadline(times_out())
+        assert not isinstance(error.value, DeadlineExceeded)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_scheduler_uses_the_context_deadline(self) -> None:
+        """Test that enrichment stops at the deadline of the context."""
+
+        async def fetch(url: str) -> str:
+            await asyncio.sleep(0.01 if url == "fast" else 10)
+            return url
+
+        with deadline(0.1):
+            run = await EnrichmentScheduler().run(["fast", "slow"], fetch)
+
+        assert run.results == {"fast": "fast"}
+        assert run.skipped == ["slow"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_http_client_refuses_requests_past_the_deadline(self) -> None:
+        """Test that no request is sent once the deadline has passed."""
+        async with HTTPClient() as client:
+            with deadline(0):
+                with pytest.raises(DeadlineExceeded):
+                    await client.get_text("http://127.0.0.1:9/")
+
+
+class TestParserDeadline:
+    """Test cases for the parser degrading when out of time."""
+
+    @pytest.fixture
+    def parser(self, monkeypatch: pytest.MonkeyPatch) -> AwesomeListParser:
+        parser = AwesomeListParser()
+
+        async def parse_basic(url: str) -> Dict[str, Any]:
+            return {"topic": "Python", "categories": []}
+
+        async def scrape(url: str) -> Dict[str, Any]:
+            await asyncio.sleep(10)
+            return {}
+
+        async def youtube(
+            basic: Dict, web: Dict, skipped_stages: List[str]
+        ) -> List[Dict]:
+            return []
+
+        monkeypatch.setattr(parser, "_parse_basic_content", parse_basic)
+        monkeypatch.setattr(parser, "_perform_web_scraping", scrape)
+        monkeypatch.setattr(parser, "_extract_youtube_metadata", youtube)
+        return parser
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slow_stage_is_skipped(self, parser: AwesomeListParser) -> None:
+        """Test that a stage that misses the deadline is skipped and flagged."""
+        start = time.monotonic()
+        with deadline(0.1):
+            result = await parser.execute("https://github.com/org/awesome-python")
+
+        assert time.monotonic() - start < 1
+        assert result["topic"] == "Python"
+        assert result["skipped_stages"] == ["web_scraping"]
+        assert result["web_scraping_data"]["error"] == "Skipped: deadline exceeded"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_no_deadline_skips_nothing(
+        self, parser: AwesomeListParser, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that every stage runs without a deadline."""
+
+        async def scrape(url: str) -> Dict[str, Any]:
+            return {"links": []}
+
+        monkeypatch.setattr(parser, "_perform_web_scraping", scrape)
+        result = await parser.execute("https://github.com/org/awesome-python")
+
+        assert result["skipped_stages"] == []
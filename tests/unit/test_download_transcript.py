@@ -0,0 +1,154 @@
+"""Unit tests for streaming YouTube audio into memory."""
+
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+from src import download_transcript
+from src.download_transcript import (
+    AudioTooLarge,
+    download_youtube_audio_async,
+    download_youtube_audio_to_memory,
+    ffmpeg_command,
+    stream_process_output,
+)
+
+
+def python_command(code: str) -> List[str]:
+    """A child process standing in for ffmpeg."""
+    return [sys.executable, "-c", code]
+
+
+WRITE_AUDIO = "import sys; sys.stdout.buffer.write(b'a' * 300000)"
+
+
+@pytest.fixture
+def fake_streams(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    """Resolve every URL to a stream whose "encoding" is a Python child."""
+    sizes = {"https://youtu.be/short": 1000, "https://youtu.be/long": 300000}
+
+    def resolve(url: str) -> Dict[str, Any]:
+        if url not in sizes:
+            raise ValueError(f"No audio stream found for {url}")
+        return {"url": url, "title": url.rsplit("/", 1)[1], "original_url": url}
+
+    def command(stream_url: str, *args: Any, **kwargs: Any) -> List[str]:
+        size = sizes[stream_url]
+        return python_command(f"import sys; sys.stdout.buffer.write(b'a' * {size})")
+
+    monkeypatch.setattr(download_transcript, "_resolve_audio_stream", resolve)
+    monkeypatch.setattr(download_transcript, "ffmpeg_command", command)
+    return sizes
+
+
+class TestFfmpegCommand:
+    """Test cases for building the ffmpeg command."""
+
+    @pytest.mark.unit
+    def test_encodes_to_stdout_with_headers(self) -> None:
+        """Test that audio is encoded to a pipe with the stream's headers."""
+        command = ffmpeg_command(
+            "https://media.example/audio", {"User-Agent": "test"}, "mp3", "128"
+        )
+
+        assert command[0] == "ffmpeg"
+        assert command[command.index("-headers") + 1] == "User-Agent: test\r\n"
+        assert command[command.index("-i") + 1] == "https://media.example/audio"
+        assert command[command.index("-b:a") + 1] == "128k"
+        assert command[-3:] == ["-f", "mp3", "pipe:1"]
+
+    @pytest.mark.unit
+    def test_lossless_formats_have_no_bitrate(self) -> None:
+        """Test that flac and wav are not given a bitrate."""
+        assert "-b:a" not in ffmpeg_command("https://media.example/a", None, "flac")
+
+    @pytest.mark.unit
+    def test_unknown_format(self) -> None:
+        """Test that an unsupported format raises ValueError."""
+        with pytest.raises(ValueError):
+            ffmpeg_command("https://media.example/a", None, "xyz")
+
+
+class TestStreamProcessOutput:
+    """Test cases for reading a process's stdout in chunks."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_yields_chunks(self) -> None:
+        """Test that output arrives in chunks of at most chunk_size."""
+        chunks = [
+            chunk
+            async for chunk in stream_process_output(
+                python_command(WRITE_AUDIO), chunk_size=65536
+            )
+        ]
+
+        assert sum(map(len, chunks)) == 300000
+        assert len(chunks) > 1
+        assert max(map(len, chunks)) <= 65536
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_memory_cap(self) -> None:
+        """Test that output beyond max_bytes aborts the job."""
+        with pytest.raises(AudioTooLarge):
+            async for _ in stream_process_output(
+                python_command(WRITE_AUDIO), max_bytes=100000
+            ):
+                pass
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_process(self) -> None:
+        """Test that a non-zero exit raises with the process's stderr."""
+        command = python_command("import sys; sys.exit('bad input')")
+        with pytest.raises(RuntimeError, match="bad input"):
+            async for _ in stream_process_output(command):
+                pass
+
+
+class TestDownloadYoutubeAudio:
+    """Test cases for downloading several videos' audio concurrently."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_downloads_every_url(self, fake_streams: Dict[str, Any]) -> None:
+        """Test that each video's audio is kept under its title."""
+        result = await download_youtube_audio_async(list(fake_streams), concurrency=2)
+
+        assert "error" not in result
+        assert result["short"]["size"] == 1000
+        assert result["long"]["data"] == b"a" * 300000
+        assert isinstance(result["long"]["data"], bytearray)
+        assert result["long"]["url"] == "https://youtu.be/long"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_do_not_stop_other_videos(
+        self, fake_streams: Dict[str, Any]
+    ) -> None:
+        """Test that oversized and unknown videos are reported as errors."""
+        result = await download_youtube_audio_async(
+            ["https://youtu.be/short", "https://youtu.be/long", "https://youtu.be/x"],
+            max_bytes=10000,
+        )
+
+        assert result["short"]["size"] == 1000
+        assert "long" not in result
+        assert "https://youtu.be/long" in result["error"]
+        assert "https://youtu.be/x" in result["error"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sync_download_refuses_a_running_loop(self) -> None:
+        """Test that the sync wrapper points async callers to the async version."""
+        with pytest.raises(RuntimeError, match="download_youtube_audio_async"):
+            download_youtube_audio_to_memory("https://youtu.be/short")
+
+    @pytest.mark.unit
+    def test_sync_download(self, fake_streams: Dict[str, Any]) -> None:
+        """Test that the sync wrapper runs its own event loop."""
+        result = download_youtube_audio_to_memory("https://youtu.be/short")
+
+        assert result["short"]["size"] == 1000
@@ -0,0 +1,225 @@
+"""Unit tests for priority-ordered YouTube enrichment scheduling."""
+
+import asyncio
+import time
+from typing import Dict, List
+
+import pytest
+
+from awesome_list_agent.awesome_list_agent import AwesomeListAgent
+from awesome_list_agent.utils.enrichment_queue import (
+    EnrichmentScheduler,
+    collapse_same_link_text,
+    link_text_weight,
+    section_weight,
+)
+
+
+def watch(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+class TestRank:
+    """Test cases for scoring candidates before fetching."""
+
+    @pytest.mark.unit
+    def test_section_and_link_text(self) -> None:
+        """Test that talks with descriptive links rank above misc links."""
+        scheduler = EnrichmentScheduler()
+        candidates = scheduler.rank(
+            [
+                {"url": watch("misc0000001"), "section": "Misc", "text": ""},
+                {
+                    "url": watch("talk0000001"),
+                    "section": "Conference Talks",
+                    "text": "Async Python in depth",
+                },
+                {"url": "https://github.com/org/repo", "section": "Talks"},
+            ],
+            "https://github.com/org/awesome",
+        )
+
+        assert [c.url for c in candidates] == [
+            watch("talk0000001"),
+            watch("misc0000001"),
+        ]
+        assert candidates[0].section == "Conference Talks"
+
+    @pytest.mark.unit
+    def test_url_forms_are_one_candidate(self) -> None:
+        """Test that repeated mentions in any URL form count together."""
+        candidates = EnrichmentScheduler().rank(
+            [
+                {"url": watch("aaaaaaaaaaa")},
+                {"url": watch("bbbbbbbbbbb")},
+                {"url": "https://youtu.be/bbbbbbbbbbb"},
+            ]
+        )
+
+        assert [c.url for c in candidates] == [
+            watch("bbbbbbbbbbb"),
+            watch("aaaaaaaaaaa"),
+        ]
+        assert candidates[0].mentions == 2
+
+    @pytest.mark.unit
+    def test_cross_list_duplicates_and_popularity(self) -> None:
+        """Test that videos seen in other lists or known popular rank first."""
+        scheduler = EnrichmentScheduler(popularity=lambda: {"ppppppppppp": 10**6})
+        scheduler.rank([{"url": watch("sssssssssss")}], "https://github.com/a")
+        candidates = scheduler.rank(
+            [
+                {"url": watch("nnnnnnnnnnn")},
+                {"url": watch("sssssssssss")},
+                {"url": watch("ppppppppppp")},
+            ],
+            "https://github.com/b",
+        )
+
+        assert [c.url for c in candidates] == [
+            watch("ppppppppppp"),
+            watch("sssssssssss"),
+            watch("nnnnnnnnnnn"),
+        ]
+        assert candidates[0].views == 10**6
+        assert candidates[1].other_lists == 1
+
+    @pytest.mark.unit
+    def test_parser_ranks_with_the_agents_popularity(self) -> None:
+        """Test that the parser and the agent rank by the same view counts."""
+        agent = AwesomeListAgent()
+        agent.video_store.add_list("", [{"video_id": "ppppppppppp", "view_count": 9}])
+
+        popularity = agent.parser.enrichment_scheduler.popularity
+        assert popularity() == agent.enrichment_scheduler.popularity()
+        assert popularity() == {"ppppppppppp": 9}
+
+    @pytest.mark.unit
+    def test_weights(self) -> None:
+        """Test the section and link text weights."""
+        assert section_weight("Videos") == 2.0
+        assert section_weight("Other videos") == 1.0
+        assert section_weight(None) == 0.0
+        assert link_text_weight("https://youtu.be/x") == 0.0
+        assert link_text_weight("Intro") == 0.5
+
+    @pytest.mark.unit
+    def test_same_link_text_collapses_before_fetching(self) -> None:
+        """Test that mirrors linked under one descriptive text are dropped."""
+        candidates = EnrichmentScheduler().rank(
+            [
+                {"url": watch("aaaaaaaaaaa"), "text": "Async Python in depth"},
+                {"url": watch("bbbbbbbbbbb"), "text": "Video"},
+                {"url": watch("ccccccccccc"), "text": "async python in depth!"},
+                {"url": watch("ddddddddddd"), "text": "Video"},
+            ]
+        )
+
+        kept, duplicates = collapse_same_link_text(candidates)
+
+        assert [c.url for c in kept] == [
+            watch("aaaaaaaaaaa"),
+            watch("bbbbbbbbbbb"),
+            watch("ddddddddddd"),
+        ]
+        assert duplicates == {watch("aaaaaaaaaaa"): [watch("ccccccccccc")]}
+
+
+class TestRun:
+    """Test cases for fetching candidates in priority order."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetches_in_priority_order(self) -> None:
+        """Test that fetches start best first and respect the limit."""
+        started: List[str] = []
+
+        async def fetch(url: str) -> Dict[str, str]:
+            started.append(url)
+            await asyncio.sleep(0)
+            return {"url": url}
+
+        scheduler = EnrichmentScheduler(concurrency=2)
+        run = await scheduler.run(["a", "b", "c", "d"], fetch, limit=3)
+
+        assert started == ["a", "b", "c"]
+        assert list(run.results) == ["a", "b", "c"]
+        assert run.skipped == ["d"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deadline_preempts_and_skips(self) -> None:
+        """Test that slow fetches are cancelled and the rest skipped."""
+        cancelled: List[str] = []
+
+        async def fetch(url: str) -> str:
+            try:
+                await asyncio.sleep(0.01 if url == "fast" else 10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return url
+
+        scheduler = EnrichmentScheduler(concurrency=2)
+        start = time.monotonic()
+        run = await scheduler.run(["fast", "slow", "late"], fetch, deadline=start + 0.2)
+
+        assert time.monotonic() - start < 1
+        assert run.results == {"fast": "fast"}
+        assert sorted(cancelled) == ["late", "slow"]
+        assert run.skipped == ["slow", "late"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_no_fetch_started_without_time_for_it(self) -> None:
+        """Test that fetches are not started when a typical one cannot finish."""
+        fetched: List[str] = []
+
+        async def fetch(url: str) -> str:
+            fetched.append(url)
+            return url
+
+        scheduler = EnrichmentScheduler()
+        scheduler.fetch_seconds = 5.0
+        run = await scheduler.run(["a", "b"], fetch, deadline=time.monotonic() + 1)
+
+        assert fetched == []
+        assert run.skipped == ["a", "b"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_errors_fail_only_their_url(self) -> None:
+        """Test that an exception from fetch fails its URL and the rest go on."""
+
+        async def fetch(url: str) -> str:
+            if url == "bad":
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01)
+            return url
+
+        run = await EnrichmentScheduler(concurrency=2).run(
+            ["slow", "bad", "next"], fetch
+        )
+
+        assert run.results == {"slow": "slow", "next": "next"}
+        assert run.skipped == []
+        assert list(run.failed) == ["bad"]
+        assert isinstance(run.failed["bad"], RuntimeError)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_timeouts_are_failures_not_the_deadline(self) -> None:
+        """Test that a fetch timing out early does not stop its worker."""
+
+        async def fetch(url: str) -> str:
+            if url == "timeout":
+                raise asyncio.TimeoutError()
+            return url
+
+        run = await EnrichmentScheduler(concurrency=1).run(
+            ["timeout", "a", "b"], fetch, deadline=time.monotonic() + 10
+        )
+
+        assert run.results == {"a": "a", "b": "b"}
+        assert run.skipped == []
+        assert list(run.failed) == ["timeout"]
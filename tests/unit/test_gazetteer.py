@@ -0,0 +1,114 @@
+"""Unit tests for the Aho-Corasick gazetteer."""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.gazetteer import Gazetteer
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+
+LEXICONS = {
+    "technology": ["Python", "machine learning", "deep learning models"],
+    "model": ["learning models"],
+    "person": ["Guido van Rossum"],
+}
+
+
+def _tokens(text: str) -> list:
+    return re.findall(r"\b\w+\b", text.lower())
+
+
+class TestGazetteer:
+    """Test cases for Gazetteer."""
+
+    @pytest.mark.unit
+    def test_matches_overlapping_multi_word_terms_with_offsets(self) -> None:
+        """Test that every occurrence is reported with its character span."""
+        gazetteer = Gazetteer.from_lexicons(LEXICONS)
+        text = "Deep learning models, by Guido van Rossum? No: machine learning."
+
+        matches = [
+            (m.term, m.label, text[m.start : m.end])
+            for m in gazetteer.iter_matches(text)
+        ]
+
+        assert matches == [
+            ("deep learning models", "technology", "Deep learning models"),
+            ("learning models", "model", "learning models"),
+            ("Guido van Rossum", "person", "Guido van Rossum"),
+            ("machine learning", "technology", "machine learning"),
+        ]
+
+    @pytest.mark.unit
+    def test_counts_single_and_multi_word_terms(self) -> None:
+        """Test that counts cover single-token terms and phrases."""
+        gazetteer = Gazetteer.from_lexicons(LEXICONS)
+        tokens = _tokens("Python, python and machine machine learning in Python")
+
+        counts = {
+            gazetteer.terms[term_id]: n
+            for term_id, n in gazetteer.count(tokens).items()
+        }
+
+        assert counts == {"Python": 3, "machine learning": 1}
+
+    @pytest.mark.unit
+    def test_count_phrases_across_boundary(self) -> None:
+        """Test that only phrases spanning the boundary are counted."""
+        gazetteer = Gazetteer.from_lexicons(LEXICONS)
+        tokens = _tokens("machine learning guido van rossum")
+
+        counts = gazetteer.count_phrases(tokens, boundary=3)
+
+        assert [gazetteer.terms[term_id] for term_id in counts] == ["Guido van Rossum"]
+
+    @pytest.mark.unit
+    def test_load_lexicons_rejects_malformed_file(self, tmp_path: Path) -> None:
+        """Test that a gazetteer file must map labels to lists of terms."""
+        path = tmp_path / "gazetteer.json"
+        path.write_text(json.dumps({"technology": "Python"}))
+
+        with pytest.raises(ValueError):
+            Gazetteer.load_lexicons(path)
+
+
+class TestGazetteerEntities:
+    """Test cases for gazetteer entities in ContentAnalysisTool."""
+
+    @pytest.mark.unit
+    def test_known_terms_are_typed_entities(self) -> None:
+        """Test that configured terms are reported with their entity type."""
+        tool = ContentAnalysisTool(
+            df_index=DocumentFrequencyIndex(), entity_terms=LEXICONS
+        )
+
+        entities = tool._extract_entities(
+            "Guido van Rossum wrote Python. Python is used for machine learning."
+        )
+
+        assert entities[:3] == [
+            {"entity": "Python", "type": "technology", "frequency": 2},
+            {"entity": "machine learning", "type": "technology", "frequency": 1},
+            {"entity": "Guido van Rossum", "type": "person", "frequency": 1},
+        ]
+        proper_nouns = [e["entity"] for e in entities if e["type"] == "proper_noun"]
+        assert "Guido" not in proper_nouns
+        assert "Python" not in proper_nouns
+
+    @pytest.mark.unit
+    def test_ambiguous_terms_are_case_sensitive(self) -> None:
+        """Test that common words like "rust" only count when capitalized."""
+        tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+
+        entities = tool._extract_entities(
+            "Scrub the rust off the flask and react. Rust, Java and Flask are tools."
+        )
+
+        technologies = {
+            e["entity"]: e["frequency"] for e in entities if e["type"] == "technology"
+        }
+        assert technologies == {"Rust": 1, "Java": 1, "Flask": 1}
+        assert "React" not in technologies
@@ -0,0 +1,155 @@
+"""Unit tests for the markdown cache and cached Firecrawl scraping."""
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from awesome_list_agent.tools.markdown_youtube_extractor_tool import (
+    MarkdownYouTubeExtractorTool,
+)
+from awesome_list_agent.utils.markdown_cache import MarkdownCache
+
+MARKDOWN = "# List\n- [Talk](https://youtu.be/dQw4w9WgXcQ)\n"
+
+
+class TestMarkdownCache:
+    """Test cases for TTL and content-hash handling."""
+
+    @pytest.mark.unit
+    def test_round_trip_and_shared_blobs(self, tmp_path: Path) -> None:
+        """Test that identical markdown from two URLs is stored once."""
+        cache = MarkdownCache(tmp_path)
+
+        first = cache.set("https://a.example/list", MARKDOWN)
+        second = cache.set("https://b.example/list", MARKDOWN)
+
+        assert first == second
+        assert cache.get("https://a.example/list") == MARKDOWN
+        assert len(list((tmp_path / "blobs").iterdir())) == 1
+        assert cache.get("https://c.example/list") is None
+
+    @pytest.mark.unit
+    def test_expired_and_corrupted_entries(self, tmp_path: Path) -> None:
+        """Test that stale or tampered entries are treated as misses."""
+        url = "https://a.example/list"
+        content_hash = MarkdownCache(tmp_path).set(url, MARKDOWN)
+
+        assert MarkdownCache(tmp_path, ttl_seconds=-1).get(url) is None
+
+        (tmp_path / "blobs" / f"{content_hash}.md").write_text("truncated")
+        assert MarkdownCache(tmp_path).get(url) is None
+
+    @pytest.mark.unit
+    def test_prune_removes_stale_entries_and_orphan_blobs(self, tmp_path: Path) -> None:
+        """Test that pruning keeps only fresh entries and the blobs they use."""
+        cache = MarkdownCache(tmp_path)
+        cache.set("https://a.example/list", MARKDOWN)
+        cache.set("https://b.example/list", "# Other\n")
+        cache.invalidate("https://b.example/list")
+
+        assert cache.prune() == 1
+        assert cache.get("https://a.example/list") == MARKDOWN
+        assert len(list((tmp_path / "blobs").iterdir())) == 1
+
+        assert MarkdownCache(tmp_path, ttl_seconds=-1).prune() == 2
+        assert list((tmp_path / "entries").iterdir()) == []
+
+
+class TestCachedScraping:
+    """Test cases for scraping through a stand-in scraper."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_scrapes_once_per_url(self, tmp_path: Path) -> None:
+        """Test that concurrent and repeated calls share one scrape."""
+        calls: List[str] = []
+
+        async def scraper(url: str) -> str:
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return MARKDOWN
+
+        tool = MarkdownYouTubeExtractorTool(
+            scraper=scraper, cache=MarkdownCache(tmp_path)
+        )
+        url = "https://github.com/example/awesome"
+
+        results = await asyncio.gather(tool.execute(url=url), tool.execute(url=url))
+        again = await tool.execute(url=url)
+
+        assert calls == [url]
+        assert results[0]["youtube_urls"] == [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        ]
+        assert again["youtube_urls"] == results[0]["youtube_urls"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_sync_scraper_runs_off_loop(self, tmp_path: Path) -> None:
+        """Test that a blocking scraper is run in a worker thread."""
+        loop_thread: List[bool] = []
+
+        def scraper(url: str) -> str:
+            try:
+                asyncio.get_running_loop()
+                loop_thread.append(True)
+            except RuntimeError:
+                loop_thread.append(False)
+            return MARKDOWN
+
+        tool = MarkdownYouTubeExtractorTool(
+            scraper=scraper, cache=MarkdownCache(tmp_path)
+        )
+
+        result = await tool.execute(url="https://example.com/list", use_cache=False)
+
+        assert result["url_count"] == 1
+        assert loop_thread == [False]
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_cache_write_errors_do_not_fail_the_scrape(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a scrape succeeds when its result cannot be cached."""
+        cache = MarkdownCache(tmp_path)
+
+        def fail(url: str, markdown: str) -> str:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(cache, "set", fail)
+        tool = MarkdownYouTubeExtractorTool(scraper=lambda url: MARKDOWN, cache=cache)
+
+        result = await tool.execute(url="https://example.com/list")
+
+        assert result["url_count"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_cancelled_caller_leaves_shared_scrape_running(
+        self, tmp_path: Path
+    ) -> None:
+        """Test that cancelling the first caller does not fail the others."""
+        release = asyncio.Event()
+
+        async def scraper(url: str) -> str:
+            await release.wait()
+            return MARKDOWN
+
+        tool = MarkdownYouTubeExtractorTool(
+            scraper=scraper, cache=MarkdownCache(tmp_path)
+        )
+        url = "https://example.com/list"
+        first = asyncio.ensure_future(tool._scrape_markdown_content(url))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(tool._scrape_markdown_content(url))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == MARKDOWN
+        assert first.cancelled()
+        assert tool._inflight == {}
@@ -0,0 +1,167 @@
+"""Unit tests for MinHash near-duplicate detection."""
+
+import pytest
+
+from awesome_list_agent.awesome_list_agent import AwesomeListAgent
+from awesome_list_agent.utils import near_duplicates
+from awesome_list_agent.utils.near_duplicates import (
+    LSHIndex,
+    MinHasher,
+    NearDuplicateIndex,
+    estimate_jaccard,
+    word_jaccard,
+)
+
+TALK = (
+    "PyCon 2023 keynote: the future of Python packaging. In this talk we walk "
+    "through wheels, build backends, lock files and what changes for library "
+    "authors over the next few releases."
+)
+REUPLOAD = TALK + " Re-uploaded with permission."
+OTHER = (
+    "Rust for Pythonistas: ownership, borrowing and lifetimes explained with "
+    "small examples, plus how to call Rust from Python with PyO3."
+)
+
+
+class TestMinHasher:
+    """Test cases for MinHasher."""
+
+    @pytest.mark.unit
+    def test_signature_estimates_similarity(self) -> None:
+        """Test that similar texts agree on most signature positions."""
+        hasher = MinHasher()
+
+        talk = hasher.signature(TALK)
+        assert estimate_jaccard(talk, hasher.signature(REUPLOAD)) > 0.7
+        assert estimate_jaccard(talk, hasher.signature(OTHER)) < 0.2
+        assert hasher.signature("   ") is None
+
+    @pytest.mark.unit
+    def test_pure_python_signature_matches_numpy(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the fallback computes the same signature as numpy."""
+        if near_duplicates.np is None:
+            pytest.skip("numpy is not installed")
+        hasher = MinHasher()
+        expected = hasher.signature(TALK)
+
+        monkeypatch.setattr(near_duplicates, "np", None)
+
+        assert hasher.signature(TALK) == expected
+
+
+class TestLSHIndex:
+    """Test cases for LSHIndex."""
+
+    @pytest.mark.unit
+    def test_candidates_share_a_band(self) -> None:
+        """Test that only keys with a matching band are candidates."""
+        hasher = MinHasher()
+        lsh = LSHIndex()
+        lsh.insert("talk", hasher.signature(TALK))
+        lsh.insert("other", hasher.signature(OTHER))
+
+        assert lsh.candidates(hasher.signature(REUPLOAD)) == ["talk"]
+
+    @pytest.mark.unit
+    def test_bands_must_divide_signature(self) -> None:
+        """Test that uneven bands are rejected."""
+        with pytest.raises(ValueError):
+            LSHIndex(num_perm=128, bands=30)
+
+
+class TestNearDuplicateIndex:
+    """Test cases for NearDuplicateIndex."""
+
+    @pytest.mark.unit
+    def test_groups_duplicates_under_first_text(self) -> None:
+        """Test that re-uploads join the group of the first copy."""
+        index = NearDuplicateIndex()
+
+        assert index.add("a", TALK) is None
+        assert index.add("b", OTHER) is None
+        assert index.add("c", REUPLOAD) == "a"
+        assert index.add("d", TALK) == "a"
+        assert index.groups() == {"a": ["c", "d"]}
+        assert index.find(REUPLOAD)[0] in ("a", "c", "d")
+
+    @pytest.mark.unit
+    def test_rejected_candidates_are_not_duplicates(self) -> None:
+        """Test that accept() can veto a similar text."""
+        index = NearDuplicateIndex()
+
+        index.add("a", TALK)
+        assert index.add("b", REUPLOAD, accept=lambda key: key != "a") is None
+        assert index.add("c", TALK) == "a"
+        assert word_jaccard("Python packaging", "python PACKAGING today") == 2 / 3
+
+    @pytest.mark.unit
+    def test_short_texts_are_never_duplicates(self) -> None:
+        """Test that texts below min_shingles are not compared."""
+        index = NearDuplicateIndex()
+
+        assert index.add("a", "Keynote") is None
+        assert index.add("b", "Keynote") is None
+        assert len(index) == 0
+
+
+class TestCollapseNearDuplicateVideos:
+    """Test cases for AwesomeListAgent._collapse_near_duplicate_videos."""
+
+    @pytest.mark.unit
+    def test_collapses_reuploads(self) -> None:
+        """Test that a re-upload is dropped and reported under the original."""
+        agent = AwesomeListAgent()
+        videos = [
+            {
+                "webpage_url": "https://www.youtube.com/watch?v=a",
+                "title": "The future of Python packaging",
+                "description": TALK,
+            },
+            {
+                "webpage_url": "https://www.youtube.com/watch?v=b",
+                "title": "Rust for Pythonistas",
+                "description": OTHER,
+            },
+            {
+                "webpage_url": "https://www.youtube.com/watch?v=c",
+                "title": "The Future of Python Packaging (PyCon 2023)",
+                "description": "",
+                "transcript": REUPLOAD,
+            },
+        ]
+
+        kept, duplicates = agent._collapse_near_duplicate_videos(videos)
+
+        assert kept == videos[:2]
+        assert duplicates == {
+            "https://www.youtube.com/watch?v=a": ["https://www.youtube.com/watch?v=c"]
+        }
+
+    @pytest.mark.unit
+    def test_shared_channel_description_is_not_a_duplicate(self) -> None:
+        """Test that two talks of one channel with one long description differ."""
+        agent = AwesomeListAgent()
+        channel = "\n".join([TALK, OTHER])
+        formats = {"auto_en": "Available caption formats: ['srv3', 'vtt']"}
+        videos = [
+            {
+                "webpage_url": "https://www.youtube.com/watch?v=a",
+                "title": "Packaging keynote",
+                "description": channel,
+                "subtitle_content": formats,
+            },
+            {
+                "webpage_url": "https://www.youtube.com/watch?v=b",
+                "title": "Typing in practice",
+                "description": channel,
+                "subtitle_content": formats,
+            },
+        ]
+
+        kept, duplicates = agent._collapse_near_duplicate_videos(videos)
+
+        assert kept == videos
+        assert duplicates == {}
@@ -0,0 +1,65 @@
+"""Unit tests for the readability engine."""
+
+import pytest
+
+from awesome_list_agent.utils.readability import (
+    METRIC_NAMES,
+    count_word_syllables,
+    readability_counts,
+    readability_metrics,
+    readability_metrics_many,
+)
+from awesome_list_agent.utils.text_tokens import tokenize_text
+
+
+class TestSyllables:
+    """Test cases for per-word syllable counting."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "word,expected",
+        [("cat", 1), ("python", 2), ("documentation", 5), ("the", 1), ("123", 1)],
+    )
+    def test_count_word_syllables(self, word: str, expected: int) -> None:
+        """Test the vowel-group heuristic on single words."""
+        assert count_word_syllables(word) == expected
+
+
+class TestReadability:
+    """Test cases for readability counters and metrics."""
+
+    @pytest.mark.unit
+    def test_counts(self) -> None:
+        """Test that counters are collected per word occurrence."""
+        counts = readability_counts(
+            tokenize_text("Documentation documentation code. Simple code!")
+        )
+
+        assert counts.sentences == 2
+        assert counts.words == 5
+        assert counts.syllables == 5 + 5 + 1 + 1 + 1
+        assert counts.complex_words == 2
+        assert counts.letters == len("DocumentationdocumentationcodeSimplecode")
+
+    @pytest.mark.unit
+    def test_empty_text_scores_zero(self) -> None:
+        """Test that text without words scores zero on every metric."""
+        metrics = readability_metrics(readability_counts(tokenize_text("...")))
+
+        assert metrics == {name: 0 for name in METRIC_NAMES}
+
+    @pytest.mark.unit
+    def test_vectorized_matches_scalar(self) -> None:
+        """Test that batch metrics equal per-document metrics."""
+        texts = [
+            "",
+            "Short one.",
+            "Comprehensive documentation accelerates onboarding. It helps!",
+            "The cat sat on the mat. The dog sat too. Everyone was happy.",
+        ]
+        counts = [readability_counts(tokenize_text(text)) for text in texts]
+
+        batch = readability_metrics_many(counts)
+
+        for single, vectorized in zip(map(readability_metrics, counts), batch):
+            assert vectorized == pytest.approx(single)
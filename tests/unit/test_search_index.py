@@ -0,0 +1,132 @@
+"""Unit tests for the SQLite FTS5 search index."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from awesome_list_agent.utils.search_index import SearchIndex
+
+
+def _result(
+    url: str, language: str, item: str, videos: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "url": url,
+        "parsed_data": {
+            "topic": f"Awesome {language}",
+            "description": f"A curated list of {language} resources",
+            "categories": ["Web Frameworks", "Concurrency"],
+            "language": language,
+            "web_scraping_data": {
+                "links": [{"url": "https://example.com", "text": item, "title": ""}]
+            },
+            "youtube_metadata": videos,
+        },
+    }
+
+
+RUST_LIST = _result(
+    "https://github.com/rust-unofficial/awesome-rust",
+    "Rust",
+    "Tokio",
+    [
+        {
+            "webpage_url": "https://www.youtube.com/watch?v=async1",
+            "title": "Async Rust in depth",
+            "description": "Futures, executors and wakers.",
+            "duration_seconds": 3600,
+            "view_count": 50_000,
+        },
+        {
+            "webpage_url": "https://www.youtube.com/watch?v=borrow",
+            "title": "The borrow checker",
+            "description": "Lifetimes explained.",
+            "subtitle_content": {"auto_en": "Available caption formats: ['vtt']"},
+            "transcript": "we will also touch on asynchronous code",
+            "duration_seconds": 600,
+            "view_count": 900,
+        },
+    ],
+)
+PYTHON_LIST = _result(
+    "https://github.com/vinta/awesome-python",
+    "Python",
+    "Django",
+    [
+        {
+            "webpage_url": "https://www.youtube.com/watch?v=asyncio",
+            "title": "Asyncio for beginners",
+            "description": "Async and await in Python.",
+            "duration_seconds": 1200,
+            "view_count": 10_000,
+        }
+    ],
+)
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex."""
+
+    @pytest.mark.unit
+    def test_ranked_search_with_filters(self) -> None:
+        """Test that filters narrow the hits and titles rank above transcripts."""
+        with SearchIndex() as index:
+            index.add_result(RUST_LIST)
+            index.add_result(PYTHON_LIST)
+
+            rust_videos = index.search("rust async", kind="video", language="rust")
+            long_videos = index.search("async", kind="video", min_duration=1000)
+            popular = index.search("async", min_views=20_000)
+            lists = index.search("tokio concurrency", kind="list")
+
+        assert [hit.url for hit in rust_videos] == [
+            "https://www.youtube.com/watch?v=async1"
+        ]
+        assert rust_videos[0].list_url == RUST_LIST["url"]
+        assert {hit.url for hit in long_videos} == {
+            "https://www.youtube.com/watch?v=async1",
+            "https://www.youtube.com/watch?v=asyncio",
+        }
+        assert [hit.title for hit in popular] == ["Async Rust in depth"]
+        assert [hit.url for hit in lists] == [RUST_LIST["url"]]
+
+    @pytest.mark.unit
+    def test_transcripts_are_searched_not_caption_listings(self) -> None:
+        """Test that the transcript is indexed and caption formats are not."""
+        with SearchIndex() as index:
+            index.add_result(RUST_LIST)
+
+            hits = index.search("asynchronous")
+            listings = index.search("available caption formats")
+
+        assert [hit.url for hit in hits] == ["https://www.youtube.com/watch?v=borrow"]
+        assert listings == []
+
+    @pytest.mark.unit
+    def test_reindexing_replaces_documents(self, tmp_path: Path) -> None:
+        """Test that indexing a list again drops videos it no longer links."""
+        path = tmp_path / "search.db"
+        with SearchIndex(path) as index:
+            index.add_result(RUST_LIST)
+            updated = _result(
+                RUST_LIST["url"],
+                "Rust",
+                "Tokio",
+                RUST_LIST["parsed_data"]["youtube_metadata"][:1],
+            )
+            index.add_result(updated)
+
+        with SearchIndex(path) as index:
+            assert len(index) == 2
+            assert index.search("borrow checker") == []
+
+    @pytest.mark.unit
+    def test_query_syntax_is_not_interpreted(self) -> None:
+        """Test that FTS5 operators in a query are searched as plain words."""
+        with SearchIndex() as index:
+            index.add_result(PYTHON_LIST)
+
+            assert index.search('"asyncio* (') != []
+            assert index.search("!!!") == []
@@ -0,0 +1,132 @@
+"""Unit tests for chunked, mergeable content analysis."""
+
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.gazetteer import Gazetteer
+from awesome_list_agent.utils.streaming_analysis import (
+    ContentTally,
+    iter_text_chunks,
+    merge_tallies,
+)
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+
+TEXT = (
+    "# Awesome Python\n\n"
+    "Python is great! Python is fast and easy. Bad docs though...\n\n"
+    "- See [the official tutorial for beginners](https://docs.python.org) and "
+    "`pip install rich` for pretty output.\n"
+    "1. The Python Software Foundation and Acme Corp sponsor it.\n\n"
+    "The slow, broken build was frustrating? Terrible builds happen"
+)
+
+
+def _pieces(text: str, size: int) -> List[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _without_timing(result: Dict[str, Any]) -> Dict[str, Any]:
+    result = dict(result)
+    result.pop("analysis_time_ms")
+    return result
+
+
+class TestTextChunks:
+    """Test cases for iter_text_chunks."""
+
+    @pytest.mark.unit
+    def test_chunks_rebuild_text_without_splitting_words(self) -> None:
+        """Test that chunks concatenate to the input and end before whitespace."""
+        chunks = list(iter_text_chunks(_pieces(TEXT, 7), chunk_size=32))
+
+        assert "".join(chunks) == TEXT
+        assert len(chunks) > 3
+        for chunk, following in zip(chunks, chunks[1:]):
+            assert not chunk[-1].isspace()
+            assert following[0].isspace()
+
+    @pytest.mark.unit
+    def test_text_without_boundaries_is_kept_whole(self) -> None:
+        """Test that a long run without whitespace is not cut."""
+        text = "x" * 100
+
+        assert list(iter_text_chunks(_pieces(text, 10), chunk_size=16)) == [text]
+
+
+class TestContentTally:
+    """Test cases for ContentTally."""
+
+    @pytest.mark.unit
+    def test_merged_tallies_equal_whole_text_tally(self) -> None:
+        """Test that merging chunk tallies gives the tally of the whole text."""
+        chunks = list(iter_text_chunks([TEXT], chunk_size=24))
+        merged = merge_tallies(
+            ContentTally.from_text(chunk, at_start=i == 0)
+            for i, chunk in enumerate(chunks)
+        )
+        whole = ContentTally.from_text(TEXT)
+
+        assert merged.sentences.count == whole.sentences.count
+        assert merged.paragraphs.count == whole.paragraphs.count
+        assert merged.word_counts == whole.word_counts
+        assert merged.has_links and whole.has_links
+        assert merged.has_code_blocks and whole.has_code_blocks
+
+    @pytest.mark.unit
+    def test_link_split_across_chunks_is_found(self) -> None:
+        """Test that a markdown link spanning chunk boundaries is detected."""
+        left = ContentTally.from_text("read [the")
+        right = ContentTally.from_text(" guide](docs/guide.md) now", at_start=False)
+
+        assert not left.has_links
+        assert not right.has_links
+        assert left.merge(right).has_links
+
+    @pytest.mark.unit
+    def test_gazetteer_phrase_split_across_chunks_is_counted(self) -> None:
+        """Test that a multi-word term spanning chunks is counted once."""
+        gazetteer = Gazetteer.from_lexicons({"technology": ["large language models"]})
+        left = ContentTally.from_text("about large", gazetteer=gazetteer)
+        middle = ContentTally.from_text(" language", False, gazetteer=gazetteer)
+        right = ContentTally.from_text(" models", False, gazetteer=gazetteer)
+
+        merged = merge_tallies([left, middle, right])
+
+        assert sum(merged.phrase_counts.values()) == 1
+
+
+class TestAnalyzeStream:
+    """Test cases for ContentAnalysisTool.analyze_stream."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [16, 64, 1 << 20])
+    async def test_matches_execute(self, chunk_size: int) -> None:
+        """Test that streaming results equal execute() on the whole text."""
+        whole_tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+        stream_tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+
+        expected = await whole_tool.execute(TEXT)
+        result = await stream_tool.analyze_stream(
+            _pieces(TEXT, 5), chunk_size=chunk_size
+        )
+
+        assert _without_timing(result) == _without_timing(expected)
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_accepts_async_pieces(self) -> None:
+        """Test that pieces can come from an async iterator."""
+
+        async def pieces() -> AsyncIterator[str]:
+            for piece in _pieces(TEXT, 11):
+                yield piece
+
+        tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+        result = await tool.analyze_stream(pieces(), update_index=True, chunk_size=32)
+
+        assert result["text_length"] == len(TEXT)
+        assert result["topics"][0]["topic"] == "python"
+        assert tool.df_index.num_documents == 1
@@ -0,0 +1,51 @@
+"""Unit tests for the shared tokenization pass."""
+
+import pytest
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.text_tokens import tokenize_text
+
+TEXT = (
+    "# Awesome Python\n\n"
+    "Python is a great, fast language! Is it easy? İstanbul café abc123.\n\n"
+    "- Django by the Django Software Foundation\n"
+)
+
+
+class TestTokenizedText:
+    """Test cases for the token views."""
+
+    @pytest.mark.unit
+    def test_views(self) -> None:
+        """Test each token view against the text."""
+        tokens = tokenize_text(TEXT)
+
+        assert tokens.words[:3] == ["awesome", "python", "python"]
+        assert "abc123" in tokens.words
+        assert "abc" not in tokens.alpha_words
+        assert "caf" not in tokens.alpha_words
+        assert tokens.cased_words[0] == "Awesome"
+        assert tokens.sentences[1] == "Is it easy"
+        assert tokens.paragraph_count == 3
+        assert tokens.whitespace_word_count == len(TEXT.split())
+        assert tokens.letter_count == sum(c.isascii() and c.isalpha() for c in TEXT)
+
+    @pytest.mark.unit
+    def test_analyzers_match_standalone_results(self) -> None:
+        """Test that shared tokens give the same results as tokenizing per call."""
+        tool = ContentAnalysisTool()
+        tokens = tokenize_text(TEXT)
+
+        assert tool._calculate_basic_stats(TEXT, tokens) == (
+            tool._calculate_basic_stats(TEXT)
+        )
+        assert tool._extract_topics(TEXT, 5, tokens) == tool._extract_topics(TEXT, 5)
+        assert tool._extract_keywords(TEXT, 5, tokens) == (
+            tool._extract_keywords(TEXT, 5)
+        )
+        assert tool._calculate_readability(TEXT, tokens) == (
+            tool._calculate_readability(TEXT)
+        )
+        assert tool._analyze_content_structure(TEXT, tokens) == (
+            tool._analyze_content_structure(TEXT)
+        )
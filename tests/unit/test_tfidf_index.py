@@ -0,0 +1,89 @@
+"""Unit tests for the corpus document frequency index."""
+
+from pathlib import Path
+
+import pytest
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+
+
+class TestDocumentFrequencyIndex:
+    """Test cases for incremental updates and persistence."""
+
+    @pytest.mark.unit
+    def test_incremental_document_frequencies(self) -> None:
+        """Test that repeated terms in one document count once."""
+        index = DocumentFrequencyIndex()
+
+        index.add_document(["python", "python", "rust"])
+        index.add_document(["python"])
+
+        assert index.num_documents == 2
+        assert index.document_frequency("python") == 2
+        assert index.document_frequency("rust") == 1
+        assert index.document_frequency("go") == 0
+        assert index.idf("python") == pytest.approx(1.0)
+        assert index.idf("go") > index.idf("rust") > index.idf("python")
+
+    @pytest.mark.unit
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test that the binary format round-trips and keeps growing."""
+        path = tmp_path / "df.idx"
+        index = DocumentFrequencyIndex(path)
+        index.add_document(["python", "café", "rust"])
+        index.save()
+
+        loaded = DocumentFrequencyIndex.load_or_create(path)
+        loaded.add_document(["python", "go"])
+
+        assert loaded.num_documents == 2
+        assert sorted(loaded.terms) == ["café", "go", "python", "rust"]
+        assert loaded.document_frequency("python") == 2
+        assert loaded.document_frequency("café") == 1
+
+    @pytest.mark.unit
+    def test_rejects_foreign_files(self, tmp_path: Path) -> None:
+        """Test that files in another format are refused."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not an index at all, definitely not")
+
+        with pytest.raises(ValueError):
+            DocumentFrequencyIndex.load(path)
+
+
+class TestCorpusKeywords:
+    """Test cases for keyword ranking against the corpus."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_common_terms_rank_lower(self) -> None:
+        """Test that terms seen in every document are down-weighted."""
+        tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex())
+        for text in ["python tutorial", "python react", "python rust"]:
+            await tool.execute(text, update_index=True)
+
+        result = await tool.execute(
+            "python python python async async", update_index=True
+        )
+
+        assert [k["keyword"] for k in result["keywords"]] == ["async", "python"]
+        assert tool.df_index.num_documents == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_indexing_is_opt_in_and_saved_on_cleanup(
+        self, tmp_path: Path
+    ) -> None:
+        """Test that only opted-in texts are indexed and cleanup() saves them."""
+        path = tmp_path / "df.idx"
+        tool = ContentAnalysisTool(df_index=DocumentFrequencyIndex(path))
+
+        await tool.execute("python tutorial")
+        await tool.execute("rust tutorial", update_index=True)
+        await tool.cleanup()
+
+        loaded = DocumentFrequencyIndex.load(path)
+        assert loaded.num_documents == 1
+        assert loaded.document_frequency("python") == 0
+        assert loaded.document_frequency("rust") == 1
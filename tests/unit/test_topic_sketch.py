@@ -0,0 +1,152 @@
+"""Unit tests for the Count-Min topic sketch."""
+
+import datetime
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from awesome_list_agent.tools.content_analysis_tool import ContentAnalysisTool
+from awesome_list_agent.utils.tfidf_index import DocumentFrequencyIndex
+from awesome_list_agent.utils.topic_sketch import (
+    CountMinSketch,
+    TopicSketch,
+    TopicTrends,
+    iso_week,
+)
+
+
+def _documents(count: int, seed: int = 0) -> list:
+    """Topic counts with a skewed, Zipf-like distribution."""
+    rng = random.Random(seed)
+    topics = [f"topic{i}" for i in range(2000)]
+    weights = [1 / (i + 1) for i in range(len(topics))]
+    return [Counter(rng.choices(topics, weights, k=30)) for _ in range(count)]
+
+
+class TestCountMinSketch:
+    """Test cases for CountMinSketch."""
+
+    @pytest.mark.unit
+    def test_estimates_never_undercount(self) -> None:
+        """Test that every estimate is at least the true count."""
+        sketch = CountMinSketch(width=64, depth=4)
+        exact = Counter()
+        for document in _documents(50):
+            for topic, count in document.items():
+                sketch.add(topic, count)
+            exact.update(document)
+
+        assert all(sketch.estimate(topic) >= n for topic, n in exact.items())
+        assert sketch.total == sum(exact.values())
+
+    @pytest.mark.unit
+    def test_merge_rejects_other_shape(self) -> None:
+        """Test that only sketches of the same shape merge."""
+        with pytest.raises(ValueError):
+            CountMinSketch(width=64).merge(CountMinSketch(width=128))
+
+
+class TestTopicSketch:
+    """Test cases for TopicSketch."""
+
+    @pytest.mark.unit
+    def test_merged_shards_find_the_heavy_hitters(self) -> None:
+        """Test that sketches of disjoint shards merge to the corpus top topics."""
+        documents = _documents(1000)
+        shards = [TopicSketch(capacity=50) for _ in range(3)]
+        for i, document in enumerate(documents):
+            shards[i % 3].add_document(document)
+
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged.merge(shard)
+
+        exact = sum(documents, Counter())
+        assert [t for t, _ in merged.top(10)] == [t for t, _ in exact.most_common(10)]
+        assert merged.num_documents == 1000
+        assert len(merged) == 50
+
+    @pytest.mark.unit
+    def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        """Test that a saved sketch loads with the same counts and topics."""
+        sketch = TopicSketch(width=256, capacity=20)
+        for document in _documents(100):
+            sketch.add_document(document)
+        path = tmp_path / "topics.sketch"
+        sketch.save(path)
+
+        loaded = TopicSketch.load(path)
+
+        assert loaded.top() == sketch.top()
+        assert loaded.num_documents == 100
+        assert loaded.estimate("topic1") == sketch.estimate("topic1")
+
+    @pytest.mark.unit
+    def test_load_rejects_other_files(self, tmp_path: Path) -> None:
+        """Test that a file that is not a sketch is rejected."""
+        path = tmp_path / "topics.sketch"
+        path.write_bytes(b"not a sketch" * 10)
+
+        with pytest.raises(ValueError):
+            TopicSketch.load(path)
+
+
+class TestTopicTrends:
+    """Test cases for weekly TopicTrends."""
+
+    @pytest.mark.unit
+    def test_old_weeks_leave_the_window(self) -> None:
+        """Test that documents stop counting once their week is out of range."""
+        today = datetime.date(2026, 10, 14)
+        trends = TopicTrends(window_weeks=2)
+        trends.add_document({"rust": 5}, when=today - datetime.timedelta(weeks=3))
+        trends.add_document({"python": 2}, when=today - datetime.timedelta(weeks=1))
+        trends.add_document({"python": 1, "go": 1}, when=today)
+
+        assert trends.top(now=today) == [("python", 3), ("go", 1)]
+        assert trends.top(1, weeks=4, now=today) == [("rust", 5)]
+        assert trends.window(now=today).num_documents == 2
+        assert iso_week(today) == "2026-W42"
+
+    @pytest.mark.unit
+    def test_save_keeps_weeks_within_the_retention(self, tmp_path: Path) -> None:
+        """Test that weeks are saved one file each and expired ones deleted."""
+        today = datetime.date(2026, 10, 14)
+        trends = TopicTrends(tmp_path, window_weeks=2, retention_weeks=4)
+        trends.add_document({"rust": 1}, when=today - datetime.timedelta(weeks=5))
+        trends.add_document({"python": 1}, when=today)
+        trends.save(now=today)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["2026-W42.sketch"]
+        loaded = TopicTrends(tmp_path, window_weeks=2, retention_weeks=4)
+        assert loaded.top(now=today) == [("python", 1)]
+        assert loaded.top(weeks=4, now=today) == [("python", 1)]
+
+
+class TestContentAnalysisTopics:
+    """Test cases for topic trends in ContentAnalysisTool."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_indexed_documents_feed_top_topics(self) -> None:
+        """Test that execute() and analyze_many() feed the topic trends."""
+        tool = ContentAnalysisTool(
+            df_index=DocumentFrequencyIndex(), topic_trends=TopicTrends()
+        )
+
+        await tool.execute(
+            "Rust async runtimes: tokio and async-std. Rust is fast.",
+            update_index=True,
+        )
+        await tool.analyze_many(
+            ["Rust borrow checker.", "Python asyncio."], update_index=True
+        )
+        await tool.execute("Rust rust rust")
+
+        assert tool.top_topics(2) == [
+            {"topic": "rust", "frequency": 3},
+            {"topic": "async", "frequency": 2},
+        ]
+        assert tool.topic_trends.window().num_documents == 3
@@ -0,0 +1,200 @@
+"""Unit tests for timestamped transcript segments and their index."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from awesome_list_agent.utils.transcript_index import TranscriptIndex
+from awesome_list_agent.utils.transcript_segments import (
+    TranscriptSegments,
+    choose_caption_format,
+    parse_captions,
+)
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+1
+00:00:01.000 --> 00:00:03.500 align:start position:0%
+Welcome to <c>the</c> talk
+
+NOTE not a caption
+
+00:01:02.250 --> 00:01:05.000
+Today: async &amp; await
+in Rust
+"""
+
+SRV3 = (
+    '<?xml version="1.0" encoding="utf-8" ?><timedtext format="3"><body>'
+    '<p t="1000" d="2500">Welcome to the talk</p>'
+    '<p t="62250" d="2750">Today: async <s>&amp; await</s> in Rust</p>'
+    "</body></timedtext>"
+)
+
+JSON3 = json.dumps(
+    {
+        "events": [
+            {"tStartMs": 1000, "dDurationMs": 2500, "segs": [{"utf8": "Welcome to"}]},
+            {"tStartMs": 1000, "segs": [{"utf8": "\n"}]},
+            {
+                "tStartMs": 62250,
+                "dDurationMs": 2750,
+                "segs": [{"utf8": "Today: async & await"}, {"utf8": " in Rust"}],
+            },
+        ]
+    }
+)
+
+# YouTube auto-captions: each cue repeats the previous line, with a 10ms cue
+# holding it alone in between; cues contain " " lines
+ROLLING_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.310 align:start position:0%
+ 
+welcome<00:00:00.320><c> to</c><00:00:00.640><c> the</c><00:00:01.000><c> talk</c>
+
+00:00:02.310 --> 00:00:02.320 align:start position:0%
+welcome to the talk
+ 
+
+00:00:02.320 --> 00:00:05.000 align:start position:0%
+welcome to the talk
+today<00:00:02.800><c> async</c><00:00:03.200><c> rust</c>
+
+00:00:05.000 --> 00:00:05.010 align:start position:0%
+today async rust
+ 
+
+00:00:05.010 --> 00:00:07.000 align:start position:0%
+today async rust
+and<00:00:05.500><c> tokio</c>
+"""
+
+
+class TestTranscriptSegments:
+    """Test cases for TranscriptSegments and caption parsing."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content, ext", [(VTT, "vtt"), (SRV3, "srv3")])
+    def test_parses_cues_with_timing(self, content: str, ext: str) -> None:
+        """Test that cues keep their times and the buffer is the flat text."""
+        segments = parse_captions(content, ext)
+
+        assert [tuple(segment) for segment in segments] == [
+            (1.0, 3.5, "Welcome to the talk"),
+            (62.25, 65.0, "Today: async & await in Rust"),
+        ]
+        assert segments.text == "Welcome to the talk Today: async & await in Rust"
+        assert segments.segment_at(63) == 1
+
+    @pytest.mark.unit
+    def test_parses_json3_and_drops_blank_events(self) -> None:
+        """Test that json3 events without text are not segments."""
+        segments = parse_captions(JSON3, "json3")
+
+        assert len(segments) == 2
+        assert segments[-1].text == "Today: async & await in Rust"
+
+    @pytest.mark.unit
+    def test_rolling_captions_keep_each_line_once(self) -> None:
+        """Test that repeated lines of rolling auto-captions are collapsed."""
+        segments = parse_captions(ROLLING_VTT, "vtt")
+
+        assert [tuple(segment) for segment in segments] == [
+            (0.0, 2.31, "welcome to the talk"),
+            (2.32, 5.0, "today async rust"),
+            (5.01, 7.0, "and tokio"),
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "content, ext", [(ROLLING_VTT, "vtt"), (SRV3, "srv3"), (JSON3, "json3")]
+    )
+    def test_chunked_source_parses_like_whole(self, content: str, ext: str) -> None:
+        """Test that captions streamed in small chunks give the same cues."""
+        chunks = (content[i : i + 7] for i in range(0, len(content), 7))
+
+        assert list(parse_captions(chunks, ext)) == list(parse_captions(content, ext))
+
+    @pytest.mark.unit
+    def test_structured_caption_format_is_chosen(self) -> None:
+        """Test that json3 is preferred over the other formats of a track."""
+        formats = [{"ext": "vtt"}, {"ext": "srv3"}, {"ext": "json3"}]
+
+        assert choose_caption_format(formats) == {"ext": "json3"}
+        assert choose_caption_format([{"ext": "ttml"}]) == {"ext": "ttml"}
+
+    @pytest.mark.unit
+    def test_dict_round_trip(self) -> None:
+        """Test that to_dict() output rebuilds the same segments."""
+        segments = parse_captions(VTT, "vtt")
+
+        rebuilt = TranscriptSegments.from_dict(
+            json.loads(json.dumps(segments.to_dict()))
+        )
+
+        assert list(rebuilt) == list(segments)
+
+
+class TestTranscriptIndex:
+    """Test cases for TranscriptIndex."""
+
+    @pytest.mark.unit
+    def test_search_returns_moment_to_jump_to(self, tmp_path: Path) -> None:
+        """Test that a hit carries the cue time and a timestamped URL."""
+        path = tmp_path / "transcripts.db"
+        with TranscriptIndex(path) as index:
+            index.add(
+                "https://www.youtube.com/watch?v=abc",
+                parse_captions(VTT, "vtt"),
+                title="Async Rust",
+            )
+            index.add(
+                "https://www.youtube.com/watch?v=xyz",
+                TranscriptSegments.from_cues([(0, 5, "Python asyncio basics")]),
+            )
+
+        with TranscriptIndex(path) as index:
+            hits = index.search("awaiting rust")
+            spanning = index.search("talk today")
+
+        assert len(hits) == 1
+        assert hits[0].title == "Async Rust"
+        assert hits[0].start == 62.25
+        assert hits[0].url == "https://www.youtube.com/watch?v=abc&t=62s"
+        assert spanning[0].start == 1.0
+
+    @pytest.mark.unit
+    def test_hit_starts_at_the_matching_cue(self) -> None:
+        """Test that a window's leading cue without the words is skipped."""
+        url = "https://www.youtube.com/watch?v=abc"
+        segments = TranscriptSegments.from_cues(
+            [
+                (0, 2, "Hi"),
+                (30, 32, "Borrowing rules"),
+                (60, 90, " ".join(["and then we talk about lifetimes"] * 10)),
+            ]
+        )
+        with TranscriptIndex() as index:
+            index.add(url, segments)
+            hits = index.search("borrow")
+
+        assert hits[0].start == 30.0
+        assert hits[0].url == f"{url}&t=30s"
+
+    @pytest.mark.unit
+    def test_reindexing_replaces_transcript(self) -> None:
+        """Test that adding a video again forgets its old cues."""
+        url = "https://www.youtube.com/watch?v=abc"
+        with TranscriptIndex() as index:
+            index.add(url, parse_captions(VTT, "vtt"))
+            index.add(url, TranscriptSegments.from_cues([(0, 1, "New captions")]))
+
+            assert index.search("rust") == []
+            assert index.get(url).text == "New captions"
+            assert len(index) == 1
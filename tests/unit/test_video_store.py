@@ -0,0 +1,166 @@
+"""Unit tests for the columnar video store."""
+
+from pathlib import Path
+
+import pytest
+
+from awesome_list_agent.utils.video_store import VideoStore
+
+
+def video(video_id: str, **fields) -> dict:
+    return {
+        "video_id": video_id,
+        "title": f"Talk {video_id}",
+        "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+        **fields,
+    }
+
+
+PYTHON_VIDEOS = [
+    video(
+        "a",
+        view_count=1000,
+        like_count=50,
+        duration_seconds=600,
+        upload_date="20240105",
+    ),
+    video(
+        "b",
+        view_count=200,
+        like_count=40,
+        comment_count=10,
+        duration_seconds=1200,
+        upload_date="20230301",
+    ),
+    video("c", view_count=None, duration_seconds=None),
+]
+RUST_VIDEOS = [
+    video(
+        "d",
+        view_count=500,
+        like_count=5,
+        duration_seconds=300,
+        upload_date="2024-06-01",
+    ),
+]
+
+
+@pytest.fixture
+def store() -> VideoStore:
+    store = VideoStore()
+    store.add_list("https://github.com/x/awesome-python", PYTHON_VIDEOS)
+    store.add_list("https://github.com/x/awesome-rust", RUST_VIDEOS)
+    return store
+
+
+class TestVideoStore:
+    """Test cases for VideoStore."""
+
+    @pytest.mark.unit
+    def test_aggregates_per_list_and_across_lists(self, store: VideoStore) -> None:
+        """Test totals for one list and for every list, skipping unknowns."""
+        python = store.aggregate(list_url="https://github.com/x/awesome-python")
+        assert python["video_count"] == 3
+        assert python["total_views"] == 1200
+        assert python["total_comments"] == 10
+        assert python["avg_duration_minutes"] == pytest.approx(15.0)
+        assert python["engagement_rate"] == pytest.approx(100 / 1200)
+
+        everything = store.aggregate()
+        assert everything["video_count"] == 4
+        assert everything["total_views"] == 1700
+        assert everything["avg_duration_minutes"] == pytest.approx(35 / 3)
+
+    @pytest.mark.unit
+    def test_empty_selection(self, store: VideoStore) -> None:
+        """Test that unknown lists aggregate to zeros."""
+        stats = store.aggregate(list_url="https://github.com/x/missing")
+        assert stats["video_count"] == 0
+        assert stats["avg_duration_minutes"] == 0.0
+        assert stats["engagement_rate"] == 0.0
+
+    @pytest.mark.unit
+    def test_filters(self, store: VideoStore) -> None:
+        """Test view, duration and upload date filters."""
+        assert store.aggregate(min_views=500)["video_count"] == 2
+        assert store.aggregate(max_duration=600)["video_count"] == 2
+        assert store.aggregate(uploaded_after="20240101")["video_count"] == 2
+        assert store.aggregate(uploaded_before="2023-12-31")["video_count"] == 1
+
+    @pytest.mark.unit
+    def test_top_by_engagement_and_column(self, store: VideoStore) -> None:
+        """Test ranking videos over all lists."""
+        assert [v["video_id"] for v in store.top(2)] == ["b", "a"]
+        by_views = store.top(3, by="view_count")
+        assert [v["video_id"] for v in by_views] == ["a", "d", "b"]
+        assert by_views[1]["list_url"] == "https://github.com/x/awesome-rust"
+        assert store.top(1, by="upload_date")[0]["upload_date"] == "2024-06-01"
+
+        with pytest.raises(ValueError):
+            store.top(by="title")
+
+    @pytest.mark.unit
+    def test_adding_a_list_again_replaces_its_videos(self, store: VideoStore) -> None:
+        """Test that re-adding a list replaces only that list's rows."""
+        store.add_list("https://github.com/x/awesome-python", PYTHON_VIDEOS[:1])
+
+        assert len(store) == 2
+        python = store.aggregate(list_url="https://github.com/x/awesome-python")
+        assert python["video_count"] == 1
+        assert store.aggregate()["total_views"] == 1500
+
+    @pytest.mark.unit
+    def test_shared_videos_count_in_every_list_once_overall(
+        self, store: VideoStore
+    ) -> None:
+        """Test that a video in two lists is in both, but counted once overall."""
+        store.add_list(
+            "https://github.com/x/awesome-rust",
+            RUST_VIDEOS + [video("a", view_count=1100, like_count=50)],
+        )
+
+        assert len(store) == 5
+        python = store.aggregate(list_url="https://github.com/x/awesome-python")
+        rust = store.aggregate(list_url="https://github.com/x/awesome-rust")
+        assert python["total_views"] == 1200
+        assert rust["video_count"] == 2
+        assert rust["total_views"] == 1600
+
+        everything = store.aggregate()
+        assert everything["video_count"] == 4
+        assert everything["total_views"] == 1800
+        assert [v["video_id"] for v in store.top(4, by="view_count")][:2] == [
+            "a",
+            "d",
+        ]
+        assert store.top(1, by="view_count")[0]["list_url"].endswith("awesome-rust")
+        assert store.view_counts()["a"] == 1100
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", ["videos.arrow", "videos.parquet"])
+    def test_save_and_load(self, store: VideoStore, tmp_path: Path, name: str) -> None:
+        """Test that a saved store loads back with the same contents."""
+        path = store.save(tmp_path / name)
+        loaded = VideoStore.load_or_create(path)
+
+        assert loaded.aggregate() == store.aggregate()
+        assert loaded.top(4) == store.top(4)
+        assert loaded.row(2)["view_count"] is None
+
+        loaded.add_list("https://github.com/x/awesome-go", [video("e", view_count=1)])
+        assert loaded.aggregate()["video_count"] == 5
+
+    @pytest.mark.unit
+    def test_load_rejects_other_files(self, tmp_path: Path) -> None:
+        """Test that a file that is not a store raises ValueError."""
+        path = tmp_path / "videos.arrow"
+        path.write_bytes(b"not arrow")
+        with pytest.raises(ValueError):
+            VideoStore.load(path)
+
+    @pytest.mark.unit
+    def test_load_or_create_starts_empty(self, tmp_path: Path) -> None:
+        """Test that a missing file gives an empty store saving there."""
+        store = VideoStore.load_or_create(tmp_path / "videos.arrow")
+        assert len(store) == 0
+        assert store.path == tmp_path / "videos.arrow"
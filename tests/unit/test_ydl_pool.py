@@ -0,0 +1,85 @@
+"""Unit tests for the YoutubeDL instance pool."""
+
+import threading
+import time
+from typing import Any, Dict
+
+import pytest
+
+from awesome_list_agent.utils.ydl_pool import YoutubeDLPool
+
+
+class FakeYoutubeDL:
+    """Records its options and whether it was closed."""
+
+    def __init__(self, params: Dict[str, Any]):
+        self.params = params
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+METADATA = {"skip_download": True, "quiet": True}
+SUBTITLES = {"skip_download": True, "quiet": True, "writesubtitles": True}
+
+
+class TestYoutubeDLPool:
+    """Test cases for YoutubeDLPool."""
+
+    @pytest.mark.unit
+    def test_instances_are_reused_per_profile(self) -> None:
+        """Test that equal options reuse one instance and others get their own."""
+        pool = YoutubeDLPool(FakeYoutubeDL)
+
+        with pool.acquire(METADATA) as first:
+            pass
+        with pool.acquire(dict(reversed(METADATA.items()))) as second:
+            pass
+        with pool.acquire(SUBTITLES) as subtitles:
+            pass
+
+        assert first is second
+        assert subtitles is not first
+        assert subtitles.params == SUBTITLES
+        assert pool.created == 2
+
+    @pytest.mark.unit
+    def test_concurrent_workers_never_share_an_instance(self) -> None:
+        """Test that threads borrowing at once get distinct instances."""
+        pool = YoutubeDLPool(FakeYoutubeDL, max_idle=2)
+        borrowed = []
+        barrier = threading.Barrier(4)
+
+        def work() -> None:
+            with pool.acquire(METADATA) as ydl:
+                borrowed.append(id(ydl))
+                barrier.wait()
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(borrowed)) == 4
+        # Only max_idle instances are kept once the workers are done
+        assert pool.idle_count() == 2
+
+    @pytest.mark.unit
+    def test_failed_instance_is_closed(self) -> None:
+        """Test that an instance whose block raised is not handed out again."""
+        pool = YoutubeDLPool(FakeYoutubeDL)
+
+        with pytest.raises(RuntimeError):
+            with pool.acquire(METADATA) as failed:
+                raise RuntimeError("extraction failed")
+        with pool.acquire(METADATA) as fresh:
+            pass
+        pool.close()
+
+        assert failed.closed
+        assert fresh is not failed
+        assert fresh.closed
+        assert pool.idle_count() == 0
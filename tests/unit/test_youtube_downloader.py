@@ -0,0 +1,433 @@
+"""Unit tests for YouTubeDownloader extraction modes."""
+
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+import pytest
+from aiohttp import web
+
+from awesome_list_agent.tools import youtube_metadata_tool
+from awesome_list_agent.models import ToolError
+from awesome_list_agent.tools.youtube_metadata_tool import (
+    LISTING_FIELDS,
+    VideoRecord,
+    YouTubeDownloader,
+    YouTubeMetadataTool,
+    YoutubeDataType,
+)
+from awesome_list_agent.utils.http_client import HTTPClient
+from awesome_list_agent.utils.transcript_index import TranscriptIndex
+from awesome_list_agent.utils.transcript_segments import TranscriptSegments
+from awesome_list_agent.utils.ydl_pool import YoutubeDLPool
+
+URL = "https://www.youtube.com/watch?v=abc"
+
+INFO = {
+    "id": "abc",
+    "title": "Async Rust",
+    "duration": 600,
+    "webpage_url": URL,
+    "view_count": 1200,
+    "formats": [{"format_id": str(i), "url": f"https://media/{i}"} for i in range(80)],
+    "subtitles": {"de": [{"ext": "vtt", "url": "https://subs/manual-de"}]},
+    "automatic_captions": {
+        "en": [{"ext": "json3", "url": "https://subs/auto-en"}],
+        "fr": [{"ext": "vtt", "url": "https://subs/auto-fr"}],
+    },
+}
+
+
+class FakeYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL and counts extractions."""
+
+    extractions: List[str] = []
+    params: List[Dict[str, Any]] = []
+
+    def __init__(self, params: Dict[str, Any]):
+        self.params.append(params)
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def extract_info(
+        self, url: str, download: bool = True, process: bool = True
+    ) -> Dict[str, Any]:
+        self.extractions.append(url)
+        return INFO
+
+
+class FailingYoutubeDL:
+    """A yt_dlp.YoutubeDL whose extractions always fail."""
+
+    def __init__(self, params: Dict[str, Any]):
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def extract_info(self, url: str, download: bool = True) -> Dict[str, Any]:
+        raise RuntimeError("Video unavailable")
+
+
+@pytest.fixture
+def downloader(monkeypatch: pytest.MonkeyPatch) -> YouTubeDownloader:
+    FakeYoutubeDL.extractions = []
+    FakeYoutubeDL.params = []
+    monkeypatch.setattr(youtube_metadata_tool, "YoutubeDL", FakeYoutubeDL)
+    fetched = []
+
+    def download(self: YouTubeDownloader, track: Dict[str, Any]):
+        fetched.append(track["url"])
+        if track["url"] == "https://subs/auto-en":
+            return TranscriptSegments.from_cues([(1.0, 2.0, "Hello futures")])
+        return None
+
+    async def fetch(
+        self: YouTubeDownloader, track: Dict[str, Any], http_client: HTTPClient
+    ):
+        return download(self, track)
+
+    monkeypatch.setattr(YouTubeDownloader, "_download_subtitle_segments", download)
+    monkeypatch.setattr(YouTubeDownloader, "_fetch_subtitle_segments", fetch)
+    downloader = YouTubeDownloader()
+    downloader.fetched = fetched
+    return downloader
+
+
+class TestYouTubeDownloader:
+    """Test cases for the combined metadata and transcript extraction."""
+
+    @pytest.mark.unit
+    def test_combined_extraction_runs_extract_info_once(
+        self, downloader: YouTubeDownloader
+    ) -> None:
+        """Test that metadata and transcript come from one extraction."""
+        data = downloader.get_all_info_with_transcript(URL, language="de")
+
+        assert FakeYoutubeDL.extractions == [URL]
+        assert data.title == "Async Rust"
+        assert set(data.automatic_captions) == {"en", "fr"}
+        assert data.transcript == "Hello futures"
+        assert data.transcript_language == "en"
+        assert data.transcript_source == "automatic"
+        # The failing manual track was tried alongside the automatic one
+        assert sorted(downloader.fetched) == [
+            "https://subs/auto-en",
+            "https://subs/manual-de",
+        ]
+
+    @pytest.mark.unit
+    def test_transcript_matches_separate_extraction(
+        self, downloader: YouTubeDownloader
+    ) -> None:
+        """Test that the combined mode picks the same track as get_transcript()."""
+        combined = downloader.get_all_info_with_transcript(URL)
+        separate = downloader.get_transcript(URL)
+
+        assert combined.transcript == separate["transcript"]
+        assert combined.transcript_segments == separate["segments"]
+        assert combined.transcript_source == separate["source"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_indexes_combined_transcript(
+        self, downloader: YouTubeDownloader
+    ) -> None:
+        """Test that the tool returns metadata with the transcript and indexes it."""
+        with TranscriptIndex() as index:
+            tool = YouTubeMetadataTool(transcript_index=index)
+            tool.downloader = downloader
+
+            result = await tool.execute(URL, YoutubeDataType.metadata_and_transcript)
+
+            assert result["title"] == "Async Rust"
+            assert result["transcript"] == "Hello futures"
+            assert [hit.video_url for hit in index.search("futures")] == [URL]
+        assert FakeYoutubeDL.extractions == [URL]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "method", ["get_all_info", "get_metadata_only", "get_subtitles"]
+    )
+    def test_failed_extraction_closes_its_instance(self, method: str) -> None:
+        """Test that a failed extraction is reported and its instance not reused."""
+        pool = YoutubeDLPool(FailingYoutubeDL)
+        downloader = YouTubeDownloader(pool=pool)
+        borrowed = []
+        acquire = pool.acquire
+
+        def tracking_acquire(ydl_opts: Dict[str, Any]):
+            with acquire(ydl_opts) as ydl:
+                borrowed.append(ydl)
+                yield ydl
+
+        pool.acquire = contextmanager(tracking_acquire)
+
+        data = getattr(downloader, method)(URL)
+
+        assert data.error == "Video unavailable"
+        assert [ydl.closed for ydl in borrowed] == [True]
+        assert pool.idle_count() == 0
+
+
+class TestFieldProjection:
+    """Test cases for extracting only selected fields."""
+
+    @pytest.mark.unit
+    def test_record_holds_only_requested_fields(
+        self, downloader: YouTubeDownloader
+    ) -> None:
+        """Test that unrequested fields are None and manifests are skipped."""
+        record = downloader.get_fields(URL, ["title", "view_count", "tags"])
+
+        assert isinstance(record, VideoRecord)
+        assert record.to_dict() == {
+            "title": "Async Rust",
+            "view_count": 1200,
+            "tags": [],
+            "url": URL,
+        }
+        assert record.formats is None
+        assert FakeYoutubeDL.params[-1]["extractor_args"] == {
+            "youtube": {"skip": ["dash", "hls"]}
+        }
+
+    @pytest.mark.unit
+    def test_format_fields_keep_manifests(self, downloader: YouTubeDownloader) -> None:
+        """Test that requesting a format field extracts every format."""
+        record = downloader.get_fields(URL, ["formats"])
+
+        assert len(record.formats) == 80
+        assert "extractor_args" not in FakeYoutubeDL.params[-1]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_returns_projected_metadata(
+        self, downloader: YouTubeDownloader
+    ) -> None:
+        """Test that the tool output only carries the listing fields."""
+        tool = YouTubeMetadataTool(transcript_index=TranscriptIndex())
+        tool.downloader = downloader
+
+        slim = await tool.execute(URL, fields=LISTING_FIELDS)
+        full = await tool.execute(URL)
+        unknown = await tool.execute(URL, fields=["nope"])
+
+        assert "formats" not in slim
+        assert slim["title"] == full["title"]
+        assert slim["view_count"] == full["view_count"]
+        assert slim["metadata_summary"] == full["metadata_summary"]
+        assert len(full["formats"]) == 80
+        assert isinstance(unknown, ToolError)
+
+
+class FlatYoutubeDL(FakeYoutubeDL):
+    """Serves a 500 video playlist and a channel whose uploads tab holds it."""
+
+    pulled: List[int] = []
+
+    def extract_info(
+        self, url: str, download: bool = True, process: bool = True
+    ) -> Dict[str, Any]:
+        assert not process and self.params[-1]["extract_flat"] == "in_playlist"
+        self.extractions.append(url)
+        if url == "https://www.youtube.com/@talks":
+            return {"entries": iter([{"_type": "url", "ie_key": "YoutubeTab"}])}
+        if url.endswith("/@talks/videos"):
+            return {"entries": iter([{"_type": "playlist", "entries": self._videos()}])}
+        return {"_type": "playlist", "entries": self._videos()}
+
+    def _videos(self):
+        for i in range(500):
+            self.pulled.append(i)
+            yield {
+                "_type": "url",
+                "ie_key": "Youtube",
+                "id": f"v{i:010d}",
+                "duration": 61.0,
+            }
+
+
+@pytest.fixture
+def flat_downloader(monkeypatch: pytest.MonkeyPatch) -> YouTubeDownloader:
+    FlatYoutubeDL.extractions = []
+    FlatYoutubeDL.params = []
+    FlatYoutubeDL.pulled = []
+    monkeypatch.setattr(youtube_metadata_tool, "YoutubeDL", FlatYoutubeDL)
+    return YouTubeDownloader()
+
+
+class TestPlaylistEnumeration:
+    """Test cases for listing playlists and channels with flat extraction."""
+
+    @pytest.mark.unit
+    def test_entries_are_listed_lazily(
+        self, flat_downloader: YouTubeDownloader
+    ) -> None:
+        """Test that only the entries needed are pulled from the playlist."""
+        entries = list(
+            flat_downloader.iter_entries(
+                "https://www.youtube.com/playlist?list=PL123", limit=3
+            )
+        )
+
+        assert [entry.url for entry in entries] == [
+            f"https://www.youtube.com/watch?v=v{i:010d}" for i in range(3)
+        ]
+        assert entries[0].duration == 61
+        assert len(FlatYoutubeDL.pulled) <= 4
+
+    @pytest.mark.unit
+    def test_channel_lists_its_uploads(
+        self, flat_downloader: YouTubeDownloader
+    ) -> None:
+        """Test that a channel URL is listed through its videos tab."""
+        entries = list(flat_downloader.iter_entries("https://youtube.com/@talks"))
+
+        assert FlatYoutubeDL.extractions == ["https://www.youtube.com/@talks/videos"]
+        assert len(entries) == 500
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_collections_expand_to_video_urls(
+        self, flat_downloader: YouTubeDownloader
+    ) -> None:
+        """Test that playlists only contribute videos up to the limit."""
+        tool = YouTubeMetadataTool(transcript_index=TranscriptIndex())
+        tool.downloader = flat_downloader
+
+        urls = await tool.expand_collections(
+            [URL, "https://www.youtube.com/playlist?list=PL123", URL], limit=4
+        )
+
+        assert urls[0] == URL
+        assert len(urls) == 4
+        assert len(FlatYoutubeDL.pulled) <= 4
+
+
+class TestExecuteMany:
+    """Test cases for concurrent extraction of many videos."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_extractions_overlap_up_to_concurrency(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that execute_many() runs extractions side by side."""
+        state = {"in_flight": 0, "max_in_flight": 0}
+
+        def get_fields(self: YouTubeDownloader, url: str, fields) -> VideoRecord:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.05)
+            state["in_flight"] -= 1
+            return VideoRecord(title=url[-3:], url=url)
+
+        monkeypatch.setattr(YouTubeDownloader, "get_fields", get_fields)
+        tool = YouTubeMetadataTool(transcript_index=TranscriptIndex())
+        urls = [f"{URL}{i:03d}" for i in range(6)]
+
+        results = await tool.execute_many(
+            urls + urls[:1], fields=LISTING_FIELDS, concurrency=3
+        )
+
+        assert list(results) == urls
+        assert [result["title"] for result in results.values()] == [
+            f"{i:03d}" for i in range(6)
+        ]
+        assert state["max_in_flight"] == 3
+
+
+JSON3 = json.dumps({"events": [{"tStartMs": 0, "segs": [{"utf8": "From json3"}]}]})
+
+
+@pytest.fixture
+async def caption_server():
+    """Local server whose caption tracks answer after a delay."""
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def track(request: web.Request) -> web.Response:
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(float(request.query.get("delay", 0)))
+        finally:
+            state["in_flight"] -= 1
+        if request.match_info["name"] == "missing":
+            raise web.HTTPNotFound()
+        return web.Response(text=JSON3)
+
+    app = web.Application()
+    app.router.add_get("/{name}", track)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield f"http://127.0.0.1:{port}", state
+    await runner.cleanup()
+
+
+def _info(manual_url: str, auto_url: str) -> Dict[str, Any]:
+    return {
+        "title": "Async Rust",
+        "subtitles": {"en": [{"ext": "json3", "url": manual_url}]},
+        "automatic_captions": {"en": [{"ext": "json3", "url": auto_url}]},
+    }
+
+
+class TestSubtitleRacing:
+    """Test cases for async caption downloads."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slower_preferred_track_wins(self, caption_server) -> None:
+        """Test that a manual track is kept even if captions arrive first."""
+        base, _ = caption_server
+        info = _info(f"{base}/manual?delay=0.2", f"{base}/auto")
+
+        async with HTTPClient() as client:
+            result = await YouTubeDownloader()._transcript_from_info_async(
+                info, "en", client
+            )
+
+        assert result["source"] == "manual"
+        assert result["transcript"] == "From json3"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_falls_back_without_waiting_for_timeout(self, caption_server) -> None:
+        """Test that failed or timed out tracks fall back to the next one."""
+        base, _ = caption_server
+        downloader = YouTubeDownloader(subtitle_timeout=0.1)
+
+        async with HTTPClient() as client:
+            missing = await downloader._transcript_from_info_async(
+                _info(f"{base}/missing", f"{base}/auto"), "en", client
+            )
+            slow = await downloader._transcript_from_info_async(
+                _info(f"{base}/manual?delay=1", f"{base}/auto"), "en", client
+            )
+
+        assert missing["source"] == "automatic"
+        assert slow["source"] == "automatic"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_client_bounds_concurrent_requests(self, caption_server) -> None:
+        """Test that no more than max_concurrency requests are in flight."""
+        base, state = caption_server
+
+        async with HTTPClient(max_concurrency=2) as client:
+            texts = await asyncio.gather(
+                *(client.get_text(f"{base}/track{i}?delay=0.05") for i in range(6))
+            )
+
+        assert texts == [JSON3] * 6
+        assert state["max_in_flight"] == 2
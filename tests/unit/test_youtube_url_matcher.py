@@ -0,0 +1,199 @@
+"""Unit tests for the single-pass YouTube URL matcher."""
+
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import pytest
+
+from src.canonicalize_urls import YouTubeRef
+from src.extract_youtube_urls import (
+    astream_youtube_urls,
+    extract_video_ids_from_urls,
+    extract_youtube_urls_from_markdown,
+    get_youtube_urls_with_metadata,
+    iter_youtube_matches_from_chunks,
+    stream_youtube_urls,
+)
+from src.youtube_url_matcher import (
+    find_youtube_matches,
+    match_youtube_url,
+)
+
+
+class TestFindYouTubeMatches:
+    """Test cases for scanning text for YouTube URLs."""
+
+    @pytest.mark.unit
+    def test_typed_matches_with_offsets(self) -> None:
+        """Test that each match carries its kind, ID and position."""
+        text = (
+            "Watch [this](https://youtu.be/dQw4w9WgXcQ?t=5) and "
+            "https://www.youtube.com/playlist?list=PL123 or "
+            "https://www.youtube.com/@Fireship."
+        )
+
+        matches = find_youtube_matches(text)
+
+        assert [(m.kind, m.id) for m in matches] == [
+            ("video", "dQw4w9WgXcQ"),
+            ("playlist", "PL123"),
+            ("channel", "@fireship"),
+        ]
+        for match in matches:
+            assert text[match.start : match.end] == match.url
+        assert matches[0].url == "https://youtu.be/dQw4w9WgXcQ?t=5"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url,ref",
+        [
+            ("https://www.youtube.com/watch?v=abc", YouTubeRef("video", "abc")),
+            ("https://m.youtube.com/watch?feature=x&v=abc", YouTubeRef("video", "abc")),
+            ("https://www.youtube.com/embed/abc", YouTubeRef("video", "abc")),
+            ("https://www.youtube.com/shorts/abc", YouTubeRef("video", "abc")),
+            (
+                "https://www.youtube.com/embed/videoseries?list=PL1",
+                YouTubeRef("playlist", "PL1"),
+            ),
+            ("https://www.youtube.com/channel/UC1", YouTubeRef("channel", "UC1")),
+            ("https://www.youtube.com/c/Name", YouTubeRef("channel", "c/Name")),
+        ],
+    )
+    def test_url_forms(self, url: str, ref: YouTubeRef) -> None:
+        """Test that each URL form maps to the same reference as the parser."""
+        match = match_youtube_url(url)
+
+        assert match is not None
+        assert match.ref == ref
+
+    @pytest.mark.unit
+    def test_non_youtube_urls(self) -> None:
+        """Test that unrelated URLs are not matched."""
+        assert match_youtube_url("https://example.com/watch?v=abc") is None
+        assert find_youtube_matches("no links here") == []
+
+
+class TestExtractYouTubeUrls:
+    """Test cases for the markdown extraction helpers."""
+
+    @pytest.mark.unit
+    def test_extract_from_markdown(self) -> None:
+        """Test that links, images and bare URLs are each found once."""
+        markdown = (
+            "[Tutorial](https://www.youtube.com/watch?v=dQw4w9WgXcQ)\n"
+            "![Thumb](https://www.youtube.com/watch?v=ScMzIvxBSi4)\n"
+            "Bare: https://youtu.be/jNQXAC9IVRw\n"
+        )
+
+        assert extract_youtube_urls_from_markdown(markdown) == [
+            "https://www.youtube.com/watch?v=ScMzIvxBSi4",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtu.be/jNQXAC9IVRw",
+        ]
+
+    @pytest.mark.unit
+    def test_extract_video_ids(self) -> None:
+        """Test that only video URLs contribute IDs."""
+        urls = [
+            "https://www.youtube.com/watch?v=abc&t=1",
+            "https://youtu.be/def",
+            "https://www.youtube.com/playlist?list=PL1",
+        ]
+
+        assert extract_video_ids_from_urls(urls) == ["abc", "def"]
+
+
+SAMPLE_MARKDOWN = (
+    "# List\n"
+    "- [Talk](https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1) - a talk\n"
+    "- https://youtu.be/jNQXAC9IVRw and https://www.youtube.com/@Chan\n"
+    "- [Again](https://youtu.be/jNQXAC9IVRw)\n"
+    "https://youtu.be/last"
+)
+
+
+class TestStreamingExtraction:
+    """Test cases for chunked and memory-mapped extraction."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("size", [1, 3, 17, 64])
+    def test_chunk_boundaries(self, size: int) -> None:
+        """Test that URLs split across chunks are matched exactly once."""
+        chunks = [
+            SAMPLE_MARKDOWN[i : i + size] for i in range(0, len(SAMPLE_MARKDOWN), size)
+        ]
+
+        assert list(iter_youtube_matches_from_chunks(chunks)) == find_youtube_matches(
+            SAMPLE_MARKDOWN
+        )
+
+    @pytest.mark.unit
+    def test_stream_from_file(self, tmp_path: Path) -> None:
+        """Test that a memory-mapped file yields unique URLs in order."""
+        path = tmp_path / "list.md"
+        path.write_text(SAMPLE_MARKDOWN)
+
+        assert list(stream_youtube_urls(path)) == [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1",
+            "https://youtu.be/jNQXAC9IVRw",
+            "https://www.youtube.com/@Chan",
+            "https://youtu.be/last",
+        ]
+
+        empty = tmp_path / "empty.md"
+        empty.write_text("")
+        assert list(stream_youtube_urls(empty)) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_async_byte_chunks(self) -> None:
+        """Test extraction from an async iterator of byte chunks."""
+        data = SAMPLE_MARKDOWN.encode()
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for i in range(0, len(data), 10):
+                yield data[i : i + 10]
+
+        urls: List[str] = [url async for url in astream_youtube_urls(chunks())]
+
+        assert urls == list(stream_youtube_urls(data))
+
+
+class TestUrlsWithMetadata:
+    """Test cases for context-aware extraction."""
+
+    @pytest.mark.unit
+    def test_records_carry_context(self) -> None:
+        """Test link text, section, line and context of each URL."""
+        markdown = (
+            "# Awesome\n"
+            "```md\n"
+            "# Not a heading\n"
+            "```\n"
+            "## Talks\n"
+            "- [Keynote](https://youtu.be/abc) - opening talk\n"
+            "### Playlists\n"
+            "See https://www.youtube.com/playlist?list=PL1\n"
+            "- [Again](https://www.youtube.com/watch?v=abc)\n"
+        )
+
+        records = get_youtube_urls_with_metadata(markdown)
+
+        assert [r["line"] for r in records] == [6, 8, 9]
+        assert records[0]["link_text"] == "Keynote"
+        assert records[0]["video_id"] == "abc"
+        assert records[0]["section_path"] == ["Awesome", "Talks"]
+        assert (
+            records[0]["context"] == "- [Keynote](https://youtu.be/abc) - opening talk"
+        )
+        assert records[1]["link_text"] is None
+        assert records[1]["url_type"] == "playlist"
+        assert records[1]["video_id"] is None
+        assert records[1]["section"] == "Playlists"
+        assert markdown[records[1]["start"] : records[1]["end"]] == records[1]["url"]
+
+        unique = get_youtube_urls_with_metadata(markdown, unique=True)
+        assert [r["canonical_url"] for r in unique] == [
+            "https://www.youtube.com/watch?v=abc",
+            "https://www.youtube.com/playlist?list=PL1",
+        ]